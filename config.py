@@ -9,14 +9,133 @@ def require_env_var(name: str) -> str:
         raise ValueError(f"A variável de ambiente '{name}' não está definida no .env")
     return value
 
-GROQ_API_KEY = require_env_var("GROQ_API_KEY")
-GROQ_MODEL = require_env_var("GROQ_MODEL")
+# Obrigatórias apenas para os comandos que chamam o Groq: são lidas e
+# validadas no primeiro acesso (config.GROQ_API_KEY), não na importação
+REQUIRED_VARS = ("GROQ_API_KEY", "GROQ_MODEL")
+
+
+def __getattr__(name: str) -> str:
+    if name in REQUIRED_VARS:
+        value = require_env_var(name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def check_required_vars() -> list:
+    """Variáveis obrigatórias ausentes (lista vazia se todas estão definidas)."""
+    return [name for name in REQUIRED_VARS if os.getenv(name) is None]
+
+# Limites de uso da API do Groq (ajuste conforme o plano/modelo; 0 = sem limite).
+# Sem limite, os erros 429 são tratados com novas tentativas (Retry-After)
+GROQ_RPM = int(os.getenv("GROQ_RPM", "0"))  # requisições por minuto
+GROQ_TPM = int(os.getenv("GROQ_TPM", "0"))  # tokens por minuto
+GROQ_MAX_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", "16"))
+GROQ_MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", "100"))
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "5"))
+
+# Avaliação em lote: uma requisição por candidato/vaga (--batch-eval)
+EVAL_BATCH_MODE = os.getenv("EVAL_BATCH_MODE", "false").lower() == "true"
+# Regrava o relatório JSON do candidato após cada avaliação. Desativado, os
+# relatórios das entrevistas avaliadas são gravados uma vez, ao fim da execução
+RESULTS_AUTO_EXPORT = os.getenv("RESULTS_AUTO_EXPORT", "false").lower() == "true"
+# Orçamento de tokens (prompt + saída) por requisição na avaliação em lote
+EVAL_BATCH_MAX_TOKENS = int(os.getenv("EVAL_BATCH_MAX_TOKENS", "6000"))
+# Tamanho máximo estimado do prompt de uma avaliação ou resumo; transcrições
+# maiores são reduzidas (hesitações, repetições, resumo extrativo) antes do envio
+LLM_MAX_PROMPT_TOKENS = int(os.getenv("LLM_MAX_PROMPT_TOKENS", "4000"))
+# Leitura das avaliações: "stream" encerra o stream ao receber o JSON completo;
+# "json" usa o modo JSON do Groq (saída sempre JSON válido, sem streaming)
+EVAL_RESPONSE_MODE = os.getenv("EVAL_RESPONSE_MODE", "stream")
 
 # Modelo do Whisper
 WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "small")  # default = "small"
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE") or None  # None = automático (cuda se disponível)
+# Motor de transcrição: openai-whisper (PyTorch) ou faster-whisper (CTranslate2, quantizado)
+TRANSCRIPTION_BACKEND = os.getenv("TRANSCRIPTION_BACKEND", "openai-whisper")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")  # apenas faster-whisper
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))  # 0 = padrão do CTranslate2
+WHISPER_NUM_WORKERS = int(os.getenv("WHISPER_NUM_WORKERS", "1"))
+# Perfil de decodificação do Whisper: default | fast | balanced | accurate
+# (--decoding-profile). "default" mantém os padrões do Whisper
+WHISPER_PROFILE = os.getenv("WHISPER_PROFILE", "default")
+# Idioma padrão das gravações (ex: "pt"); vazio = detecção automática. O campo
+# "language" do JSON da vaga (data/job_positions) tem prioridade
+WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE") or None
+# Tempos de cada palavra na transcrição (um pouco mais lento)
+WHISPER_WORD_TIMESTAMPS = os.getenv("WHISPER_WORD_TIMESTAMPS", "false").lower() == "true"
+
+# Extração de áudio: "memory" decodifica direto do ffmpeg para a memória;
+# "file" grava um MP3 temporário via moviepy (útil para depuração)
+AUDIO_EXTRACTION = os.getenv("AUDIO_EXTRACTION", "memory")
+
+# Modo streaming para gravações longas (--stream): VAD por energia
+VAD_THRESHOLD_DB = float(os.getenv("VAD_THRESHOLD_DB", "-40"))  # limiar de fala em dBFS
+VAD_MIN_SILENCE_MS = int(os.getenv("VAD_MIN_SILENCE_MS", "600"))  # silêncio que encerra uma fala
+
+# Captura de frames: interval | keyframes (mais rápido) | scene (mudanças de cena)
+FRAME_CAPTURE_MODE = os.getenv("FRAME_CAPTURE_MODE", "interval")
+FRAME_INTERVAL = int(os.getenv("FRAME_INTERVAL", "60"))  # segundos entre frames
+FRAME_WIDTH = int(os.getenv("FRAME_WIDTH", "0")) or None  # 0 = tamanho original
+FRAME_SCENE_THRESHOLD = float(os.getenv("FRAME_SCENE_THRESHOLD", "0.3"))
+
+# Concorrência do pipeline em estágios (python src/main.py --pipeline)
+PIPELINE_EXTRACT_WORKERS = int(os.getenv("PIPELINE_EXTRACT_WORKERS", "2"))
+PIPELINE_TRANSCRIBE_WORKERS = int(os.getenv("PIPELINE_TRANSCRIBE_WORKERS", "1"))
+PIPELINE_EVALUATE_WORKERS = int(os.getenv("PIPELINE_EVALUATE_WORKERS", "4"))
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "4"))
+# Vídeos curtos transcritos juntos por cada worker (1 = um a um)
+PIPELINE_TRANSCRIBE_BATCH = int(os.getenv("PIPELINE_TRANSCRIBE_BATCH", "1"))
 
 # Diretórios padrão
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))  # diretório do config.py
 
 INPUT_DIR = os.path.join(BASE_DIR, "input")
-OUTPUT_DIR = os.path.join(BASE_DIR, "output")
\ No newline at end of file
+OUTPUT_DIR = os.path.join(BASE_DIR, "output")
+CACHE_DIR = os.path.join(BASE_DIR, "cache")
+
+# Arquivos temporários de cada vídeo (áudio extraído, frames em andamento).
+# Cada vídeo ganha um subdiretório exclusivo; pode apontar para um tmpfs (/dev/shm)
+WORK_DIR = os.getenv("WORK_DIR", os.path.join(OUTPUT_DIR, ".work"))
+
+# Fila de jobs (modos --submit e --worker)
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", os.path.join(OUTPUT_DIR, "jobs.sqlite3"))
+JOB_VISIBILITY_TIMEOUT = float(os.getenv("JOB_VISIBILITY_TIMEOUT", "1800"))  # segundos
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "5"))
+
+# Modo --watch: manifesto dos vídeos processados e espera por arquivos em cópia
+WATCH_MANIFEST_PATH = os.getenv(
+    "WATCH_MANIFEST_PATH", os.path.join(OUTPUT_DIR, "processed_manifest.json")
+)
+WATCH_POLL_INTERVAL = float(os.getenv("WATCH_POLL_INTERVAL", "2"))
+WATCH_SETTLE_SECONDS = float(os.getenv("WATCH_SETTLE_SECONDS", "3"))
+
+# Gravações completas (candidato_nome_cargo.mp4): semelhança mínima (0 a 1)
+# entre a fala e a pergunta da vaga para localizar cada questão
+SESSION_MIN_SIMILARITY = float(os.getenv("SESSION_MIN_SIMILARITY", "0.5"))
+
+# Rastreamento por vídeo e etapa (--trace): spans em JSONL e métricas do Prometheus
+TRACE_PATH = os.getenv("TRACE_PATH") or None  # vazio = desativado
+METRICS_PATH = os.getenv("METRICS_PATH", os.path.join(OUTPUT_DIR, "metrics.prom"))
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # endpoint /metrics (0 = desativado)
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(OUTPUT_DIR, "profiles"))  # --profile
+
+# Cache de transcrições (desative com --no-cache, limpe com --purge-cache)
+TRANSCRIPTION_CACHE_DIR = os.getenv(
+    "TRANSCRIPTION_CACHE_DIR", os.path.join(CACHE_DIR, "transcriptions")
+)
+TRANSCRIPTION_CACHE_MAX_MB = int(os.getenv("TRANSCRIPTION_CACHE_MAX_MB", "500"))
+
+# Reenvios do mesmo áudio em outro contêiner/codificação (desative com --no-dedup):
+# impressões digitais acústicas e semelhança mínima (fração de bits iguais,
+# ~0.5 = áudios sem relação) para reaproveitar a transcrição já feita
+FINGERPRINT_INDEX_PATH = os.getenv(
+    "FINGERPRINT_INDEX_PATH", os.path.join(CACHE_DIR, "fingerprints.sqlite3")
+)
+FINGERPRINT_MIN_SIMILARITY = float(os.getenv("FINGERPRINT_MIN_SIMILARITY", "0.65"))
+
+# Cache de respostas do LLM (desative com --no-llm-cache)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(CACHE_DIR, "llm_responses.sqlite3"))
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "720"))  # 30 dias
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
\ No newline at end of file
@@ -3,3 +3,7 @@ import os
 
 # Adiciona o caminho da pasta 'src' ao PYTHONPATH
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
+
+# Valores fictícios para que os módulos que dependem do .env possam ser importados nos testes
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+os.environ.setdefault("GROQ_MODEL", "test-model")
@@ -0,0 +1,14 @@
+from .fake_groq import FakeGroqServer
+from .report import StageTimer, compare_reports, latency_summary, peak_rss_mb
+from .synthetic_media import generate_clip, generate_interview_set, synthetic_speech
+
+__all__ = [
+    'FakeGroqServer',
+    'StageTimer',
+    'compare_reports',
+    'latency_summary',
+    'peak_rss_mb',
+    'generate_clip',
+    'generate_interview_set',
+    'synthetic_speech'
+]
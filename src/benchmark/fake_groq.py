@@ -0,0 +1,185 @@
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+_QUESTION_INDEX = re.compile(r"Questão (\d+):")
+
+
+def fake_content(prompt: str, rng: random.Random) -> str:
+    """
+    Resposta no formato pedido pelo prompt: um array com uma avaliação por
+    "Questão N:" na avaliação em lote, um objeto {"score", "feedback"} na
+    avaliação individual ou um texto comum (resumo).
+    """
+    if "JSON array" in prompt:
+        return json.dumps([
+            {
+                "question_index": int(index),
+                "score": rng.randint(4, 9),
+                "feedback": "Avaliação sintética.",
+            }
+            for index in _QUESTION_INDEX.findall(prompt)
+        ])
+    if '"score"' in prompt:
+        return json.dumps({"score": rng.randint(4, 9), "feedback": "Avaliação sintética."})
+    return "Resumo sintético da resposta do candidato."
+
+
+class FakeGroqServer:
+    def __init__(
+        self,
+        latency_ms: float = 300.0,
+        jitter_ms: float = 50.0,
+        error_rate: float = 0.0,
+        chunk_chars: int = 8,
+        seed: int = 0,
+    ):
+        """
+        Servidor HTTP local compatível com /openai/v1/chat/completions do
+        Groq, para medir o sistema sem rede e sem custo. O SDK do Groq é
+        apontado para ele pela variável GROQ_BASE_URL.
+
+        Args:
+            latency_ms: Latência média de cada resposta
+            jitter_ms: Desvio padrão da latência
+            error_rate: Fração das requisições respondidas com erro 429
+            chunk_chars: Caracteres por evento nas respostas em streaming
+            seed: Semente do gerador de latências, erros e notas
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.chunk_chars = chunk_chars
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "streamed": 0, "errors_injected": 0, "disconnects": 0}
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _draw(self) -> Dict:
+        """Sorteia latência, erro e conteúdo de uma requisição."""
+        with self._lock:
+            self.stats["requests"] += 1
+            latency = max(0.0, self._rng.gauss(self.latency_ms, self.jitter_ms)) / 1000
+            error = self._rng.random() < self.error_rate
+            if error:
+                self.stats["errors_injected"] += 1
+            return {"latency": latency, "error": error, "rng": random.Random(self._rng.random())}
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def start(self) -> "FakeGroqServer":
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                if not self.path.endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": "not found"}})
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                draw = fake._draw()
+                time.sleep(draw["latency"])
+
+                if draw["error"]:
+                    self._send_json(
+                        429,
+                        {"error": {"message": "Rate limit reached (injected)", "type": "rate_limit"}},
+                        {"retry-after-ms": "10"},
+                    )
+                    return
+
+                prompt = "\n".join(m.get("content", "") for m in request.get("messages", []))
+                content = fake_content(prompt, draw["rng"])
+                model = request.get("model", "fake")
+                try:
+                    if request.get("stream"):
+                        fake._count("streamed")
+                        self._stream(content, model)
+                    else:
+                        self._send_json(200, {
+                            "id": "chatcmpl-fake",
+                            "object": "chat.completion",
+                            "created": int(time.time()),
+                            "model": model,
+                            "choices": [{
+                                "index": 0,
+                                "message": {"role": "assistant", "content": content},
+                                "finish_reason": "stop",
+                            }],
+                            "usage": {
+                                "prompt_tokens": len(prompt) // 4 + 1,
+                                "completion_tokens": len(content) // 4 + 1,
+                                "total_tokens": len(prompt) // 4 + len(content) // 4 + 2,
+                            },
+                        })
+                except (BrokenPipeError, ConnectionResetError):
+                    # O cliente fechou o stream antes do fim (ex: JSON já completo)
+                    fake._count("disconnects")
+
+            def _stream(self, content: str, model: str):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                step = fake.chunk_chars
+                for start in range(0, len(content), step):
+                    self._event({
+                        "id": "chatcmpl-fake",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{
+                            "index": 0,
+                            "delta": {"content": content[start:start + step]},
+                            "finish_reason": None,
+                        }],
+                    })
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def _event(self, payload: Dict):
+                self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeGroqServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,92 @@
+import functools
+import resource
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import numpy as np
+
+
+def latency_summary(samples: List[float]) -> Dict:
+    """Contagem, total, média e percentis (p50, p90, p99, máx) em segundos."""
+    if not samples:
+        return {"count": 0}
+    values = np.asarray(samples, dtype=np.float64)
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {
+        "count": len(samples),
+        "total": round(float(values.sum()), 4),
+        "mean": round(float(values.mean()), 4),
+        "p50": round(float(p50), 4),
+        "p90": round(float(p90), 4),
+        "p99": round(float(p99), 4),
+        "max": round(float(values.max()), 4),
+    }
+
+
+def peak_rss_mb() -> Dict:
+    """Pico de memória residente do processo e dos subprocessos (ffmpeg), em MB."""
+    # ru_maxrss é em KB no Linux e em bytes no macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+    }
+
+
+class StageTimer:
+    def __init__(self):
+        """
+        Mede a duração de cada chamada às funções instrumentadas, agrupada
+        por etapa. As funções originais são restauradas em restore().
+        """
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._patched = []
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            self.samples[stage].append(seconds)
+
+    def wrap(self, owner, name: str, stage: str):
+        """Substitui owner.name por uma versão que registra a duração na etapa."""
+        original = getattr(owner, name)
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.add(stage, time.perf_counter() - started)
+
+        self._patched.append((owner, name, original))
+        setattr(owner, name, timed)
+
+    def restore(self):
+        for owner, name, original in reversed(self._patched):
+            setattr(owner, name, original)
+        self._patched.clear()
+
+    def summary(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {stage: latency_summary(values) for stage, values in sorted(self.samples.items())}
+
+
+def compare_reports(current: Dict, baseline: Dict) -> Dict[str, float]:
+    """
+    Variação relativa (ex: 0.12 = 12% maior) do p50 de cada etapa e da
+    vazão entre dois relatórios do benchmark.
+    """
+    changes = {}
+    for stage, stats in current.get("stages", {}).items():
+        before = baseline.get("stages", {}).get(stage, {}).get("p50")
+        if before and stats.get("p50") is not None:
+            changes[f"{stage}.p50"] = round(stats["p50"] / before - 1, 4)
+    before = baseline.get("throughput", {}).get("audio_seconds_per_second")
+    after = current.get("throughput", {}).get("audio_seconds_per_second")
+    if before and after:
+        changes["throughput"] = round(after / before - 1, 4)
+    return changes
@@ -0,0 +1,144 @@
+import os
+import subprocess
+import tempfile
+import wave
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ffmpeg_setup import get_ffmpeg_binary
+
+SAMPLE_RATE = 16000
+
+
+def speech_layout(
+    duration: float, speech_ratio: float, rng: np.random.Generator
+) -> List[Tuple[float, float]]:
+    """
+    Distribui trechos de "fala" de 1,5 a 4 s ao longo da gravação, separados
+    por silêncios, até cobrir speech_ratio da duração.
+
+    Returns:
+        list: Intervalos (início, fim) de fala, em segundos
+    """
+    speech_total = duration * min(max(speech_ratio, 0.0), 1.0)
+    lengths = []
+    while sum(lengths) < speech_total:
+        lengths.append(min(rng.uniform(1.5, 4.0), speech_total - sum(lengths)))
+    if not lengths:
+        return []
+
+    # Silêncio dividido em len + 1 intervalos (início, entre as falas e fim)
+    gaps = rng.dirichlet(np.ones(len(lengths) + 1)) * (duration - speech_total)
+    intervals, t = [], 0.0
+    for length, gap in zip(lengths, gaps):
+        t += gap
+        intervals.append((t, t + length))
+        t += length
+    return intervals
+
+
+def synthetic_speech(
+    duration: float, speech_ratio: float = 0.6, sample_rate: int = SAMPLE_RATE, seed: int = 0
+) -> Tuple[np.ndarray, List[Tuple[float, float]]]:
+    """
+    Gera um áudio com o perfil de uma resposta de entrevista: trechos
+    vozeados (frequência fundamental de voz com harmônicos, modulados no
+    ritmo de sílabas) intercalados com silêncio de fundo. Não é fala
+    inteligível, mas exercita o VAD, a extração e o Whisper com a mesma
+    proporção de fala e silêncio.
+
+    Returns:
+        Tuple[áudio float32 mono, intervalos de fala]
+    """
+    rng = np.random.default_rng(seed)
+    samples = int(duration * sample_rate)
+    audio = rng.normal(0, 10 ** (-60 / 20), samples)  # ruído de fundo, -60 dBFS
+
+    intervals = speech_layout(duration, speech_ratio, rng)
+    for start, end in intervals:
+        first, last = int(start * sample_rate), int(end * sample_rate)
+        t = np.arange(last - first) / sample_rate
+        f0 = rng.uniform(110, 220) * (1 + 0.05 * np.sin(2 * np.pi * 0.5 * t))
+        phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+        voiced = sum(np.sin(h * phase) / h for h in range(1, 6))
+        syllables = 0.5 * (1 + np.sin(2 * np.pi * rng.uniform(3, 5) * t)) ** 2
+        audio[first:last] += 0.2 * voiced * syllables
+    return np.clip(audio, -1, 1).astype(np.float32), intervals
+
+
+def write_wav(path: str, audio: np.ndarray, sample_rate: int = SAMPLE_RATE):
+    """Grava o áudio float32 como WAV PCM 16 bits mono."""
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes((audio * 32767).astype("<i2").tobytes())
+
+
+def generate_clip(
+    path: str,
+    duration: float,
+    resolution: Tuple[int, int] = (640, 360),
+    speech_ratio: float = 0.6,
+    fps: int = 25,
+    seed: int = 0,
+) -> List[Tuple[float, float]]:
+    """
+    Gera um vídeo sintético (padrão de teste do ffmpeg + áudio de
+    synthetic_speech) em H.264/AAC.
+
+    Returns:
+        list: Intervalos de fala do áudio gerado
+    """
+    audio, intervals = synthetic_speech(duration, speech_ratio, seed=seed)
+    width, height = resolution
+    with tempfile.TemporaryDirectory(prefix="bench_audio_") as tmp:
+        wav_path = os.path.join(tmp, "audio.wav")
+        write_wav(wav_path, audio)
+        cmd = [
+            get_ffmpeg_binary(), "-nostdin", "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", f"testsrc2=size={width}x{height}:rate={fps}:duration={duration}",
+            "-i", wav_path,
+            "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+            "-c:a", "aac", "-shortest",
+            path,
+        ]
+        process = subprocess.run(cmd, capture_output=True)
+        if process.returncode != 0:
+            stderr = process.stderr.decode("utf-8", errors="ignore").strip()
+            raise RuntimeError(f"Falha ao gerar o vídeo sintético {path}: {stderr[-500:]}")
+    return intervals
+
+
+def generate_interview_set(
+    directory: str,
+    job_position: str,
+    questions: int,
+    candidates: int = 1,
+    duration: float = 30.0,
+    resolution: Tuple[int, int] = (640, 360),
+    speech_ratio: float = 0.6,
+    seed: Optional[int] = 0,
+) -> List[str]:
+    """
+    Gera um vídeo por candidato e questão, no padrão
+    candidato_<nome>_<vaga>_q<N>.mp4.
+
+    Returns:
+        list: Nomes dos arquivos gerados
+    """
+    os.makedirs(directory, exist_ok=True)
+    filenames = []
+    for candidate in range(1, candidates + 1):
+        for question in range(1, questions + 1):
+            filename = f"candidato_bench{candidate}_{job_position}_q{question}.mp4"
+            generate_clip(
+                os.path.join(directory, filename),
+                duration,
+                resolution=resolution,
+                speech_ratio=speech_ratio,
+                seed=None if seed is None else seed + len(filenames),
+            )
+            filenames.append(filename)
+    return filenames
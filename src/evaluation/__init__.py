@@ -1,11 +1,15 @@
 from .interview_evaluator import InterviewEvaluator
-from .answer_evaluator import AnswerEvaluator, EvaluationResult
+from .answer_evaluator import AnswerEvaluator, BatchItem, EvaluationResult
 from .job_matcher import JobPosition, JobQuestion
+from .question_splitter import AnswerSpan, split_answers
 
 __all__ = [
     'InterviewEvaluator',
     'AnswerEvaluator',
     'EvaluationResult',
+    'BatchItem',
     'JobPosition',
-    'JobQuestion'
+    'JobQuestion',
+    'AnswerSpan',
+    'split_answers'
 ] 
\ No newline at end of file
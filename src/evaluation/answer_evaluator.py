@@ -1,8 +1,21 @@
-from typing import Dict
-from dataclasses import dataclass
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, replace
 import json
-from config import GROQ_MODEL
-from transcription.groq_client import client
+import config
+from config import EVAL_BATCH_MAX_TOKENS, EVAL_RESPONSE_MODE, LLM_MAX_PROMPT_TOKENS
+from transcription.groq_client import (
+    AsyncGroqClient,
+    BackgroundAsyncClient,
+    chat_completion,
+    retryable_errors,
+)
+from transcription.rate_limiter import estimate_tokens
+from transcription.llm_cache import ResponseCache
+from transcription.token_budget import fit_to_budget, token_meter
+from tracing import tracer
+from .job_matcher import JobQuestion, escape_prompt_text
+from .response_parser import JsonStreamParser, extract_json, validate_evaluation
 
 
 @dataclass
@@ -11,18 +24,267 @@ class EvaluationResult:
     feedback: str
 
 
+@dataclass
+class BatchItem:
+    question_index: int  # número da questão na vaga (1-based)
+    transcribed_answer: str
+    question: str
+    expected_answer: str
+    # Questão da vaga, com os trechos do prompt já escapados (opcional)
+    job_question: Optional[JobQuestion] = None
+
+
+# Tokens de saída reservados por resposta avaliada em lote
+BATCH_COMPLETION_TOKENS_PER_ITEM = 512
+
+SYSTEM_PROMPT = "Você é um avaliador técnico especialista."
+
+# "stream": lê a resposta em streaming e encerra ao fechar o JSON;
+# "json": modo JSON do Groq (saída restrita a JSON válido, sem streaming)
+RESPONSE_MODES = ("stream", "json")
+
+
+def _close_stream(stream):
+    close = getattr(stream, "close", None)
+    if callable(close):
+        close()
+
+
+def _chunk_text(chunk) -> str:
+    if not chunk.choices:
+        return ""
+    return chunk.choices[0].delta.content or ""
+
+
 class AnswerEvaluator:
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        max_prompt_tokens: int = LLM_MAX_PROMPT_TOKENS,
+        response_mode: str = EVAL_RESPONSE_MODE,
+        async_client: Optional[BackgroundAsyncClient] = None,
+    ):
+        """
+        Args:
+            cache: Cache de respostas do LLM (opcional). Avaliações idênticas
+                (mesmo prompt, modelo e parâmetros) não chamam a API de novo
+            max_prompt_tokens: Tamanho máximo estimado do prompt de uma
+                avaliação. Respostas que não cabem são reduzidas antes do envio
+            response_mode: "stream" (padrão) ou "json" (RESPONSE_MODES)
+            async_client: Cliente assíncrono em segundo plano (opcional). Com
+                ele, as requisições de várias threads compartilham um único
+                pool de conexões e limite de concorrência (usado pelo pipeline)
+        """
+        if response_mode not in RESPONSE_MODES:
+            raise ValueError(
+                f"Modo de resposta inválido: {response_mode}. Use um de {RESPONSE_MODES}"
+            )
+        self.cache = cache
+        self.max_prompt_tokens = max_prompt_tokens
+        self.response_mode = response_mode
+        self.async_client = async_client
+
     def sanitize_text(self, text: str) -> str:
         """
         Sanitiza o texto para uso seguro no prompt.
         Remove ou escapa caracteres que podem causar problemas no JSON.
         """
-        # Remove caracteres de controle e normaliza quebras de linha
-        cleaned = text.replace("\\", "\\\\").replace('"', '\\"')
-        return cleaned.strip()
+        return escape_prompt_text(text)
+
+    def _prompt_fields(
+        self, question: str, expected_answer: str, job_question: Optional[JobQuestion]
+    ) -> Tuple[str, str]:
+        """Pergunta e resposta esperada escapadas, reaproveitando as da vaga se houver."""
+        if job_question is not None:
+            return job_question.prompt_question, job_question.prompt_expected_answer
+        return self.sanitize_text(question), self.sanitize_text(expected_answer)
+
+    def fit_answer(
+        self, transcribed_answer: str, safe_question: str, safe_expected: str, stage: str
+    ) -> str:
+        """
+        Reduz a resposta transcrita (hesitações, laços de repetição do
+        Whisper, resumo extrativo) para que o prompt de avaliação caiba em
+        max_prompt_tokens, em vez de falhar por exceder o contexto do modelo.
+        """
+        fixed = estimate_tokens(
+            SYSTEM_PROMPT + self._evaluation_prompt(safe_question, safe_expected, "")
+        )
+        answer, method = fit_to_budget(
+            transcribed_answer, max(self.max_prompt_tokens - fixed, 1)
+        )
+        if method:
+            print(f"Resposta reduzida para caber no orçamento de tokens ({method})")
+        token_meter.record_compression(stage, method)
+        return answer
+
+    def _evaluation_prompt(self, safe_question: str, safe_expected: str, safe_answer: str) -> str:
+        return f"""Você é um avaliador especialista que analisa respostas de candidatos em entrevistas técnicas.
+
+        Pergunta original: "{safe_question}"
+
+        Resposta esperada: "{safe_expected}"
+
+        Resposta do candidato (transcrita): "{safe_answer}"
+
+        Compare a resposta do candidato com a resposta esperada e forneça:
+        1. Uma nota de 0 a 10, onde:
+        - 0-2: Resposta totalmente incorreta ou fora do contexto
+        - 3-4: Resposta parcialmente relacionada, mas com graves falhas
+        - 5-6: Resposta básica, mas aceitável
+        - 7-8: Boa resposta, com alguns pontos de melhoria
+        - 9-10: Excelente resposta, completa e precisa
+        
+        2. Um feedback construtivo explicando:
+        - Pontos positivos da resposta
+        - O que faltou ou poderia ser melhorado
+        - Por que a nota foi atribuída
+
+        Retorne APENAS um JSON com este formato exato:
+        {{"score": float, "feedback": "string"}}"""
+
+    def build_request(
+        self,
+        transcribed_answer: str,
+        question: str,
+        expected_answer: str,
+        job_question: Optional[JobQuestion] = None,
+    ) -> Tuple[List[Dict], Dict]:
+        """
+        Monta as mensagens e os parâmetros da requisição de avaliação.
+
+        Args:
+            job_question: Questão da vaga correspondente; seus trechos já
+                escapados substituem a sanitização de question e expected_answer
+
+        Returns:
+            Tuple[mensagens, parâmetros]
+        """
+        # Sanitiza os textos
+        safe_question, safe_expected = self._prompt_fields(question, expected_answer, job_question)
+        safe_answer = self.sanitize_text(
+            self.fit_answer(transcribed_answer, safe_question, safe_expected, "evaluation")
+        )
+
+        prompt = self._evaluation_prompt(safe_question, safe_expected, safe_answer)
+
+        messages = [
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT,
+            },
+            {"role": "user", "content": prompt},
+        ]
+        params = {
+            "model": config.GROQ_MODEL,
+            "temperature": 0.3,  # Baixa temperatura para respostas mais consistentes
+            "max_completion_tokens": 1024,
+        }
+        if self.response_mode == "json":
+            params["response_format"] = {"type": "json_object"}
+        return messages, params
+
+    def parse_response(self, content: Optional[str]) -> EvaluationResult:
+        """
+        Valida o conteúdo retornado pelo modelo e converte em EvaluationResult.
+        Texto ao redor do JSON (introduções, cercas ```json) é ignorado.
+        """
+        # Verifica se a resposta é válida
+        if not content:
+            raise ValueError("Resposta vazia do modelo")
+
+        raw = extract_json(content, "{")
+        if raw is None:
+            print(f"Erro no JSON retornado pelo modelo: {content}")
+            raise ValueError("Resposta do modelo não contém um objeto JSON")
+
+        score, feedback = validate_evaluation(json.loads(raw))
+        return EvaluationResult(score=score, feedback=feedback)
+
+    def _complete(
+        self, messages: List[Dict], params: Dict, stage: str, openers: str = "{"
+    ) -> str:
+        """
+        Faz a requisição e retorna o JSON da resposta. Em streaming, a
+        leitura para (e a conexão é fechada) assim que o primeiro valor
+        JSON completo chega, sem esperar o restante da geração.
+        """
+        if self.async_client is not None:
+            return self.async_client.run(
+                self._complete_async(
+                    self.async_client.client, messages, params, stage, openers
+                )
+            )
+
+        if self.response_mode == "json":
+            response = chat_completion(messages, **params)
+            content = response.choices[0].message.content
+            token_meter.record(stage, messages, content, response)
+            return content
+
+        stream = chat_completion(messages, **params, stream=True)
+        parser = JsonStreamParser(openers)
+        received = ""
+        try:
+            for chunk in stream:
+                part = _chunk_text(chunk)
+                received += part
+                if parser.feed(part) is not None:
+                    break
+        finally:
+            _close_stream(stream)
+        token_meter.record(stage, messages, received)
+        return parser.result or received
+
+    async def _complete_async(
+        self,
+        client: AsyncGroqClient,
+        messages: List[Dict],
+        params: Dict,
+        stage: str,
+        openers: str = "{",
+    ) -> str:
+        """Versão assíncrona de _complete."""
+        if self.response_mode == "json":
+            response = await client.chat_completion(messages, **params)
+            content = response.choices[0].message.content
+            token_meter.record(stage, messages, content, response)
+            return content
+
+        stream = await client.chat_completion(messages, **params, stream=True)
+        parser = JsonStreamParser(openers)
+        received = ""
+        try:
+            async for chunk in stream:
+                part = _chunk_text(chunk)
+                received += part
+                if parser.feed(part) is not None:
+                    break
+        finally:
+            close = getattr(stream, "close", None)
+            if callable(close):
+                await close()
+        token_meter.record(stage, messages, received)
+        return parser.result or received
+
+    def _error_result(self, error: Exception) -> EvaluationResult:
+        """
+        Avaliação de erro para respostas inválidas do modelo. Erros
+        transitórios da API (ex: 429) não chegam aqui: são propagados para
+        que nenhuma nota incorreta seja gravada.
+        """
+        print(f"Erro ao processar resposta da IA: {str(error)}")
+        return EvaluationResult(
+            score=0.0,
+            feedback=f"Erro ao avaliar resposta: {str(error)}. Por favor, tente novamente.",
+        )
 
     def evaluate_answer(
-        self, transcribed_answer: str, question: str, expected_answer: str
+        self,
+        transcribed_answer: str,
+        question: str,
+        expected_answer: str,
+        job_question: Optional[JobQuestion] = None,
     ) -> EvaluationResult:
         """
         Avalia uma resposta transcrita comparando com a resposta esperada usando IA.
@@ -31,79 +293,335 @@ class AnswerEvaluator:
             transcribed_answer: Resposta transcrita do candidato
             question: Pergunta original
             expected_answer: Resposta esperada/ideal
+            job_question: Questão da vaga (opcional), com o prompt pré-escapado
 
         Returns:
             EvaluationResult com nota (0-10) e feedback
+
+        Raises:
+            Erros transitórios do Groq (retryable_errors()) após esgotar as tentativas
         """
-        # Sanitiza os textos
-        safe_question = self.sanitize_text(question)
-        safe_expected = self.sanitize_text(expected_answer)
-        safe_answer = self.sanitize_text(transcribed_answer)
+        messages, params = self.build_request(
+            transcribed_answer, question, expected_answer, job_question
+        )
 
-        prompt = f"""Você é um avaliador especialista que analisa respostas de candidatos em entrevistas técnicas.
+        try:
+            content = self.cache.get(messages, params) if self.cache else None
+            from_cache = content is not None
 
-        Pergunta original: "{safe_question}"
+            if from_cache:
+                token_meter.record_cached("evaluation")
+            else:
+                with tracer.span("llm_request", stage="evaluation"):
+                    content = self._complete(messages, params, "evaluation")
 
-        Resposta esperada: "{safe_expected}"
+            evaluation = self.parse_response(content)
 
-        Resposta do candidato (transcrita): "{safe_answer}"
+            # Só respostas válidas entram no cache
+            if self.cache and not from_cache:
+                self.cache.set(messages, params, content)
 
-        Compare a resposta do candidato com a resposta esperada e forneça:
+            return evaluation
+
+        except retryable_errors():
+            raise
+        except Exception as e:
+            return self._error_result(e)
+
+    def _batch_header(self) -> str:
+        return """Você é um avaliador especialista que analisa respostas de candidatos em entrevistas técnicas.
+
+        Abaixo estão várias questões da mesma entrevista. Para cada uma, compare a resposta do candidato com a resposta esperada e forneça:
         1. Uma nota de 0 a 10, onde:
         - 0-2: Resposta totalmente incorreta ou fora do contexto
         - 3-4: Resposta parcialmente relacionada, mas com graves falhas
         - 5-6: Resposta básica, mas aceitável
         - 7-8: Boa resposta, com alguns pontos de melhoria
         - 9-10: Excelente resposta, completa e precisa
-        
+
         2. Um feedback construtivo explicando:
         - Pontos positivos da resposta
         - O que faltou ou poderia ser melhorado
         - Por que a nota foi atribuída
 
-        Retorne APENAS um JSON com este formato exato:
-        {{"score": float, "feedback": "string"}}"""
+        Avalie cada questão de forma independente.
+        """
 
-        try:
-            response = client.chat.completions.create(
-                model=GROQ_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Você é um avaliador técnico especialista.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.3,  # Baixa temperatura para respostas mais consistentes
-                max_completion_tokens=1024,
+    def _batch_item_text(self, item: BatchItem) -> str:
+        safe_question, safe_expected = self._prompt_fields(
+            item.question, item.expected_answer, item.job_question
+        )
+        return f"""
+        Questão {item.question_index}:
+        Pergunta original: "{safe_question}"
+        Resposta esperada: "{safe_expected}"
+        Resposta do candidato (transcrita): "{self.sanitize_text(item.transcribed_answer)}"
+        """
+
+    def _batch_footer(self) -> str:
+        return """
+        Retorne APENAS um JSON array, com um objeto por questão, neste formato exato:
+        [{"question_index": int, "score": float, "feedback": "string"}]"""
+
+    def _fit_item(self, item: BatchItem) -> BatchItem:
+        """Aplica à resposta do lote o mesmo orçamento de uma avaliação individual."""
+        safe_question, safe_expected = self._prompt_fields(
+            item.question, item.expected_answer, item.job_question
+        )
+        answer = self.fit_answer(
+            item.transcribed_answer, safe_question, safe_expected, "batch_evaluation"
+        )
+        if answer == item.transcribed_answer:
+            return item
+        return replace(item, transcribed_answer=answer)
+
+    def split_batch(
+        self, items: List[BatchItem], max_tokens: int = EVAL_BATCH_MAX_TOKENS
+    ) -> List[List[BatchItem]]:
+        """
+        Divide as respostas em lotes cujo prompt mais a saída reservada
+        cabem em max_tokens. Uma resposta maior que o orçamento fica sozinha.
+        """
+        fixed = estimate_tokens(self._batch_header() + self._batch_footer())
+        batches: List[List[BatchItem]] = []
+        current: List[BatchItem] = []
+        used = fixed
+
+        for item in items:
+            cost = (
+                estimate_tokens(self._batch_item_text(item))
+                + BATCH_COMPLETION_TOKENS_PER_ITEM
             )
+            if current and used + cost > max_tokens:
+                batches.append(current)
+                current, used = [], fixed
+            current.append(item)
+            used += cost
 
-            # Verifica se a resposta é válida
-            content = response.choices[0].message.content
-            if not content:
-                raise ValueError("Resposta vazia do modelo")
+        if current:
+            batches.append(current)
+        return batches
 
-            # Tenta fazer o parse do JSON
-            try:
-                result = json.loads(content)
-            except json.JSONDecodeError as e:
-                print(f"Erro no JSON retornado pelo modelo: {content}")
-                raise e
+    def build_batch_request(self, items: List[BatchItem]) -> Tuple[List[Dict], Dict]:
+        """Monta uma única requisição que avalia todas as respostas do lote."""
+        prompt = (
+            self._batch_header()
+            + "".join(self._batch_item_text(item) for item in items)
+            + self._batch_footer()
+        )
+        messages = [
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT,
+            },
+            {"role": "user", "content": prompt},
+        ]
+        params = {
+            "model": config.GROQ_MODEL,
+            "temperature": 0.3,  # Baixa temperatura para respostas mais consistentes
+            "max_completion_tokens": BATCH_COMPLETION_TOKENS_PER_ITEM * len(items) + 256,
+        }
+        if self.response_mode == "json":
+            params["response_format"] = {"type": "json_object"}
+        return messages, params
+
+    def parse_batch_response(self, content: Optional[str]) -> Dict[int, EvaluationResult]:
+        """Converte o JSON array retornado pelo modelo em {question_index: resultado}."""
+        if not content:
+            raise ValueError("Resposta vazia do modelo")
+
+        raw = extract_json(content, "{[")
+        if raw is None:
+            print(f"Erro no JSON retornado pelo modelo: {content}")
+            raise ValueError("Resposta do modelo não contém JSON")
+        data = json.loads(raw)
+
+        # Alguns modelos envolvem a lista em um objeto
+        if isinstance(data, dict):
+            data = next((v for v in data.values() if isinstance(v, list)), None)
+        if not isinstance(data, list):
+            raise ValueError(f"Resposta do modelo não é uma lista de avaliações: {content}")
 
-            # Valida os campos necessários
-            if "score" not in result or "feedback" not in result:
+        results = {}
+        for entry in data:
+            if not isinstance(entry, dict) or "question_index" not in entry:
                 raise ValueError(
-                    f"Resposta do modelo não contém os campos necessários: {result}"
+                    f"Resposta do modelo não contém os campos necessários: {entry}"
                 )
-
-            return EvaluationResult(
-                score=float(result["score"]), feedback=result["feedback"]
+            score, feedback = validate_evaluation(entry)
+            results[int(entry["question_index"])] = EvaluationResult(
+                score=score, feedback=feedback
             )
+        return results
+
+    def _evaluate_batch(self, items: List[BatchItem]) -> Dict[int, EvaluationResult]:
+        messages, params = self.build_batch_request(items)
+
+        content = self.cache.get(messages, params) if self.cache else None
+        from_cache = content is not None
+        if from_cache:
+            token_meter.record_cached("batch_evaluation")
+        else:
+            with tracer.span("llm_request", stage="batch_evaluation", items=len(items)):
+                content = self._complete(messages, params, "batch_evaluation", openers="{[")
+
+        results = self.parse_batch_response(content)
 
+        expected = {item.question_index for item in items}
+        if self.cache and not from_cache and expected <= set(results):
+            self.cache.set(messages, params, content)
+        return {index: result for index, result in results.items() if index in expected}
+
+    def evaluate_answers(
+        self, items: List[BatchItem], max_tokens: int = EVAL_BATCH_MAX_TOKENS
+    ) -> Dict[int, EvaluationResult]:
+        """
+        Avalia várias respostas do mesmo candidato com uma requisição por
+        lote, em vez de uma por questão. Lotes que excedem max_tokens são
+        divididos automaticamente.
+
+        Args:
+            items: Respostas a avaliar
+            max_tokens: Orçamento de tokens (prompt + saída) por requisição
+
+        Returns:
+            Dict {question_index: EvaluationResult}. Questões que o modelo
+            deixar de fora do lote são avaliadas individualmente
+
+        Raises:
+            Erros transitórios do Groq (retryable_errors()) após esgotar as tentativas
+        """
+        items = [self._fit_item(item) for item in items]
+        results: Dict[int, EvaluationResult] = {}
+        for batch in self.split_batch(items, max_tokens):
+            try:
+                results.update(self._evaluate_batch(batch))
+            except retryable_errors():
+                raise
+            except Exception as e:
+                print(f"Erro na avaliação em lote, avaliando individualmente: {str(e)}")
+
+            for item in batch:
+                if item.question_index not in results:
+                    results[item.question_index] = self.evaluate_answer(
+                        item.transcribed_answer,
+                        item.question,
+                        item.expected_answer,
+                        item.job_question,
+                    )
+        return results
+
+    async def evaluate_answer_async(
+        self,
+        client: AsyncGroqClient,
+        transcribed_answer: str,
+        question: str,
+        expected_answer: str,
+        job_question: Optional[JobQuestion] = None,
+    ) -> EvaluationResult:
+        """
+        Versão assíncrona de evaluate_answer, para avaliar muitas respostas
+        ao mesmo tempo com um AsyncGroqClient compartilhado.
+        """
+        messages, params = self.build_request(
+            transcribed_answer, question, expected_answer, job_question
+        )
+
+        try:
+            content = self.cache.get(messages, params) if self.cache else None
+            from_cache = content is not None
+
+            if from_cache:
+                token_meter.record_cached("evaluation")
+            else:
+                with tracer.span("llm_request", stage="evaluation"):
+                    content = await self._complete_async(client, messages, params, "evaluation")
+
+            evaluation = self.parse_response(content)
+
+            if self.cache and not from_cache:
+                self.cache.set(messages, params, content)
+
+            return evaluation
+
+        except retryable_errors():
+            raise
+        except Exception as e:
+            return self._error_result(e)
+
+    async def _evaluate_batch_async(
+        self, client: AsyncGroqClient, items: List[BatchItem]
+    ) -> Dict[int, EvaluationResult]:
+        """Versão assíncrona de _evaluate_batch."""
+        messages, params = self.build_batch_request(items)
+
+        content = self.cache.get(messages, params) if self.cache else None
+        from_cache = content is not None
+        if from_cache:
+            token_meter.record_cached("batch_evaluation")
+        else:
+            with tracer.span("llm_request", stage="batch_evaluation", items=len(items)):
+                content = await self._complete_async(
+                    client, messages, params, "batch_evaluation", openers="{["
+                )
+
+        results = self.parse_batch_response(content)
+
+        expected = {item.question_index for item in items}
+        if self.cache and not from_cache and expected <= set(results):
+            self.cache.set(messages, params, content)
+        return {index: result for index, result in results.items() if index in expected}
+
+    async def _evaluate_batch_or_each_async(
+        self, client: AsyncGroqClient, batch: List[BatchItem]
+    ) -> Dict[int, EvaluationResult]:
+        """Avalia um lote e, em paralelo, as questões que ficarem de fora dele."""
+        results: Dict[int, EvaluationResult] = {}
+        try:
+            results.update(await self._evaluate_batch_async(client, batch))
+        except retryable_errors():
+            raise
         except Exception as e:
-            print(f"Erro ao processar resposta da IA: {str(e)}")
-            # Retorna uma avaliação de erro
-            return EvaluationResult(
-                score=0.0,
-                feedback=f"Erro ao avaliar resposta: {str(e)}. Por favor, tente novamente.",
+            print(f"Erro na avaliação em lote, avaliando individualmente: {str(e)}")
+
+        missing = [item for item in batch if item.question_index not in results]
+        evaluations = await asyncio.gather(
+            *(
+                self.evaluate_answer_async(
+                    client,
+                    item.transcribed_answer,
+                    item.question,
+                    item.expected_answer,
+                    item.job_question,
+                )
+                for item in missing
+            )
+        )
+        results.update(
+            (item.question_index, evaluation) for item, evaluation in zip(missing, evaluations)
+        )
+        return results
+
+    async def evaluate_answers_async(
+        self,
+        client: AsyncGroqClient,
+        items: List[BatchItem],
+        max_tokens: int = EVAL_BATCH_MAX_TOKENS,
+    ) -> Dict[int, EvaluationResult]:
+        """
+        Versão assíncrona de evaluate_answers: os lotes (e as avaliações
+        individuais de questões deixadas de fora) são enviados em paralelo.
+
+        Raises:
+            Erros transitórios do Groq (retryable_errors()) após esgotar as tentativas
+        """
+        items = [self._fit_item(item) for item in items]
+        results: Dict[int, EvaluationResult] = {}
+        for batch_results in await asyncio.gather(
+            *(
+                self._evaluate_batch_or_each_async(client, batch)
+                for batch in self.split_batch(items, max_tokens)
             )
+        ):
+            results.update(batch_results)
+        return results
@@ -1,11 +1,17 @@
 from typing import Dict, List, Optional, Tuple
-import json
+import asyncio
 import os
 import re
-from dataclasses import dataclass, asdict
+import threading
+from dataclasses import dataclass
 
-from .job_matcher import JobPosition, extract_job_position, load_job_questions
-from .answer_evaluator import AnswerEvaluator, EvaluationResult
+from .job_matcher import JobPosition, load_job_questions
+from .answer_evaluator import AnswerEvaluator, BatchItem
+from .results_store import ResultsStore, report_path
+from .question_splitter import split_answers
+
+# Banco de avaliações criado em output_dir quando nenhum store é informado
+RESULTS_DB_NAME = "evaluations.sqlite3"
 
 @dataclass
 class QuestionEvaluation:
@@ -15,79 +21,58 @@ class QuestionEvaluation:
     score: float
     feedback: str
 
-    @classmethod
-    def from_dict(cls, data: Dict) -> 'QuestionEvaluation':
-        """Cria uma instância de QuestionEvaluation a partir de um dicionário"""
-        return cls(
-            question=data['question'],
-            transcribed_answer=data['transcribed_answer'],
-            expected_answer=data['expected_answer'],
-            score=data['score'],
-            feedback=data['feedback']
-        )
-
-@dataclass
-class InterviewEvaluation:
-    candidate_name: str
-    job_position: str
-    evaluations: List[QuestionEvaluation]
-    average_score: float
-
-    @classmethod
-    def from_dict(cls, data: Dict) -> 'InterviewEvaluation':
-        """Cria uma instância de InterviewEvaluation a partir de um dicionário"""
-        evaluations = [
-            QuestionEvaluation.from_dict(eval_data) 
-            for eval_data in data['evaluations']
-        ]
-        return cls(
-            candidate_name=data['candidate_name'],
-            job_position=data['job_position'],
-            evaluations=evaluations,
-            average_score=data['average_score']
+class InterviewEvaluator:
+    def __init__(
+        self,
+        response_cache=None,
+        store: Optional[ResultsStore] = None,
+        auto_export: bool = False,
+        session_min_similarity: float = 0.5,
+        async_client=None
+    ):
+        """
+        Args:
+            response_cache: ResponseCache opcional repassado ao AnswerEvaluator
+            store: Banco de avaliações. Se não informado, usa
+                output_dir/evaluations.sqlite3 de cada chamada
+            auto_export: Se True, regrava o relatório JSON do candidato
+                após cada avaliação. Se False, as entrevistas avaliadas são
+                exportadas uma vez, em export_pending (ex: ao fim da execução)
+            session_min_similarity: Semelhança mínima para localizar uma
+                pergunta em uma gravação completa (ver split_answers)
+            async_client: BackgroundAsyncClient opcional repassado ao
+                AnswerEvaluator; é fechado em close()
+        """
+        self.answer_evaluator = AnswerEvaluator(
+            cache=response_cache, async_client=async_client
         )
+        self.async_client = async_client
+        self.store = store
+        self.auto_export = auto_export
+        self.session_min_similarity = session_min_similarity
+        self._stores: Dict[str, ResultsStore] = {}
+        self._stores_lock = threading.Lock()
+        # Entrevistas cujo relatório anterior ao banco já foi verificado
+        self._imported = set()
+        # Entrevistas gravadas e ainda não exportadas (sem auto_export)
+        self._pending_exports = set()
 
-    def to_dict(self) -> Dict:
-        return asdict(self)
-
-    def save_to_json(self, output_dir: str) -> str:
-        """Salva a avaliação em JSON e retorna o caminho do arquivo"""
-        output_path = os.path.join(
-            output_dir,
-            f"evaluation_{self.candidate_name}_{self.job_position}.json"
-        )
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
-            
-        return output_path
-
-    def update_evaluation(self, new_evaluation: QuestionEvaluation) -> bool:
-        """
-        Atualiza ou adiciona uma nova avaliação à lista de avaliações.
-        Retorna True se atualizou uma existente, False se adicionou nova.
-        """
-        # Procura por uma avaliação existente com a mesma pergunta
-        for i, eval_item in enumerate(self.evaluations):
-            if eval_item.question == new_evaluation.question:
-                self.evaluations[i] = new_evaluation
-                return True
-                
-        # Se não encontrou, adiciona nova avaliação
-        self.evaluations.append(new_evaluation)
-        return False
-
-    def update_average_score(self):
-        """Atualiza a média das notas"""
-        if not self.evaluations:
-            self.average_score = 0.0
-        else:
-            total_score = sum(e.score for e in self.evaluations)
-            self.average_score = total_score / len(self.evaluations)
+    def close(self):
+        """Libera o cliente assíncrono do Groq, se houver."""
+        if self.async_client is not None:
+            self.async_client.close()
+            self.async_client = None
 
-class InterviewEvaluator:
-    def __init__(self):
-        self.answer_evaluator = AnswerEvaluator()
+    def get_store(self, output_dir: str) -> ResultsStore:
+        """Retorna o banco de avaliações usado para output_dir."""
+        if self.store is not None:
+            return self.store
+        with self._stores_lock:
+            if output_dir not in self._stores:
+                self._stores[output_dir] = ResultsStore(
+                    os.path.join(output_dir, RESULTS_DB_NAME)
+                )
+            return self._stores[output_dir]
 
     def parse_video_filename(self, filename: str) -> Tuple[str, str, int]:
         """
@@ -124,6 +109,23 @@ class InterviewEvaluator:
         except Exception as e:
             raise ValueError(f"Erro ao processar nome do arquivo {filename}: {str(e)}")
 
+    def is_session_filename(self, filename: str) -> bool:
+        """True para gravações completas (sem o sufixo _qN)."""
+        return not re.search(r'_q\d+$', os.path.splitext(filename)[0])
+
+    def parse_session_filename(self, filename: str) -> Tuple[str, str]:
+        """
+        Extrai candidato e vaga de uma gravação completa da entrevista.
+        Formato esperado: candidato_nome_cargo.mp4
+        
+        Returns:
+            Tuple[nome_candidato, cargo]
+        """
+        parts = os.path.splitext(filename)[0].split('_')
+        if len(parts) < 3:
+            raise ValueError(f"Nome do arquivo inválido: {filename}")
+        return parts[1], parts[-1]
+
     def process_single_answer(
         self,
         video_filename: str,
@@ -144,20 +146,17 @@ class InterviewEvaluator:
             QuestionEvaluation ou None se houver erro
         """
         try:
-            # Ajusta o índice para 0-based
-            question_idx = question_number - 1
-            
-            if question_idx < 0 or question_idx >= len(job_data.questions):
+            question_data = job_data.question(question_number)
+            if question_data is None:
                 print(f"Número de questão inválido: {question_number}")
                 return None
-                
-            question_data = job_data.questions[question_idx]
             
             # Avalia a resposta
             result = self.answer_evaluator.evaluate_answer(
                 transcribed_answer=transcription,
                 question=question_data.question,
-                expected_answer=question_data.expected_answer
+                expected_answer=question_data.expected_answer,
+                job_question=question_data
             )
             
             return QuestionEvaluation(
@@ -176,19 +175,26 @@ class InterviewEvaluator:
         self,
         video_filename: str,
         transcription: str,
-        output_dir: str
+        output_dir: str,
+        transcript=None
     ) -> Optional[str]:
         """
         Avalia uma resposta individual e atualiza/cria o arquivo de avaliação.
+        Gravações completas (sem _qN) com transcript são divididas por
+        questão (ver evaluate_session).
         
         Args:
             video_filename: Nome do arquivo de vídeo (ex: candidato_joao_frontend_q1.mp4)
             transcription: Texto transcrito da resposta
             output_dir: Diretório para salvar a avaliação
+            transcript: SegmentArray com os tempos (necessário para gravações completas)
             
         Returns:
             Caminho do arquivo JSON com os resultados ou None se houver erro
         """
+        if transcript is not None and self.is_session_filename(video_filename):
+            return self.evaluate_session(video_filename, transcript, output_dir)
+
         try:
             # Extrai informações do nome do arquivo
             candidate_name, job_position, question_number = self.parse_video_filename(video_filename)
@@ -209,38 +215,384 @@ class InterviewEvaluator:
             if not evaluation:
                 return None
             
-            # Tenta carregar avaliação existente ou cria nova
-            output_path = os.path.join(
-                output_dir,
-                f"evaluation_{candidate_name}_{job_position}.json"
+            return self.save_evaluations(
+                candidate_name, job_position, [(question_number, evaluation)], output_dir
             )
             
-            if os.path.exists(output_path):
-                try:
-                    with open(output_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        current_eval = InterviewEvaluation.from_dict(data)
-                except Exception as e:
-                    print(f"Erro ao carregar avaliação existente: {str(e)}")
-                    return None
-            else:
-                # Cria nova avaliação
-                current_eval = InterviewEvaluation(
-                    candidate_name=candidate_name,
-                    job_position=job_position,
-                    evaluations=[],
-                    average_score=0.0
-                )
+        except Exception as e:
+            print(f"Erro ao avaliar entrevista: {str(e)}")
+            return None
+
+    def evaluate_session(
+        self,
+        video_filename: str,
+        transcript,
+        output_dir: str
+    ) -> Optional[str]:
+        """
+        Avalia uma gravação completa da entrevista: localiza as perguntas da
+        vaga na transcrição, avalia cada resposta com process_single_answer
+        e grava todas as avaliações de uma vez.
+        
+        Args:
+            video_filename: Nome do arquivo (ex: candidato_joao_frontend.mp4)
+            transcript: SegmentArray da gravação completa
+            output_dir: Diretório para salvar a avaliação
             
-            # Atualiza ou adiciona a nova avaliação
-            current_eval.update_evaluation(evaluation)
+        Returns:
+            Caminho do arquivo JSON com os resultados ou None se houver erro
+        """
+        try:
+            candidate_name, job_position = self.parse_session_filename(video_filename)
+
+            job_data = load_job_questions(job_position)
+            if not job_data:
+                print(f"Não foi possível carregar as questões para a vaga: {job_position}")
+                return None
+
+            spans = split_answers(
+                transcript, job_data.questions, min_similarity=self.session_min_similarity
+            )
+            if not spans:
+                print(f"Nenhuma pergunta da vaga encontrada em {video_filename}")
+                return None
+
+            evaluations = []
+            for span in spans:
+                print(
+                    f"Questão {span.question_number}: resposta de "
+                    f"{span.start:.1f}s a {span.end:.1f}s"
+                )
+                evaluation = self.process_single_answer(
+                    video_filename, span.text, job_data, span.question_number
+                )
+                if evaluation:
+                    evaluations.append((span.question_number, evaluation))
+            if not evaluations:
+                return None
+
+            return self.save_evaluations(candidate_name, job_position, evaluations, output_dir)
+
+        except Exception as e:
+            print(f"Erro ao avaliar entrevista: {str(e)}")
+            return None
+
+    def save_evaluations(
+        self,
+        candidate_name: str,
+        job_position: str,
+        evaluations: List[Tuple[int, QuestionEvaluation]],
+        output_dir: str
+    ) -> Optional[str]:
+        """
+        Grava as avaliações no banco (upsert por questão) e, com auto_export,
+        atualiza o relatório JSON do candidato.
+        
+        Args:
+            evaluations: Lista de (número da questão, QuestionEvaluation)
             
-            # Atualiza a média
-            current_eval.update_average_score()
+        Returns:
+            Caminho do relatório JSON. Sem auto_export, o relatório é
+            gravado depois, por export_pending
+        """
+        store = self.get_store(output_dir)
+        self.import_existing_report(candidate_name, job_position, output_dir)
+        store.upsert(candidate_name, job_position, evaluations)
+        if not self.auto_export:
+            with self._stores_lock:
+                self._pending_exports.add((output_dir, candidate_name, job_position))
+            return report_path(output_dir, candidate_name, job_position)
+        return store.export_json(candidate_name, job_position, output_dir)
+
+    def export_pending(self) -> List[str]:
+        """
+        Exporta os relatórios JSON das entrevistas gravadas desde a última
+        chamada, uma vez cada.
+
+        Returns:
+            Caminhos dos relatórios gravados
+        """
+        with self._stores_lock:
+            pending = sorted(self._pending_exports)
+            self._pending_exports.clear()
+
+        paths = []
+        for output_dir, candidate_name, job_position in pending:
+            path = self.get_store(output_dir).export_json(candidate_name, job_position, output_dir)
+            if path:
+                paths.append(path)
+        return paths
+
+    def import_existing_report(self, candidate_name: str, job_position: str, output_dir: str):
+        """
+        Na primeira gravação da entrevista, traz para o banco o relatório
+        JSON gerado por versões anteriores (sem banco), se existir. Sem
+        isso, a exportação a partir do banco descartaria as questões já
+        avaliadas.
+        """
+        key = (output_dir, candidate_name, job_position)
+        with self._stores_lock:
+            if key in self._imported:
+                return
+            self._imported.add(key)
+
+        path = report_path(output_dir, candidate_name, job_position)
+        if not os.path.exists(path):
+            return
+        job_data = load_job_questions(job_position)
+        question_numbers = {
+            question.question: number
+            for number, question in enumerate(job_data.questions if job_data else [], start=1)
+        }
+        try:
+            imported = self.get_store(output_dir).import_report(path, question_numbers)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Não foi possível importar o relatório {path}: {str(e)}")
+            return
+        if imported:
+            print(f"{imported} avaliação(ões) de {os.path.basename(path)} importada(s) para o banco")
+
+    def group_videos(self, video_filenames: List[str]) -> Dict[Tuple[str, str], List[str]]:
+        """
+        Agrupa os vídeos por (candidato, vaga), para avaliação em lote.
+        Arquivos com nome fora do padrão são ignorados, assim como as
+        gravações completas, que são avaliadas sozinhas (evaluate_session).
+        """
+        groups: Dict[Tuple[str, str], List[str]] = {}
+        for filename in video_filenames:
+            if self.is_session_filename(filename):
+                continue
+            try:
+                candidate_name, job_position, _ = self.parse_video_filename(filename)
+            except ValueError as e:
+                print(str(e))
+                continue
+            groups.setdefault((candidate_name, job_position), []).append(filename)
+        return groups
+
+    def evaluate_candidate(
+        self,
+        candidate_name: str,
+        job_position: str,
+        answers: Dict[int, str],
+        output_dir: str
+    ) -> Optional[str]:
+        """
+        Avalia todas as respostas de um candidato para uma vaga com uma
+        única requisição ao LLM (dividida se exceder o orçamento de tokens)
+        e grava o arquivo de avaliação uma só vez.
+        
+        Args:
+            candidate_name: Nome do candidato
+            job_position: Vaga
+            answers: {número da questão (1-based): texto transcrito}
+            output_dir: Diretório para salvar a avaliação
             
-            # Salva o resultado
-            return current_eval.save_to_json(output_dir)
+        Returns:
+            Caminho do arquivo JSON com os resultados ou None se houver erro
+        """
+        try:
+            items = self._candidate_items(job_position, answers)
+            if not items:
+                return None
+
+            results = self.answer_evaluator.evaluate_answers(items)
+
+            evaluations = self._batch_evaluations(items, results)
+            return self.save_evaluations(candidate_name, job_position, evaluations, output_dir)
+
+        except Exception as e:
+            print(f"Erro ao avaliar entrevista: {str(e)}")
+            return None
+
+    def _candidate_items(self, job_position: str, answers: Dict[int, str]) -> List[BatchItem]:
+        """Respostas do candidato com as questões da vaga, para avaliação em lote."""
+        job_data = load_job_questions(job_position)
+        if not job_data:
+            print(f"Não foi possível carregar as questões para a vaga: {job_position}")
+            return []
+
+        items = []
+        for question_number, transcription in sorted(answers.items()):
+            question_data = job_data.question(question_number)
+            if question_data is None:
+                print(f"Número de questão inválido: {question_number}")
+                continue
+            items.append(BatchItem(
+                question_index=question_number,
+                transcribed_answer=transcription,
+                question=question_data.question,
+                expected_answer=question_data.expected_answer,
+                job_question=question_data
+            ))
+        return items
+
+    def _batch_evaluations(
+        self, items: List[BatchItem], results: Dict
+    ) -> List[Tuple[int, QuestionEvaluation]]:
+        return [
+            (item.question_index, QuestionEvaluation(
+                question=item.question,
+                transcribed_answer=item.transcribed_answer,
+                expected_answer=item.expected_answer,
+                score=results[item.question_index].score,
+                feedback=results[item.question_index].feedback
+            ))
+            for item in items
+        ]
+
+    def evaluate_candidates(
+        self,
+        groups: Dict[Tuple[str, str], Dict[int, str]],
+        output_dir: str
+    ) -> Dict[Tuple[str, str], Optional[str]]:
+        """
+        Avalia vários candidatos (evaluate_candidate para cada grupo). Com
+        async_client, as requisições de todos os grupos são enviadas ao
+        mesmo tempo; sem ele, um grupo por vez.
+        
+        Args:
+            groups: {(candidato, vaga): {número da questão: texto transcrito}}
             
+        Returns:
+            {(candidato, vaga): caminho do resultado ou None se houver erro}
+        """
+        if self.async_client is None:
+            return {
+                group: self.evaluate_candidate(*group, answers, output_dir)
+                for group, answers in groups.items()
+            }
+
+        async def evaluate_all():
+            client = self.async_client.client
+            paths = await asyncio.gather(*(
+                self.evaluate_candidate_async(client, *group, answers, output_dir)
+                for group, answers in groups.items()
+            ))
+            return dict(zip(groups, paths))
+
+        return self.async_client.run(evaluate_all())
+
+    async def evaluate_candidate_async(
+        self,
+        client,
+        candidate_name: str,
+        job_position: str,
+        answers: Dict[int, str],
+        output_dir: str
+    ) -> Optional[str]:
+        """
+        Versão assíncrona de evaluate_candidate (client: AsyncGroqClient).
+        A gravação no banco roda em outra thread, sem parar o event loop.
+        """
+        try:
+            items = self._candidate_items(job_position, answers)
+            if not items:
+                return None
+
+            results = await self.answer_evaluator.evaluate_answers_async(client, items)
+
+            evaluations = self._batch_evaluations(items, results)
+            return await asyncio.to_thread(
+                self.save_evaluations, candidate_name, job_position, evaluations, output_dir
+            )
+
         except Exception as e:
             print(f"Erro ao avaliar entrevista: {str(e)}")
-            return None 
\ No newline at end of file
+            return None
+
+    async def process_single_answer_async(
+        self,
+        client,
+        video_filename: str,
+        transcription: str,
+        job_data: JobPosition,
+        question_number: int
+    ) -> Optional[QuestionEvaluation]:
+        """Versão assíncrona de process_single_answer (client: AsyncGroqClient)."""
+        try:
+            question_data = job_data.question(question_number)
+            if question_data is None:
+                print(f"Número de questão inválido: {question_number}")
+                return None
+
+            result = await self.answer_evaluator.evaluate_answer_async(
+                client,
+                transcribed_answer=transcription,
+                question=question_data.question,
+                expected_answer=question_data.expected_answer,
+                job_question=question_data
+            )
+
+            return QuestionEvaluation(
+                question=question_data.question,
+                transcribed_answer=transcription,
+                expected_answer=question_data.expected_answer,
+                score=result.score,
+                feedback=result.feedback
+            )
+
+        except Exception as e:
+            print(f"Erro ao processar resposta: {str(e)}")
+            return None
+
+    async def evaluate_interview_async(
+        self,
+        client,
+        video_filename: str,
+        transcription: str,
+        output_dir: str,
+        transcript=None
+    ) -> Optional[str]:
+        """
+        Versão assíncrona de evaluate_interview (client: AsyncGroqClient).
+        As respostas de uma gravação completa são avaliadas em paralelo.
+        
+        Returns:
+            Caminho do resultado ou None se houver erro
+        """
+        try:
+            if transcript is not None and self.is_session_filename(video_filename):
+                candidate_name, job_position = self.parse_session_filename(video_filename)
+            else:
+                candidate_name, job_position, question_number = self.parse_video_filename(
+                    video_filename
+                )
+
+            job_data = load_job_questions(job_position)
+            if not job_data:
+                print(f"Não foi possível carregar as questões para a vaga: {job_position}")
+                return None
+
+            if transcript is not None and self.is_session_filename(video_filename):
+                spans = split_answers(
+                    transcript, job_data.questions, min_similarity=self.session_min_similarity
+                )
+                if not spans:
+                    print(f"Nenhuma pergunta da vaga encontrada em {video_filename}")
+                    return None
+                answers = [(span.question_number, span.text) for span in spans]
+            else:
+                answers = [(question_number, transcription)]
+
+            results = await asyncio.gather(*(
+                self.process_single_answer_async(
+                    client, video_filename, text, job_data, number
+                )
+                for number, text in answers
+            ))
+            evaluations = [
+                (number, evaluation)
+                for (number, _), evaluation in zip(answers, results)
+                if evaluation
+            ]
+            if not evaluations:
+                return None
+
+            return await asyncio.to_thread(
+                self.save_evaluations, candidate_name, job_position, evaluations, output_dir
+            )
+
+        except Exception as e:
+            print(f"Erro ao avaliar entrevista: {str(e)}")
+            return None
@@ -1,18 +1,44 @@
 from typing import Dict, List, Optional
 import os
 import json
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
+
+# Diretório com um JSON por vaga (data/job_positions/<vaga>.json)
+JOB_POSITIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'data',
+    'job_positions'
+)
+
+
+def escape_prompt_text(text: str) -> str:
+    """
+    Escapa o texto para uso entre aspas no prompt (barras e aspas duplas).
+    """
+    cleaned = text.replace("\\", "\\\\").replace('"', '\\"')
+    return cleaned.strip()
+
 
 @dataclass
 class JobQuestion:
     question: str
     expected_answer: str
     weight: float = 1.0
+    # Trechos do prompt já escapados, calculados uma vez por questão
+    prompt_question: str = field(init=False, repr=False, compare=False)
+    prompt_expected_answer: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.prompt_question = escape_prompt_text(self.question)
+        self.prompt_expected_answer = escape_prompt_text(self.expected_answer)
 
 @dataclass
 class JobPosition:
     name: str
     questions: List[JobQuestion]
+    # Idioma das entrevistas (ex: "pt"), usado pelo Whisper no lugar da detecção
+    language: Optional[str] = None
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'JobPosition':
@@ -29,9 +55,128 @@ class JobPosition:
         ]
         return cls(
             name=data['name'],
-            questions=questions
+            questions=questions,
+            language=data.get('language')
         )
 
+    def question(self, number: int) -> Optional[JobQuestion]:
+        """Questão pelo número (1-based, como no sufixo _qN), ou None."""
+        if 1 <= number <= len(self.questions):
+            return self.questions[number - 1]
+        return None
+
+
+def validate_job_data(data: Dict, expected_name: Optional[str] = None) -> List[str]:
+    """
+    Valida o conteúdo de um arquivo de vaga. Retorna a lista de problemas
+    encontrados (vazia se o arquivo for válido).
+    """
+    if not isinstance(data, dict):
+        return ["o arquivo deve conter um objeto JSON"]
+
+    errors = []
+    name = data.get('name')
+    if not isinstance(name, str) or not name:
+        errors.append("campo 'name' ausente ou vazio")
+    elif expected_name and name.lower() != expected_name.lower():
+        errors.append(f"'name' ({name}) difere do nome do arquivo ({expected_name})")
+
+    language = data.get('language')
+    if language is not None and (not isinstance(language, str) or not language.strip()):
+        errors.append("'language' deve ser um código de idioma (ex: \"pt\")")
+
+    questions = data.get('questions')
+    if not isinstance(questions, list) or not questions:
+        errors.append("a vaga deve ter ao menos uma questão em 'questions'")
+        return errors
+
+    for number, q in enumerate(questions, start=1):
+        if not isinstance(q, dict):
+            errors.append(f"questão {number}: deve ser um objeto")
+            continue
+        for key in ('question', 'expected_answer'):
+            if not isinstance(q.get(key), str) or not q[key].strip():
+                errors.append(f"questão {number}: campo '{key}' ausente ou vazio")
+        weight = q.get('weight', 1.0)
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight <= 0:
+            errors.append(f"questão {number}: 'weight' deve ser um número positivo")
+    return errors
+
+
+class JobPositionRegistry:
+    def __init__(self, directory: str = JOB_POSITIONS_DIR):
+        """
+        Vagas carregadas e validadas uma única vez e mantidas em memória.
+        Cada consulta confere o mtime do arquivo (um stat), então edições
+        em data/job_positions são recarregadas sem reiniciar o processo.
+
+        Args:
+            directory: Diretório com um JSON por vaga
+        """
+        self.directory = directory
+        self._lock = threading.Lock()
+        # vaga -> (mtime do arquivo, JobPosition)
+        self._positions: Dict[str, tuple] = {}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f'{name}.json')
+
+    def _load(self, name: str, mtime: float) -> JobPosition:
+        with open(self._path(name), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        errors = validate_job_data(data, expected_name=name)
+        if errors:
+            raise ValueError("; ".join(errors))
+        position = JobPosition.from_dict(data)
+        self._positions[name] = (mtime, position)
+        return position
+
+    def get(self, name: str) -> JobPosition:
+        """
+        Retorna a vaga, recarregando o arquivo apenas se ele mudou.
+
+        Raises:
+            FileNotFoundError: Se não houver arquivo para a vaga
+            ValueError: Se o arquivo for inválido
+        """
+        mtime = os.stat(self._path(name)).st_mtime
+        with self._lock:
+            cached = self._positions.get(name)
+            if cached and cached[0] == mtime:
+                return cached[1]
+            return self._load(name, mtime)
+
+    def question(self, name: str, number: int) -> Optional[JobQuestion]:
+        """Questão da vaga pelo número (1-based), ou None se não existir."""
+        return self.get(name).question(number)
+
+    def names(self) -> List[str]:
+        """Vagas disponíveis no diretório."""
+        return sorted(
+            os.path.splitext(f)[0] for f in os.listdir(self.directory) if f.endswith('.json')
+        )
+
+    def load_all(self) -> Dict[str, str]:
+        """
+        Carrega e valida todas as vagas de uma vez, para que arquivos
+        inválidos apareçam no início do processamento e não no meio do lote.
+
+        Returns:
+            Dict {vaga: erro} com os arquivos que não puderam ser carregados
+        """
+        errors = {}
+        for name in self.names():
+            try:
+                self.get(name)
+            except (OSError, ValueError) as e:
+                errors[name] = str(e)
+        return errors
+
+
+# Registro compartilhado pelo processo
+registry = JobPositionRegistry()
+
+
 def extract_job_position(filename: str) -> Optional[str]:
     """
     Extrai o nome da vaga do nome do arquivo.
@@ -48,25 +193,34 @@ def extract_job_position(filename: str) -> Optional[str]:
     except Exception:
         return None
 
+def job_language(filename: str) -> Optional[str]:
+    """
+    Idioma definido na vaga do vídeo (campo "language" do JSON), ou None se
+    a vaga não definir um ou não puder ser carregada. Aceita vídeos por
+    questão (candidato_nome_cargo_qN.mp4) e gravações completas
+    (candidato_nome_cargo.mp4).
+    """
+    filename = os.path.basename(filename)
+    job_position = extract_job_position(filename)
+    if job_position is None:
+        parts = os.path.splitext(filename)[0].split('_')
+        if len(parts) < 3:
+            return None
+        job_position = parts[-1].lower()
+    try:
+        return registry.get(job_position).language
+    except (OSError, ValueError):
+        return None
+
 def load_job_questions(job_position: str) -> Optional[JobPosition]:
     """
-    Carrega as questões para uma determinada vaga.
+    Carrega as questões para uma determinada vaga (do registro em memória).
     """
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-    questions_path = os.path.join(
-        base_dir, 
-        'data', 
-        'job_positions', 
-        f'{job_position}.json'
-    )
-    
     try:
-        with open(questions_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return JobPosition.from_dict(data)
+        return registry.get(job_position)
     except FileNotFoundError:
         print(f"Arquivo de questões não encontrado para a vaga: {job_position}")
         return None
     except Exception as e:
         print(f"Erro ao carregar questões da vaga {job_position}: {str(e)}")
-        return None 
\ No newline at end of file
+        return None
@@ -0,0 +1,122 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import List, Set, Tuple
+
+from .job_matcher import JobQuestion
+
+
+@dataclass
+class AnswerSpan:
+    """Trecho de uma gravação completa com a resposta a uma questão."""
+    question_number: int  # 1-based, como no sufixo _qN
+    start: float  # segundos, logo após a pergunta
+    end: float
+    text: str
+    similarity: float  # semelhança entre a pergunta da vaga e a fala do entrevistador
+
+
+def normalize_words(text: str) -> List[str]:
+    """Minúsculas, sem acentos e sem pontuação."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return re.findall(r"\w+", text)
+
+
+def word_ngrams(words: List[str], n: int = 2) -> Set[Tuple[str, ...]]:
+    if len(words) < n:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i:i + n]) for i in range(len(words) - n + 1)}
+
+
+def question_similarity(question: str, spoken: str, n: int = 2) -> float:
+    """
+    Fração dos n-gramas de palavras da pergunta presentes na fala. Tolera
+    palavras a mais na fala ("então, a próxima pergunta é...") e pequenas
+    diferenças de transcrição.
+    """
+    question_ngrams = word_ngrams(normalize_words(question), n)
+    if not question_ngrams:
+        return 0.0
+    spoken_ngrams = word_ngrams(normalize_words(spoken), n)
+    return len(question_ngrams & spoken_ngrams) / len(question_ngrams)
+
+
+def _best_match(
+    segment_words: List[List[str]], question: str, max_window: int, n: int = 2
+) -> Tuple[float, int, int]:
+    """Melhor janela de 1 a max_window segmentos consecutivos para a pergunta."""
+    question_ngrams = word_ngrams(normalize_words(question), n)
+    best = (0.0, 0, 0)
+    if not question_ngrams:
+        return best
+    for first in range(len(segment_words)):
+        spoken: List[str] = []
+        for last in range(first, min(first + max_window, len(segment_words))):
+            spoken += segment_words[last]
+            common = question_ngrams & word_ngrams(spoken, n)
+            similarity = len(common) / len(question_ngrams)
+            # No empate fica a janela mais curta, sem trechos das respostas vizinhas
+            shorter = last - first < best[2] - best[1]
+            if similarity > best[0] or (similarity == best[0] > 0 and shorter):
+                best = (similarity, first, last)
+    return best
+
+
+def split_answers(
+    transcript,
+    questions: List[JobQuestion],
+    min_similarity: float = 0.5,
+    max_window: int = 4,
+) -> List[AnswerSpan]:
+    """
+    Divide a transcrição de uma entrevista completa em respostas, uma por
+    questão da vaga. Cada pergunta é localizada nos segmentos pela
+    semelhança com JobQuestion.question; a resposta vai do fim da pergunta
+    até o início da próxima pergunta encontrada (ou o fim da gravação).
+    As perguntas podem aparecer fora de ordem; as não encontradas são
+    ignoradas.
+
+    Args:
+        transcript: SegmentArray da gravação completa
+        questions: Questões da vaga, na ordem do arquivo (q1, q2, ...)
+        min_similarity: Semelhança mínima (0 a 1) para considerar a pergunta feita
+        max_window: Máximo de segmentos consecutivos que uma pergunta pode ocupar
+
+    Returns:
+        list: AnswerSpan em ordem de tempo
+    """
+    segment_words = [normalize_words(transcript.segment_text(i)) for i in range(len(transcript))]
+    matches = []
+    for number, question in enumerate(questions, start=1):
+        similarity, first, last = _best_match(segment_words, question.question, max_window)
+        if similarity >= min_similarity:
+            matches.append((first, last, number, similarity))
+        else:
+            print(f"Pergunta {number} não encontrada na gravação (semelhança {similarity:.2f})")
+
+    # Em caso de sobreposição, fica a pergunta com maior semelhança
+    matches.sort(key=lambda m: -m[3])
+    accepted: List[Tuple[int, int, int, float]] = []
+    for match in matches:
+        if all(match[1] < other[0] or match[0] > other[1] for other in accepted):
+            accepted.append(match)
+    accepted.sort()
+
+    spans = []
+    for i, (_, last, number, similarity) in enumerate(accepted):
+        answer_first = last + 1
+        answer_last = accepted[i + 1][0] - 1 if i + 1 < len(accepted) else len(transcript) - 1
+        if answer_first > answer_last:
+            print(f"Pergunta {number} sem resposta na gravação")
+            continue
+        spans.append(AnswerSpan(
+            question_number=number,
+            start=float(transcript.start[answer_first]),
+            end=float(transcript.end[answer_last]),
+            text=" ".join(
+                transcript.segment_text(j) for j in range(answer_first, answer_last + 1)
+            ),
+            similarity=similarity,
+        ))
+    return spans
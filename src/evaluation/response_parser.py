@@ -0,0 +1,99 @@
+import json
+from typing import Dict, Optional, Tuple
+
+
+class JsonStreamParser:
+    def __init__(self, openers: str = "{"):
+        """
+        Localiza, à medida que o texto chega, o primeiro valor JSON completo
+        (objeto ou array) na resposta do modelo. Texto antes do JSON
+        (introduções, cercas ```json) é ignorado, então a leitura do stream
+        pode parar assim que o valor fecha.
+
+        Args:
+            openers: Caracteres que iniciam o valor procurado ("{" ou "{[")
+        """
+        self.openers = openers
+        self.result: Optional[str] = None
+        self._buffer = []
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> Optional[str]:
+        """
+        Processa mais um trecho da resposta.
+
+        Returns:
+            O texto do primeiro valor JSON completo e válido, ou None se
+            ainda não houver um
+        """
+        if self.result is not None:
+            return self.result
+        for char in text:
+            if not self._stack:
+                if char in self.openers:
+                    self._stack.append("}" if char == "{" else "]")
+                    self._buffer = [char]
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._stack.append("}" if char == "{" else "]")
+            elif char in "}]":
+                if char != self._stack.pop():
+                    # Chaves desbalanceadas: não era JSON, procura o próximo
+                    self._stack.clear()
+                    continue
+                if not self._stack:
+                    candidate = "".join(self._buffer)
+                    try:
+                        json.loads(candidate)
+                    except ValueError:
+                        continue
+                    self.result = candidate
+                    return candidate
+        return None
+
+
+def extract_json(content: str, openers: str = "{") -> Optional[str]:
+    """Primeiro valor JSON completo de um texto já recebido por inteiro."""
+    return JsonStreamParser(openers).feed(content)
+
+
+def validate_evaluation(data: Dict) -> Tuple[float, str]:
+    """
+    Valida o objeto {"score", "feedback"} de uma avaliação.
+
+    Returns:
+        Tuple[nota, feedback]
+
+    Raises:
+        ValueError: Se faltar um campo, a nota não for um número de 0 a 10
+            ou o feedback não for um texto
+    """
+    if not isinstance(data, dict) or "score" not in data or "feedback" not in data:
+        raise ValueError(f"Resposta do modelo não contém os campos necessários: {data}")
+
+    score = data["score"]
+    if isinstance(score, bool):
+        raise ValueError(f"Nota inválida na resposta do modelo: {score}")
+    try:
+        score = float(score)
+    except (TypeError, ValueError):
+        raise ValueError(f"Nota inválida na resposta do modelo: {score}")
+    if not 0 <= score <= 10:
+        raise ValueError(f"Nota fora do intervalo de 0 a 10: {score}")
+
+    if not isinstance(data["feedback"], str):
+        raise ValueError(f"Feedback inválido na resposta do modelo: {data['feedback']}")
+    return score, data["feedback"]
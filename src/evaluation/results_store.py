@@ -0,0 +1,320 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+from tracing import tracer
+from workspace import atomic_write_json
+
+
+def report_path(output_dir: str, candidate_name: str, job_position: str) -> str:
+    """Caminho do relatório JSON da entrevista (evaluation_{candidato}_{vaga}.json)."""
+    return os.path.join(output_dir, f"evaluation_{candidate_name}_{job_position}.json")
+
+
+class ResultsStore:
+    # Exportações repetidas quando o banco muda durante a gravação do JSON
+    EXPORT_ATTEMPTS = 5
+
+    def __init__(self, db_path: str):
+        """
+        Armazena as avaliações em SQLite (modo WAL), uma linha por
+        (candidato, vaga, questão).
+
+        Cada gravação é um upsert atômico que também atualiza a soma e a
+        contagem de notas da entrevista, então a média é mantida de forma
+        incremental. Vários processos e threads podem gravar no mesmo banco
+        sem perder atualizações.
+
+        Args:
+            db_path: Caminho do arquivo SQLite
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connection()
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS evaluations (
+                candidate_name TEXT NOT NULL,
+                job_position TEXT NOT NULL,
+                question_index INTEGER NOT NULL,
+                question TEXT NOT NULL,
+                transcribed_answer TEXT NOT NULL,
+                expected_answer TEXT NOT NULL,
+                score REAL NOT NULL,
+                feedback TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (candidate_name, job_position, question_index)
+            );
+            CREATE TABLE IF NOT EXISTS interviews (
+                candidate_name TEXT NOT NULL,
+                job_position TEXT NOT NULL,
+                score_sum REAL NOT NULL DEFAULT 0,
+                answer_count INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (candidate_name, job_position)
+            );
+            CREATE INDEX IF NOT EXISTS idx_interviews_job
+                ON interviews (job_position);
+            """
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Uma conexão por thread (conexões SQLite não devem ser compartilhadas)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def upsert(
+        self,
+        candidate_name: str,
+        job_position: str,
+        evaluations: List[Tuple[int, object]],
+    ):
+        """
+        Grava ou substitui avaliações de um candidato em uma única transação.
+
+        Args:
+            candidate_name: Nome do candidato
+            job_position: Vaga
+            evaluations: Lista de (número da questão, QuestionEvaluation)
+        """
+        with tracer.span("save_results", questions=len(evaluations)):
+            conn = self._connection()
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                score_delta = 0.0
+                count_delta = 0
+                for question_index, evaluation in evaluations:
+                    row = conn.execute(
+                        "SELECT score FROM evaluations "
+                        "WHERE candidate_name = ? AND job_position = ? AND question_index = ?",
+                        (candidate_name, job_position, question_index),
+                    ).fetchone()
+                    if row is None:
+                        count_delta += 1
+                        score_delta += evaluation.score
+                    else:
+                        score_delta += evaluation.score - row[0]
+
+                    conn.execute(
+                        """INSERT INTO evaluations (
+                            candidate_name, job_position, question_index, question,
+                            transcribed_answer, expected_answer, score, feedback, updated_at
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT (candidate_name, job_position, question_index) DO UPDATE SET
+                            question = excluded.question,
+                            transcribed_answer = excluded.transcribed_answer,
+                            expected_answer = excluded.expected_answer,
+                            score = excluded.score,
+                            feedback = excluded.feedback,
+                            updated_at = excluded.updated_at""",
+                        (
+                            candidate_name,
+                            job_position,
+                            question_index,
+                            evaluation.question,
+                            evaluation.transcribed_answer,
+                            evaluation.expected_answer,
+                            evaluation.score,
+                            evaluation.feedback,
+                            now,
+                        ),
+                    )
+
+                conn.execute(
+                    """INSERT INTO interviews (
+                        candidate_name, job_position, score_sum, answer_count, updated_at
+                    ) VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (candidate_name, job_position) DO UPDATE SET
+                        score_sum = score_sum + excluded.score_sum,
+                        answer_count = answer_count + excluded.answer_count,
+                        updated_at = excluded.updated_at""",
+                    (candidate_name, job_position, score_delta, count_delta, now),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def has_interview(self, candidate_name: str, job_position: str) -> bool:
+        """True se a entrevista já tem alguma avaliação no banco."""
+        row = self._connection().execute(
+            "SELECT 1 FROM evaluations WHERE candidate_name = ? AND job_position = ? LIMIT 1",
+            (candidate_name, job_position),
+        ).fetchone()
+        return row is not None
+
+    def import_report(
+        self,
+        path: str,
+        question_numbers: Optional[Dict[str, int]] = None,
+    ) -> int:
+        """
+        Importa um relatório evaluation_{candidato}_{vaga}.json gravado antes
+        do banco existir, para que a próxima exportação não perca as questões
+        avaliadas antes. Entrevistas que já estão no banco não são alteradas.
+
+        Args:
+            path: Caminho do relatório JSON
+            question_numbers: {texto da pergunta: número da questão}. Perguntas
+                fora do mapa usam a posição no relatório (1-based)
+
+        Returns:
+            int: Número de avaliações importadas
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        candidate_name, job_position = data["candidate_name"], data["job_position"]
+        if self.has_interview(candidate_name, job_position):
+            return 0
+
+        question_numbers = question_numbers or {}
+        evaluations = [
+            (
+                question_numbers.get(item["question"], position),
+                SimpleNamespace(**{
+                    key: item[key]
+                    for key in (
+                        "question", "transcribed_answer", "expected_answer", "score", "feedback"
+                    )
+                }),
+            )
+            for position, item in enumerate(data.get("evaluations", []), start=1)
+        ]
+        if evaluations:
+            self.upsert(candidate_name, job_position, evaluations)
+        return len(evaluations)
+
+    def average_score(self, candidate_name: str, job_position: str) -> float:
+        """Média das notas da entrevista (0.0 se não houver avaliações)."""
+        row = self._connection().execute(
+            "SELECT score_sum, answer_count FROM interviews "
+            "WHERE candidate_name = ? AND job_position = ?",
+            (candidate_name, job_position),
+        ).fetchone()
+        if not row or not row[1]:
+            return 0.0
+        return row[0] / row[1]
+
+    def _revision(self, candidate_name: str, job_position: str) -> Optional[tuple]:
+        """Identifica o estado da entrevista: muda a cada upsert."""
+        return self._connection().execute(
+            "SELECT updated_at, score_sum, answer_count FROM interviews "
+            "WHERE candidate_name = ? AND job_position = ?",
+            (candidate_name, job_position),
+        ).fetchone()
+
+    def get_interview(self, candidate_name: str, job_position: str) -> Optional[Dict]:
+        """
+        Retorna a avaliação da entrevista no formato do relatório JSON
+        (candidato, vaga, avaliações e média), ou None se não existir.
+        """
+        rows = self._connection().execute(
+            "SELECT question, transcribed_answer, expected_answer, score, feedback "
+            "FROM evaluations WHERE candidate_name = ? AND job_position = ? "
+            "ORDER BY question_index",
+            (candidate_name, job_position),
+        ).fetchall()
+        if not rows:
+            return None
+
+        return {
+            "candidate_name": candidate_name,
+            "job_position": job_position,
+            "evaluations": [
+                {
+                    "question": question,
+                    "transcribed_answer": transcribed_answer,
+                    "expected_answer": expected_answer,
+                    "score": score,
+                    "feedback": feedback,
+                }
+                for question, transcribed_answer, expected_answer, score, feedback in rows
+            ],
+            "average_score": self.average_score(candidate_name, job_position),
+        }
+
+    def list_interviews(self, job_position: Optional[str] = None) -> List[Dict]:
+        """
+        Lista as entrevistas com média e número de respostas avaliadas,
+        opcionalmente filtradas por vaga, da maior para a menor média.
+        """
+        query = (
+            "SELECT candidate_name, job_position, score_sum, answer_count FROM interviews"
+        )
+        params: tuple = ()
+        if job_position:
+            query += " WHERE job_position = ?"
+            params = (job_position,)
+
+        interviews = [
+            {
+                "candidate_name": candidate_name,
+                "job_position": job,
+                "average_score": score_sum / count if count else 0.0,
+                "answer_count": count,
+            }
+            for candidate_name, job, score_sum, count in self._connection().execute(
+                query, params
+            )
+        ]
+        return sorted(interviews, key=lambda i: i["average_score"], reverse=True)
+
+    def export_json(self, candidate_name: str, job_position: str, output_dir: str) -> Optional[str]:
+        """
+        Exporta a entrevista para evaluation_{candidato}_{vaga}.json, no
+        formato atual do relatório. A gravação é atômica (arquivo
+        temporário + rename). Retorna o caminho ou None se não houver dados.
+        """
+        output_path = report_path(output_dir, candidate_name, job_position)
+        with tracer.span("save_json", file=os.path.basename(output_path)):
+            conn = self._connection()
+            # Outro processo pode gravar a entrevista e exportá-la enquanto esta
+            # exportação está em andamento. Depois do rename, se o banco mudou
+            # desde a leitura, o arquivo pode ter ficado com a versão antiga:
+            # exporta de novo até o arquivo refletir o estado atual
+            for _ in range(self.EXPORT_ATTEMPTS):
+                conn.execute("BEGIN")  # leitura consistente dos dados e da revisão
+                try:
+                    revision = self._revision(candidate_name, job_position)
+                    data = self.get_interview(candidate_name, job_position)
+                finally:
+                    conn.execute("COMMIT")
+                if data is None:
+                    return None
+
+                atomic_write_json(output_path, data)
+                if self._revision(candidate_name, job_position) == revision:
+                    break
+            return output_path
+
+    def export_all(self, output_dir: str, job_position: Optional[str] = None) -> List[str]:
+        """Exporta todas as entrevistas (ou as de uma vaga) para JSON."""
+        paths = []
+        for interview in self.list_interviews(job_position):
+            path = self.export_json(
+                interview["candidate_name"], interview["job_position"], output_dir
+            )
+            if path:
+                paths.append(path)
+        return paths
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
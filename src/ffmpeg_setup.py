@@ -1,5 +1,6 @@
 import os
 import platform
+import shutil
 
 def setup_ffmpeg():
     sistema = platform.system().lower()  # 'windows', 'linux', 'darwin'
@@ -29,3 +30,24 @@ def setup_ffmpeg():
     os.environ["PATH"] = os.path.dirname(ffmpeg_path) + os.pathsep + os.environ["PATH"]
 
     print(f"FFmpeg configurado para: {ffmpeg_path}")
+
+
+def get_ffmpeg_binary() -> str:
+    """
+    Retorna o executável do FFmpeg a ser chamado diretamente via subprocess.
+    Usa o binário configurado por setup_ffmpeg(); se não houver, procura no
+    PATH e, por fim, o binário distribuído com o imageio-ffmpeg (moviepy).
+    """
+    configured = os.environ.get("FFMPEG_BINARY")
+    if configured and os.path.isfile(configured):
+        return configured
+
+    from_path = shutil.which("ffmpeg")
+    if from_path:
+        return from_path
+
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return "ffmpeg"
@@ -0,0 +1,10 @@
+from .base import Job, JobQueue
+from .sqlite_queue import SQLiteJobQueue
+from .worker import JobWorker
+
+__all__ = [
+    'Job',
+    'JobQueue',
+    'SQLiteJobQueue',
+    'JobWorker'
+]
@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+@dataclass
+class Job:
+    """Job entregue a um worker."""
+    id: str
+    payload: Dict
+    attempts: int
+    # Identifica esta entrega: depois que o job é reentregue a outro
+    # worker, o ack/fail de uma entrega antiga é ignorado
+    receipt: str
+
+
+class JobQueue(ABC):
+    """
+    Interface das filas de jobs. Um job retirado com claim() fica invisível
+    por visibility_timeout segundos; se o worker não confirmar (ack) nesse
+    prazo, por ter travado ou caído, o job volta a ser entregue.
+    """
+
+    @abstractmethod
+    def submit(self, payload: Dict) -> str:
+        """Enfileira um job e retorna seu id."""
+
+    @abstractmethod
+    def claim(self, worker_id: str, visibility_timeout: float) -> Optional[Job]:
+        """Retira o próximo job disponível, ou None se a fila estiver vazia."""
+
+    @abstractmethod
+    def extend(self, job: Job, visibility_timeout: float) -> bool:
+        """Renova o prazo de um job em andamento. False se a entrega expirou."""
+
+    @abstractmethod
+    def ack(self, job: Job) -> bool:
+        """Marca o job como concluído. False se a entrega expirou."""
+
+    @abstractmethod
+    def fail(self, job: Job, error: str, retry_delay: float = 0.0) -> bool:
+        """Registra uma falha; o job volta à fila até esgotar as tentativas."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Número de jobs em cada estado."""
@@ -0,0 +1,144 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+from .base import Job, JobQueue
+
+JOB_STATUSES = ("pending", "running", "done", "failed")
+
+
+class SQLiteJobQueue(JobQueue):
+    def __init__(self, db_path: str, max_attempts: int = 3):
+        """
+        Fila de jobs em SQLite (modo WAL), para um único host ou testes.
+        Vários processos podem submeter e consumir jobs do mesmo arquivo;
+        cada claim é uma transação IMMEDIATE, então um job nunca é entregue
+        a dois workers ao mesmo tempo.
+
+        Args:
+            db_path: Caminho do arquivo SQLite
+            max_attempts: Entregas de um job antes de marcá-lo como falho
+        """
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection().executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                visible_at REAL NOT NULL,
+                receipt TEXT,
+                worker_id TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_ready
+                ON jobs (status, visible_at);
+            """
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Uma conexão por thread (conexões SQLite não devem ser compartilhadas)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def submit(self, payload: Dict) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._connection().execute(
+            "INSERT INTO jobs (id, payload, visible_at, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (job_id, json.dumps(payload, ensure_ascii=False), now, now, now),
+        )
+        return job_id
+
+    def claim(self, worker_id: str, visibility_timeout: float) -> Optional[Job]:
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Entregas expiradas que já esgotaram as tentativas não voltam à fila
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'prazo de processamento expirado', "
+                "updated_at = ? WHERE status = 'running' AND visible_at <= ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            row = conn.execute(
+                "SELECT id, payload, attempts FROM jobs "
+                "WHERE status IN ('pending', 'running') AND visible_at <= ? "
+                "ORDER BY created_at LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            job_id, payload, attempts = row
+            receipt = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                "visible_at = ?, receipt = ?, worker_id = ?, updated_at = ? WHERE id = ?",
+                (now + visibility_timeout, receipt, worker_id, now, job_id),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return Job(job_id, json.loads(payload), attempts + 1, receipt)
+
+    def _update_delivery(self, job: Job, assignments: str, params: tuple) -> bool:
+        """Atualiza o job somente se a entrega ainda for a atual."""
+        cursor = self._connection().execute(
+            f"UPDATE jobs SET {assignments}, updated_at = ? "
+            "WHERE id = ? AND receipt = ? AND status = 'running'",
+            (*params, time.time(), job.id, job.receipt),
+        )
+        return cursor.rowcount == 1
+
+    def extend(self, job: Job, visibility_timeout: float) -> bool:
+        return self._update_delivery(
+            job, "visible_at = ?", (time.time() + visibility_timeout,)
+        )
+
+    def ack(self, job: Job) -> bool:
+        return self._update_delivery(job, "status = 'done', error = NULL", ())
+
+    def fail(self, job: Job, error: str, retry_delay: float = 0.0) -> bool:
+        status = "failed" if job.attempts >= self.max_attempts else "pending"
+        return self._update_delivery(
+            job,
+            "status = ?, error = ?, visible_at = ?",
+            (status, error, time.time() + retry_delay),
+        )
+
+    def stats(self) -> Dict[str, int]:
+        counts = dict.fromkeys(JOB_STATUSES, 0)
+        counts.update(
+            self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+        )
+        return counts
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
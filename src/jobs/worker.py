@@ -0,0 +1,173 @@
+import os
+import socket
+import threading
+import time
+from typing import Dict, Optional
+
+from evaluation.job_matcher import job_language
+from transcription.fingerprint import FingerprintIndex
+from transcription.transcriber import Transcriber
+from transcription.transcription_cache import TranscriptionCache
+from transcription.vad import EnergyVAD
+from transcription.video_processor import VideoProcessor
+from tracing import tracer
+from workspace import video_stem
+from .base import Job, JobQueue
+
+
+class JobWorker:
+    def __init__(
+        self,
+        queue: JobQueue,
+        evaluator,
+        output_dir: str,
+        transcriber: Transcriber,
+        cache: Optional[TranscriptionCache] = None,
+        vad: Optional[EnergyVAD] = None,
+        frame_options: Optional[Dict] = None,
+        work_root: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        visibility_timeout: float = 1800.0,
+        poll_interval: float = 5.0,
+        retry_delay: float = 30.0,
+        fingerprints: Optional[FingerprintIndex] = None,
+        export_reports: bool = False,
+    ):
+        """
+        Worker que consome jobs de vídeo de uma fila. O modelo Whisper fica
+        carregado entre os jobs; cada job é confirmado (ack) só depois que a
+        avaliação é gravada, então um worker que cai no meio do vídeo não
+        perde o job: ele volta à fila quando o prazo de visibilidade expira.
+
+        Args:
+            queue: Fila de onde os jobs são retirados
+            evaluator: InterviewEvaluator usado para avaliar as transcrições
+            output_dir: Diretório para salvar os resultados
+            transcriber: Transcriber compartilhado por todos os jobs do worker
+            cache: Cache de transcrições (opcional)
+            vad: Detector de voz para jobs em modo streaming
+            frame_options: Opções repassadas a capture_frames
+            work_root: Onde criar os diretórios de trabalho dos vídeos
+            worker_id: Identificação do worker (padrão: host:pid)
+            visibility_timeout: Prazo, em segundos, renovado enquanto o job roda
+            poll_interval: Espera entre consultas quando a fila está vazia
+            retry_delay: Espera antes de reentregar um job que falhou
+            fingerprints: Índice de impressões digitais do áudio, para
+                reaproveitar a transcrição de reenvios do mesmo áudio
+            export_reports: Grava os relatórios JSON das entrevistas avaliadas
+                sempre que a fila esvazia (ver InterviewEvaluator.export_pending)
+        """
+        self.queue = queue
+        self.evaluator = evaluator
+        self.output_dir = output_dir
+        self.transcriber = transcriber
+        self.cache = cache
+        self.vad = vad
+        self.frame_options = frame_options
+        self.work_root = work_root
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.fingerprints = fingerprints
+        self.export_reports = export_reports
+
+    def process(self, job: Job) -> str:
+        """
+        Transcreve e avalia o vídeo do job.
+
+        Returns:
+            str: Caminho do relatório de avaliação
+        """
+        payload = job.payload
+        video_path = payload["video_path"]
+        with tracer.span("video", trace=video_stem(video_path), job=job.id):
+            processor = VideoProcessor(
+                video_path,
+                self.output_dir,
+                transcriber=self.transcriber,
+                cache=self.cache,
+                vad=self.vad,
+                frame_options=self.frame_options,
+                work_root=self.work_root,
+                language=job_language(video_path),
+                fingerprints=self.fingerprints,
+            )
+            result = processor.process_video(
+                capture=payload.get("capture", False),
+                audio_file=payload.get("audio_file", False),
+                stream=payload.get("stream", False),
+            )
+            with tracer.span("evaluate"):
+                evaluation_path = self.evaluator.evaluate_interview(
+                    video_filename=os.path.basename(video_path),
+                    transcription=result["transcription"],
+                    output_dir=self.output_dir,
+                    transcript=result.get("transcript"),
+                )
+        if not evaluation_path:
+            raise RuntimeError("avaliação não gerada")
+        return evaluation_path
+
+    def _heartbeat(self, job: Job, stop: threading.Event):
+        """Renova o prazo do job enquanto ele estiver em processamento."""
+        while not stop.wait(self.visibility_timeout / 3):
+            if not self.queue.extend(job, self.visibility_timeout):
+                print(f"Job {job.id} expirou e pode ter sido reentregue a outro worker")
+                return
+
+    def run_once(self) -> Optional[bool]:
+        """
+        Processa um job. Retorna None se a fila estiver vazia, True se o
+        job foi concluído e False se falhou.
+        """
+        job = self.queue.claim(self.worker_id, self.visibility_timeout)
+        if job is None:
+            return None
+
+        video = os.path.basename(job.payload.get("video_path", ""))
+        print(f"\n[{self.worker_id}] Job {job.id}: {video} (tentativa {job.attempts})")
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, stop), daemon=True)
+        heartbeat.start()
+        try:
+            evaluation_path = self.process(job)
+        except Exception as e:
+            print(f"Erro ao processar o job {job.id} ({video}): {str(e)}")
+            self.queue.fail(job, str(e), retry_delay=self.retry_delay)
+            return False
+        finally:
+            stop.set()
+            heartbeat.join()
+
+        self.queue.ack(job)
+        print(f"Avaliação concluída e salva em: {evaluation_path}")
+        return True
+
+    def run(self, max_jobs: Optional[int] = None, exit_when_empty: bool = False) -> int:
+        """
+        Consome jobs até max_jobs (ou indefinidamente). Com exit_when_empty,
+        encerra assim que a fila estiver vazia.
+
+        Returns:
+            int: Número de jobs processados (concluídos ou não)
+        """
+        processed = 0
+        while max_jobs is None or processed < max_jobs:
+            outcome = self.run_once()
+            if outcome is None:
+                self._export_reports()
+                if exit_when_empty:
+                    break
+                time.sleep(self.poll_interval)
+                continue
+            processed += 1
+        self._export_reports()
+        return processed
+
+    def _export_reports(self):
+        if not self.export_reports:
+            return
+        paths = self.evaluator.export_pending()
+        if paths:
+            print(f"[{self.worker_id}] {len(paths)} relatório(s) de avaliação gravado(s)")
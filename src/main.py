@@ -1,67 +1,885 @@
+import argparse
 import os
 import sys
+from contextlib import ExitStack, contextmanager
 
 # Adiciona o diretório raiz ao PYTHONPATH
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from config import INPUT_DIR, OUTPUT_DIR, WHISPER_MODEL_SIZE
+from config import (
+    INPUT_DIR,
+    OUTPUT_DIR,
+    WORK_DIR,
+    WHISPER_MODEL_SIZE,
+    WHISPER_DEVICE,
+    TRANSCRIPTION_BACKEND,
+    WHISPER_COMPUTE_TYPE,
+    WHISPER_CPU_THREADS,
+    WHISPER_NUM_WORKERS,
+    WHISPER_WORD_TIMESTAMPS,
+    WHISPER_PROFILE,
+    WHISPER_LANGUAGE,
+    AUDIO_EXTRACTION,
+    PIPELINE_EXTRACT_WORKERS,
+    PIPELINE_TRANSCRIBE_WORKERS,
+    PIPELINE_EVALUATE_WORKERS,
+    PIPELINE_QUEUE_SIZE,
+    PIPELINE_TRANSCRIBE_BATCH,
+    EVAL_BATCH_MODE,
+    RESULTS_AUTO_EXPORT,
+    VAD_THRESHOLD_DB,
+    VAD_MIN_SILENCE_MS,
+    FRAME_CAPTURE_MODE,
+    FRAME_INTERVAL,
+    FRAME_WIDTH,
+    FRAME_SCENE_THRESHOLD,
+    TRANSCRIPTION_CACHE_DIR,
+    TRANSCRIPTION_CACHE_MAX_MB,
+    FINGERPRINT_INDEX_PATH,
+    FINGERPRINT_MIN_SIMILARITY,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL_HOURS,
+    LLM_CACHE_MAX_ENTRIES,
+    JOB_QUEUE_PATH,
+    JOB_VISIBILITY_TIMEOUT,
+    JOB_MAX_ATTEMPTS,
+    JOB_POLL_INTERVAL,
+    WATCH_MANIFEST_PATH,
+    WATCH_POLL_INTERVAL,
+    WATCH_SETTLE_SECONDS,
+    SESSION_MIN_SIMILARITY,
+    TRACE_PATH,
+    METRICS_PATH,
+    METRICS_PORT,
+    PROFILE_DIR,
+    check_required_vars,
+)
 from ffmpeg_setup import setup_ffmpeg
-from transcription.video_processor import VideoProcessor
-from evaluation.interview_evaluator import InterviewEvaluator
+from tracing import profiled, tracer
+from transcription.decoding import DECODING_PROFILES, decoding_options
+from watcher import VIDEO_EXTENSIONS
+from workspace import atomic_write_json, video_stem
 
+# Os módulos pesados (Whisper/torch, SDK do Groq, numpy) são importados
+# dentro das funções, apenas pelos subcomandos que precisam deles
 
-def main():
-    setup_ffmpeg()
+COMMANDS = ("run", "transcribe", "evaluate", "report", "list")
 
-    # Lista todos os vídeos na pasta input
-    videos = [f for f in os.listdir(INPUT_DIR) if f.endswith((".mp4", ".avi", ".mov"))]
 
-    if not videos:
-        print("Nenhum vídeo encontrado na pasta 'input'!")
-        print(
-            "Por favor, adicione arquivos de vídeo (.mp4, .avi, .mov) na pasta 'input'"
+def parse_args(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Sem subcomando, mantém a interface anterior (python src/main.py --pipeline)
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv = ["run", *argv]
+
+    transcription = argparse.ArgumentParser(add_help=False)
+    transcription.add_argument(
+        "--audio-file",
+        action="store_true",
+        default=AUDIO_EXTRACTION == "file",
+        help="Extrai o áudio para um arquivo temporário em vez de decodificar em memória (depuração)",
+    )
+    transcription.add_argument(
+        "--stream",
+        action="store_true",
+        help="Transcreve em streaming, descartando silêncios (gravações longas, memória constante)",
+    )
+    transcription.add_argument(
+        "--decoding-profile",
+        choices=list(DECODING_PROFILES),
+        default=WHISPER_PROFILE,
+        help="Perfil de decodificação do Whisper: fast (mais rápido) a accurate (mais preciso)",
+    )
+    transcription.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignora o cache de transcrições e transcreve todos os vídeos novamente",
+    )
+    transcription.add_argument(
+        "--purge-cache",
+        action="store_true",
+        help="Apaga o cache de transcrições antes de processar",
+    )
+    transcription.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Não procura reenvios do mesmo áudio (impressão digital acústica) no cache",
+    )
+
+    evaluation = argparse.ArgumentParser(add_help=False)
+    evaluation.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Ignora o cache de respostas do LLM e reavalia todas as respostas",
+    )
+    evaluation.add_argument(
+        "--batch-eval",
+        action="store_true",
+        default=EVAL_BATCH_MODE,
+        help="Avalia todas as respostas de um candidato em uma única requisição ao LLM",
+    )
+    evaluation.add_argument(
+        "--no-export",
+        action="store_true",
+        help="Grava as avaliações apenas no banco, sem gerar os relatórios JSON (use o comando report)",
+    )
+
+    tracing = argparse.ArgumentParser(add_help=False)
+    tracing.add_argument(
+        "--trace",
+        nargs="?",
+        const=os.path.join(OUTPUT_DIR, "trace.jsonl"),
+        default=TRACE_PATH,
+        help="Grava os tempos de cada vídeo e etapa em JSONL (padrão: output/trace.jsonl)",
+    )
+    tracing.add_argument(
+        "--metrics-port",
+        type=int,
+        default=METRICS_PORT,
+        help="Serve as métricas do rastreamento em http://localhost:PORTA/metrics",
+    )
+    tracing.add_argument(
+        "--profile",
+        metavar="VIDEO",
+        help="Executa o processamento deste vídeo sob o cProfile (grava em output/profiles)",
+    )
+
+    parser = argparse.ArgumentParser(
+        description="Transcreve e avalia as entrevistas em vídeo da pasta 'input'"
+    )
+    commands = parser.add_subparsers(dest="command", metavar="COMANDO")
+    run = commands.add_parser(
+        "run",
+        parents=[transcription, evaluation, tracing],
+        help="Transcreve e avalia os vídeos (padrão quando nenhum comando é informado)",
+    )
+    run.add_argument(
+        "--export-reports",
+        action="store_true",
+        help="Exporta os relatórios JSON a partir do banco de avaliações e encerra",
+    )
+    run.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Processa o lote em estágios paralelos (extração, transcrição e avaliação)",
+    )
+    run.add_argument(
+        "--extract-workers",
+        type=int,
+        default=PIPELINE_EXTRACT_WORKERS,
+        help="Processos de extração de áudio no modo --pipeline",
+    )
+    run.add_argument(
+        "--transcribe-workers",
+        type=int,
+        default=PIPELINE_TRANSCRIBE_WORKERS,
+        help="Workers de transcrição no modo --pipeline (cada um carrega um modelo)",
+    )
+    run.add_argument(
+        "--eval-workers",
+        type=int,
+        default=PIPELINE_EVALUATE_WORKERS,
+        help="Threads de avaliação no modo --pipeline",
+    )
+    run.add_argument(
+        "--queue-size",
+        type=int,
+        default=PIPELINE_QUEUE_SIZE,
+        help="Tamanho máximo das filas entre os estágios no modo --pipeline",
+    )
+    run.add_argument(
+        "--transcribe-batch",
+        type=int,
+        default=PIPELINE_TRANSCRIBE_BATCH,
+        help="Vídeos curtos decodificados juntos por worker no modo --pipeline",
+    )
+    run.add_argument(
+        "--watch",
+        action="store_true",
+        help="Fica observando a pasta 'input' e processa apenas vídeos novos ou alterados",
+    )
+    run.add_argument(
+        "--submit",
+        action="store_true",
+        help="Enfileira os vídeos da pasta 'input' na fila de jobs e encerra",
+    )
+    run.add_argument(
+        "--worker",
+        action="store_true",
+        help="Consome jobs da fila (vários workers podem rodar ao mesmo tempo)",
+    )
+    run.add_argument(
+        "--queue-path",
+        default=JOB_QUEUE_PATH,
+        help="Arquivo SQLite da fila de jobs",
+    )
+    run.add_argument(
+        "--exit-when-empty",
+        action="store_true",
+        help="No modo --worker, encerra quando não houver mais jobs na fila",
+    )
+    commands.add_parser(
+        "transcribe",
+        parents=[transcription, tracing],
+        help="Apenas transcreve os vídeos e captura os frames (não chama o LLM)",
+    )
+    commands.add_parser(
+        "evaluate",
+        parents=[evaluation, tracing],
+        help="Avalia os vídeos já transcritos (output/transcription_<vídeo>.json), sem o Whisper",
+    )
+    commands.add_parser(
+        "report",
+        help="Exporta os relatórios JSON a partir do banco de avaliações",
+    )
+    commands.add_parser(
+        "list",
+        help="Lista os vídeos da pasta 'input' e os que já têm transcrição",
+    )
+    args = parser.parse_args(argv)
+    if args.command == "run" and args.pipeline and args.stream:
+        run.error(
+            "--stream não é suportado com --pipeline (o pipeline decodifica o áudio "
+            "inteiro); use --stream no processamento vídeo a vídeo"
+        )
+    return args
+
+
+@contextmanager
+def traced_video(video, args):
+    """Span do vídeo e, se for o vídeo pedido em --profile, o perfil do cProfile."""
+    stem = video_stem(video)
+    with ExitStack() as stack:
+        if args.profile and video_stem(args.profile) == stem:
+            stack.enter_context(profiled(stem, PROFILE_DIR))
+        stack.enter_context(tracer.span("video", trace=stem, video=video))
+        yield
+
+
+def run_pipeline(videos, evaluator, cache, args):
+    """Processa o lote com o pipeline em estágios."""
+    from pipeline import BatchPipeline, PipelineConfig
+
+    pipeline = BatchPipeline(
+        OUTPUT_DIR,
+        evaluator,
+        model_size=WHISPER_MODEL_SIZE,
+        device=WHISPER_DEVICE,
+        config=PipelineConfig(
+            extract_workers=args.extract_workers,
+            transcribe_workers=args.transcribe_workers,
+            evaluate_workers=args.eval_workers,
+            queue_size=args.queue_size,
+            audio_file=args.audio_file,
+            batch_evaluation=args.batch_eval,
+            transcribe_batch_size=args.transcribe_batch,
+            capture_frames=True,
+            frame_options=frame_options_from_config(),
+        ),
+        cache=cache,
+        work_root=WORK_DIR,
+        backend=backend_from_config(),
+        decode_options=decode_options_from_args(args),
+        async_client=evaluator.async_client,
+    )
+    video_paths = [os.path.join(INPUT_DIR, video) for video in videos]
+
+    for result in pipeline.run(video_paths):
+        video = os.path.basename(result["video"])
+        if result.get("evaluation_path"):
+            print(f"{video}: avaliação salva em {result['evaluation_path']}")
+        else:
+            print(f"{video}: erro - {result.get('error', 'avaliação não gerada')}")
+
+
+def backend_from_config():
+    """Motor de transcrição definido no .env (TRANSCRIPTION_BACKEND)."""
+    from transcription.backends import create_backend
+
+    return create_backend(
+        TRANSCRIPTION_BACKEND,
+        compute_type=WHISPER_COMPUTE_TYPE,
+        cpu_threads=WHISPER_CPU_THREADS,
+        num_workers=WHISPER_NUM_WORKERS,
+    )
+
+
+def decode_options_from_args(args):
+    """Opções do Whisper: perfil de decodificação, idioma padrão e tempos das palavras."""
+    return decoding_options(
+        args.decoding_profile,
+        language=WHISPER_LANGUAGE,
+        word_timestamps=WHISPER_WORD_TIMESTAMPS,
+    )
+
+
+def create_transcriber(args):
+    """Transcriber com o modelo, device e backend do .env e o perfil escolhido."""
+    from transcription.transcriber import Transcriber
+
+    return Transcriber(
+        WHISPER_MODEL_SIZE,
+        device=WHISPER_DEVICE,
+        decode_options=decode_options_from_args(args),
+        backend=backend_from_config(),
+    )
+
+
+def frame_options_from_config():
+    """Opções de captura de frames definidas no .env."""
+    return {
+        "mode": FRAME_CAPTURE_MODE,
+        "interval": FRAME_INTERVAL,
+        "width": FRAME_WIDTH,
+        "scene_threshold": FRAME_SCENE_THRESHOLD,
+    }
+
+
+def submit_jobs(videos, args):
+    """Enfileira um job por vídeo para ser processado pelos workers."""
+    from jobs import SQLiteJobQueue
+
+    queue = SQLiteJobQueue(args.queue_path, max_attempts=JOB_MAX_ATTEMPTS)
+    for video in videos:
+        job_id = queue.submit(
+            {
+                # Os workers precisam enxergar o mesmo caminho (armazenamento compartilhado)
+                "video_path": os.path.abspath(os.path.join(INPUT_DIR, video)),
+                "capture": True,
+                "audio_file": args.audio_file,
+                "stream": args.stream,
+            }
         )
+        print(f"Job {job_id} enfileirado: {video}")
+    print(f"\nFila: {queue.stats()}")
+
+
+def run_worker(evaluator, cache, args):
+    """Consome jobs da fila com o modelo Whisper carregado uma única vez."""
+    from jobs import JobWorker, SQLiteJobQueue
+    from transcription.vad import EnergyVAD
+
+    transcriber = create_transcriber(args)
+    vad = EnergyVAD(threshold_db=VAD_THRESHOLD_DB, min_silence_ms=VAD_MIN_SILENCE_MS)
+    queue = SQLiteJobQueue(args.queue_path, max_attempts=JOB_MAX_ATTEMPTS)
+    fingerprints = open_fingerprint_index(args, cache)
+    worker = JobWorker(
+        queue,
+        evaluator,
+        OUTPUT_DIR,
+        transcriber,
+        cache=cache,
+        fingerprints=fingerprints,
+        vad=vad,
+        frame_options=frame_options_from_config(),
+        work_root=WORK_DIR,
+        visibility_timeout=JOB_VISIBILITY_TIMEOUT,
+        poll_interval=JOB_POLL_INTERVAL,
+        export_reports=not args.no_export,
+    )
+    print(f"Worker {worker.worker_id} aguardando jobs em {args.queue_path}...")
+    try:
+        processed = worker.run(exit_when_empty=args.exit_when_empty)
+        print(f"\n{processed} job(s) processado(s). Fila: {queue.stats()}")
+    finally:
+        transcriber.release()
+        if fingerprints is not None:
+            fingerprints.close()
+
+
+def process_videos(videos, evaluator, cache, args, transcriber=None):
+    """
+    Processa os vídeos um a um, na ordem da pasta.
+
+    Args:
+        evaluator: Avaliador das entrevistas (None = apenas transcreve)
+
+    Returns:
+        list: Vídeos processados sem erro
+    """
+    from evaluation.job_matcher import job_language
+    from transcription.vad import EnergyVAD
+    from transcription.video_processor import VideoProcessor
+
+    # Um único transcritor para o lote: o modelo é carregado uma vez,
+    # no primeiro vídeo, e reaproveitado pelos demais
+    owns_transcriber = transcriber is None
+    if owns_transcriber:
+        transcriber = create_transcriber(args)
+    vad = None
+    if args.stream:
+        vad = EnergyVAD(threshold_db=VAD_THRESHOLD_DB, min_silence_ms=VAD_MIN_SILENCE_MS)
+
+    frame_options = frame_options_from_config()
+    fingerprints = open_fingerprint_index(args, cache)
+
+    # No modo --batch-eval as transcrições são avaliadas ao final, por candidato
+    transcriptions = {}
+    processed = []
+
+    try:
+        for video in videos:
+            with traced_video(video, args):
+                print(f"\nProcessando vídeo: {video}")
+                video_path = os.path.join(INPUT_DIR, video)
+
+                # Cria uma instância do processador de vídeo
+                processor = VideoProcessor(
+                    video_path,
+                    OUTPUT_DIR,
+                    transcriber=transcriber,
+                    cache=cache,
+                    vad=vad,
+                    frame_options=frame_options,
+                    work_root=WORK_DIR,
+                    language=job_language(video),
+                    fingerprints=fingerprints,
+                )
+
+                try:
+                    # Processa o vídeo e obtém a transcrição
+                    result = processor.process_video(
+                        capture=True, audio_file=args.audio_file, stream=args.stream
+                    )
+                    if result["cached"]:
+                        print(f"\nTranscrição recuperada do cache!")
+                    else:
+                        print(f"\nTranscrição concluída!")
+
+                    if result["frames"]:
+                        print(f"\nFrames salvos em: {OUTPUT_DIR}")
+                        print(f"Número de frames capturados: {len(result['frames'])}")
+
+                    if evaluator is None:
+                        print(f"Transcrição salva em: {result['transcription_path']}")
+                        processed.append(video)
+                        continue
+
+                    if args.batch_eval and not evaluator.is_session_filename(video):
+                        # Só conta como processado depois da avaliação em lote
+                        transcriptions[video] = result["transcription"]
+                        continue
+
+                    # Avalia a entrevista usando a transcrição diretamente
+                    print("\nAvaliando respostas...")
+                    with tracer.span("evaluate"):
+                        evaluation_path = evaluator.evaluate_interview(
+                            video_filename=video,
+                            transcription=result["transcription"],
+                            output_dir=OUTPUT_DIR,
+                            transcript=result["transcript"],
+                        )
+
+                    if evaluation_path:
+                        print(f"\nAvaliação concluída e salva em: {evaluation_path}")
+                        processed.append(video)
+                    else:
+                        print("\nErro ao avaliar a entrevista.")
+
+                except Exception as e:
+                    print(f"Erro ao processar o vídeo {video}: {str(e)}")
+    finally:
+        # Libera o modelo e o índice mesmo se o lote for interrompido (ex: Ctrl+C)
+        if owns_transcriber:
+            transcriber.release()
+        if fingerprints is not None:
+            fingerprints.close()
+
+    if transcriptions:
+        processed.extend(evaluate_in_batches(transcriptions, evaluator))
+    return processed
+
+
+def watch_videos(evaluator, cache, args):
+    """
+    Observa a pasta input e processa apenas vídeos novos ou alterados,
+    mantendo o modelo Whisper carregado entre eles.
+    """
+    from watcher import InputWatcher, Manifest, pending_videos
+
+    transcriber = create_transcriber(args)
+    manifest = Manifest(WATCH_MANIFEST_PATH)
+    watcher = InputWatcher(
+        INPUT_DIR, settle_seconds=WATCH_SETTLE_SECONDS, poll_interval=WATCH_POLL_INTERVAL
+    )
+    print(f"Observando {INPUT_DIR} ({len(manifest)} vídeo(s) já processado(s))...")
+
+    # Vídeos que falharam só são tentados de novo se o arquivo mudar
+    failed = {}
+
+    try:
+        while True:
+            pending = pending_videos(watcher, manifest, transcriber.model_tag, failed)
+            if pending:
+                videos = [os.path.basename(path) for path in pending]
+                processed = set(
+                    process_videos(videos, evaluator, cache, args, transcriber=transcriber)
+                )
+                export_evaluations(evaluator, args)
+                for path in pending:
+                    try:
+                        if os.path.basename(path) in processed:
+                            manifest.record(path, transcriber.model_tag)
+                        else:
+                            failed[path] = os.path.getmtime(path)
+                    except FileNotFoundError:
+                        continue  # removido durante o processamento
+            watcher.wait()
+    except KeyboardInterrupt:
+        print("\nObservação encerrada.")
+    finally:
+        watcher.close()
+        transcriber.release()
+
+
+def evaluate_in_batches(transcriptions, evaluator):
+    """
+    Avalia as transcrições agrupadas por candidato e vaga.
+
+    Returns:
+        list: Vídeos cujo grupo foi avaliado sem erro
+    """
+    videos_by_group = evaluator.group_videos(list(transcriptions))
+    groups = {}
+    for group, videos in videos_by_group.items():
+        groups[group] = {
+            evaluator.parse_video_filename(video)[2]: transcriptions[video]
+            for video in videos
+        }
+    print(f"\nAvaliando respostas de {len(groups)} candidato(s)...")
+
+    # Com o cliente assíncrono, os candidatos são avaliados ao mesmo tempo
+    paths = evaluator.evaluate_candidates(groups, OUTPUT_DIR)
+    evaluated = []
+    for (candidate_name, job_position), evaluation_path in paths.items():
+        if evaluation_path:
+            print(f"{candidate_name} ({job_position}): avaliação salva em {evaluation_path}")
+            evaluated.extend(videos_by_group[(candidate_name, job_position)])
+        else:
+            print(f"{candidate_name} ({job_position}): erro ao avaliar a entrevista.")
+    return evaluated
+
+
+def export_reports():
+    """Gera os relatórios JSON de todas as entrevistas a partir do banco."""
+    from evaluation.interview_evaluator import RESULTS_DB_NAME
+    from evaluation.results_store import ResultsStore
+
+    store = ResultsStore(os.path.join(OUTPUT_DIR, RESULTS_DB_NAME))
+    paths = store.export_all(OUTPUT_DIR)
+    for path in paths:
+        print(f"Relatório exportado: {path}")
+    print(f"{len(paths)} relatório(s) exportado(s) em {OUTPUT_DIR}")
+
+
+def finish_tracing():
+    """Grava as métricas agregadas do rastreamento e fecha o arquivo de spans."""
+    if not tracer.enabled:
+        return
+    tracer.write_metrics(METRICS_PATH)
+    tracer.close()
+    if tracer.trace_path:
+        print(f"Rastreamento salvo em: {tracer.trace_path}")
+    print(f"Métricas salvas em: {METRICS_PATH}")
+
+
+def report_token_usage():
+    """
+    Mostra os tokens gastos no LLM em cada etapa desta execução e grava o
+    relatório em output/token_usage.json.
+    """
+    from transcription.token_budget import token_meter
+
+    report = token_meter.report()
+    if not report:
+        return
+    print("\nTokens do LLM por etapa:")
+    for stage, stats in report.items():
         print(
-            "O nome do arquivo deve seguir o padrão: candidato_nome_cargo_q{numero}.mp4"
+            f"  {stage}: {stats['requests']} requisições ({stats['cached']} do cache), "
+            f"{stats['prompt_tokens']} de prompt + {stats['completion_tokens']} de saída, "
+            f"{stats['compressed']} textos reduzidos"
         )
-        print("Exemplo: candidato_joao_frontend_q1.mp4")
+    atomic_write_json(os.path.join(OUTPUT_DIR, "token_usage.json"), report)
+
+
+def validate_job_positions():
+    """
+    Carrega e valida todas as vagas antes do processamento. As vagas ficam
+    em memória; arquivos inválidos são informados agora, e não a cada
+    resposta avaliada.
+    """
+    from evaluation.job_matcher import registry as job_registry
+
+    errors = job_registry.load_all()
+    for name, error in errors.items():
+        print(f"Vaga inválida em data/job_positions/{name}.json: {error}")
+    return errors
+
+
+def input_videos():
+    """Vídeos da pasta input, na ordem da pasta."""
+    return [f for f in os.listdir(INPUT_DIR) if f.endswith(VIDEO_EXTENSIONS)]
+
+
+def print_no_videos():
+    print("Nenhum vídeo encontrado na pasta 'input'!")
+    print(
+        "Por favor, adicione arquivos de vídeo (.mp4, .avi, .mov) na pasta 'input'"
+    )
+    print(
+        "O nome do arquivo deve seguir o padrão: candidato_nome_cargo_q{numero}.mp4"
+    )
+    print("Exemplo: candidato_joao_frontend_q1.mp4")
+    print(
+        "Gravações completas da entrevista (candidato_nome_cargo.mp4) são divididas por questão"
+    )
+
+
+def transcription_path(video):
+    """Arquivo da transcrição gravado por VideoProcessor para o vídeo."""
+    return os.path.join(OUTPUT_DIR, f"transcription_{video_stem(video)}.json")
+
+
+def open_transcription_cache(args):
+    """Cache de transcrições, respeitando --purge-cache e --no-cache."""
+    from transcription.transcription_cache import TranscriptionCache
+
+    cache = TranscriptionCache(
+        TRANSCRIPTION_CACHE_DIR, max_bytes=TRANSCRIPTION_CACHE_MAX_MB * 1024 * 1024
+    )
+    if args.purge_cache:
+        removed = cache.purge()
+        print(f"Cache de transcrições limpo ({removed} entradas removidas).")
+    if args.no_cache:
+        return None
+    return cache
+
+
+def open_fingerprint_index(args, cache):
+    """
+    Índice de impressões digitais do áudio, para reaproveitar a transcrição
+    de reenvios do mesmo áudio. Só existe com o cache de transcrições ativo
+    (e sem --no-dedup); --purge-cache também o esvazia.
+    """
+    from transcription.fingerprint import FingerprintIndex
+
+    if cache is None and not args.purge_cache:
+        return None
+    fingerprints = FingerprintIndex(
+        FINGERPRINT_INDEX_PATH, min_similarity=FINGERPRINT_MIN_SIMILARITY
+    )
+    if args.purge_cache:
+        fingerprints.clear()
+    if cache is None or args.no_dedup:
+        fingerprints.close()
+        return None
+    return fingerprints
+
+
+def check_groq_settings():
+    """
+    Confere as variáveis do Groq antes de avaliar, para que a falta delas
+    não apareça como um erro em cada resposta.
+
+    Returns:
+        bool: True se todas estão definidas
+    """
+    missing = check_required_vars()
+    if missing:
+        print(f"Defina {', '.join(missing)} no .env para avaliar as entrevistas.")
+    return not missing
+
+
+def create_evaluator(args):
+    """
+    Avaliador com as opções da linha de comando.
+
+    Returns:
+        tuple: (InterviewEvaluator, cache de respostas do LLM ou None)
+    """
+    from evaluation.interview_evaluator import InterviewEvaluator
+    from transcription.llm_cache import ResponseCache
+
+    validate_job_positions()
+
+    response_cache = None
+    if not args.no_llm_cache:
+        response_cache = ResponseCache(
+            LLM_CACHE_PATH,
+            ttl_seconds=LLM_CACHE_TTL_HOURS * 3600,
+            max_entries=LLM_CACHE_MAX_ENTRIES,
+        )
+
+    # Todas as chamadas ao LLM passam por um cliente assíncrono: um pool de
+    # conexões e um limite de requisições em andamento. O --pipeline e a
+    # avaliação em lote enviam várias avaliações ao mesmo tempo por ele
+    from transcription.groq_client import BackgroundAsyncClient
+
+    async_client = BackgroundAsyncClient()
+
+    evaluator = InterviewEvaluator(
+        response_cache=response_cache,
+        auto_export=RESULTS_AUTO_EXPORT and not args.no_export,
+        session_min_similarity=SESSION_MIN_SIMILARITY,
+        async_client=async_client,
+    )
+    return evaluator, response_cache
+
+
+def export_evaluations(evaluator, args):
+    """Grava os relatórios JSON das entrevistas avaliadas (uma vez cada, a partir do banco)."""
+    if args.no_export:
         return
+    paths = evaluator.export_pending()
+    if paths:
+        print(f"\n{len(paths)} relatório(s) de avaliação gravado(s) em {OUTPUT_DIR}")
+
+
+def close_response_cache(response_cache):
+    if response_cache:
+        stats = response_cache.stats()
+        print(
+            f"\nCache do LLM: {stats['hits']} acertos, {stats['misses']} falhas"
+        )
+        response_cache.close()
 
-    # Inicializa o avaliador
-    evaluator = InterviewEvaluator()
 
+def list_videos(args):
+    """Lista os vídeos da pasta input, indicando os que já foram transcritos."""
+    videos = input_videos()
+    if not videos:
+        print_no_videos()
+        return
     for video in videos:
-        print(f"\nProcessando vídeo: {video}")
-        video_path = os.path.join(INPUT_DIR, video)
+        status = "transcrito" if os.path.exists(transcription_path(video)) else "pendente"
+        print(f"{video}: {status}")
+    print(f"\n{len(videos)} vídeo(s) em {INPUT_DIR}")
 
-        # Cria uma instância do processador de vídeo
-        processor = VideoProcessor(
-            video_path, OUTPUT_DIR, model_size=WHISPER_MODEL_SIZE
-        )
 
-        try:
-            # Processa o vídeo e obtém a transcrição
-            result = processor.process_video(capture=True)
-            print(f"\nTranscrição concluída!")
-
-            # Avalia a entrevista usando a transcrição diretamente
-            print("\nAvaliando respostas...")
-            evaluation_path = evaluator.evaluate_interview(
-                video_filename=video,
-                transcription=result["transcription"],
-                output_dir=OUTPUT_DIR,
-            )
-
-            if evaluation_path:
-                print(f"\nAvaliação concluída e salva em: {evaluation_path}")
-            else:
-                print("\nErro ao avaliar a entrevista.")
-
-            if result["frames"]:
-                print(f"\nFrames salvos em: {OUTPUT_DIR}")
-                print(f"Número de frames capturados: {len(result['frames'])}")
-
-        except Exception as e:
-            print(f"Erro ao processar o vídeo {video}: {str(e)}")
+def transcribe_videos(args):
+    """Transcreve os vídeos e captura os frames, sem avaliar (não usa o Groq)."""
+    videos = input_videos()
+    if not videos:
+        print_no_videos()
+        return
+    setup_ffmpeg()
+    process_videos(videos, None, open_transcription_cache(args), args)
+    finish_tracing()
+
+
+def evaluate_transcriptions(args):
+    """
+    Avalia os vídeos a partir das transcrições já gravadas em output, sem
+    carregar o Whisper (ex: depois de `transcribe`, ou para reavaliar com
+    outro prompt ou modelo do LLM).
+    """
+    from transcription.transcriber import Transcriber
+
+    if not check_groq_settings():
+        return
+    evaluator, response_cache = create_evaluator(args)
+
+    try:
+        transcriptions = {}
+        for video in input_videos():
+            path = transcription_path(video)
+            if not os.path.exists(path):
+                print(f"{video}: transcrição não encontrada (execute o comando transcribe)")
+                continue
+            transcript = Transcriber.load_transcription(path)
+
+            if args.batch_eval and not evaluator.is_session_filename(video):
+                transcriptions[video] = transcript.text
+                continue
+
+            with traced_video(video, args):
+                print(f"\nAvaliando respostas de {video}...")
+                with tracer.span("evaluate"):
+                    evaluation_path = evaluator.evaluate_interview(
+                        video_filename=video,
+                        transcription=transcript.text,
+                        output_dir=OUTPUT_DIR,
+                        transcript=transcript,
+                    )
+                if evaluation_path:
+                    print(f"Avaliação concluída e salva em: {evaluation_path}")
+                else:
+                    print("Erro ao avaliar a entrevista.")
+
+        if transcriptions:
+            evaluate_in_batches(transcriptions, evaluator)
+
+        export_evaluations(evaluator, args)
+        report_token_usage()
+    finally:
+        # Libera o cliente do LLM e o cache mesmo se a avaliação falhar
+        evaluator.close()
+        close_response_cache(response_cache)
+        finish_tracing()
+
+
+def run(args):
+    """Transcreve e avalia (modos em lote, --pipeline, --watch, --submit e --worker)."""
+    if args.export_reports:
+        export_reports()
+        return
+
+    setup_ffmpeg()
+    cache = open_transcription_cache(args)
+
+    # Lista todos os vídeos na pasta input (o worker recebe os vídeos pela fila)
+    videos = []
+    if not (args.worker or args.watch):
+        videos = input_videos()
+        if not videos:
+            print_no_videos()
+            return
+
+    if args.submit:
+        submit_jobs(videos, args)
+        return
+
+    if not check_groq_settings():
+        return
+    evaluator, response_cache = create_evaluator(args)
+
+    try:
+        if args.watch:
+            watch_videos(evaluator, cache, args)
+        elif args.worker:
+            run_worker(evaluator, cache, args)
+        elif args.pipeline:
+            run_pipeline(videos, evaluator, cache, args)
+        else:
+            process_videos(videos, evaluator, cache, args)
+
+        export_evaluations(evaluator, args)
+        report_token_usage()
+    finally:
+        # Libera o cliente do LLM e o cache mesmo se o lote falhar
+        evaluator.close()
+        close_response_cache(response_cache)
+        finish_tracing()
+
+
+COMMAND_HANDLERS = {
+    "run": run,
+    "transcribe": transcribe_videos,
+    "evaluate": evaluate_transcriptions,
+    "report": lambda args: export_reports(),
+    "list": list_videos,
+}
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if getattr(args, "trace", None) or getattr(args, "metrics_port", 0) or getattr(
+        args, "profile", None
+    ):
+        tracer.configure(args.trace, args.metrics_port)
+
+    COMMAND_HANDLERS[args.command](args)
 
 
 if __name__ == "__main__":
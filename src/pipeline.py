@@ -0,0 +1,503 @@
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from evaluation.job_matcher import job_language
+from transcription.audio_extractor import extract_audio, load_audio
+from transcription.backends import TranscriptionBackend
+from transcription.frame_capture import capture_frames
+from transcription.segments import SegmentArray
+from transcription.transcriber import Transcriber, model_tag, save_transcription, transcript_of
+from transcription.transcription_cache import TranscriptionCache, hash_file
+from tracing import tracer
+from workspace import create_work_dir, video_stem
+
+# Marca de fim de fila entre os estágios
+_DONE = object()
+
+
+@dataclass
+class PipelineConfig:
+    extract_workers: int = 2  # processos para extração de áudio (ffmpeg, CPU)
+    transcribe_workers: int = 1  # threads de transcrição (uma réplica do modelo cada)
+    evaluate_workers: int = 4  # threads de avaliação (chamadas de rede ao Groq)
+    queue_size: int = 4  # itens pendentes permitidos entre dois estágios
+    audio_file: bool = False  # extrai para arquivo temporário em vez de memória
+    batch_evaluation: bool = False  # uma requisição ao LLM por (candidato, vaga)
+    transcribe_batch_size: int = 1  # vídeos transcritos juntos (> 1 usa transcribe_batch)
+    capture_frames: bool = False  # captura frames no pool de extração, junto com o áudio
+    frame_options: Dict = field(default_factory=dict)  # repassadas a capture_frames
+
+
+def _extract_worker(video_path: str, scratch_dir: str, audio_file: bool = False):
+    """
+    Executado no pool de processos: decodifica o áudio em memória ou, no
+    modo arquivo, extrai para um diretório exclusivo do vídeo, evitando
+    que workers sobrescrevam o mesmo arquivo.
+    """
+    if not audio_file:
+        return load_audio(video_path)
+    return extract_audio(video_path, create_work_dir(scratch_dir, video_path))
+
+
+class BatchPipeline:
+    def __init__(
+        self,
+        output_dir: str,
+        evaluator,
+        model_size: str = "small",
+        device: Optional[str] = None,
+        config: Optional[PipelineConfig] = None,
+        cache: Optional[TranscriptionCache] = None,
+        work_root: Optional[str] = None,
+        backend: Optional[TranscriptionBackend] = None,
+        decode_options: Optional[Dict] = None,
+        async_client=None,
+    ):
+        """
+        Pipeline em estágios para processar um lote de vídeos.
+
+        Extração, transcrição e avaliação rodam ao mesmo tempo, ligadas por
+        filas limitadas, de modo que o tempo total se aproxima do estágio
+        mais lento e não da soma de todos.
+
+        Args:
+            output_dir: Diretório para salvar os resultados
+            evaluator: InterviewEvaluator usado no estágio de avaliação
+            model_size: Tamanho do modelo de transcrição
+            device: Dispositivo do torch para o Whisper
+            config: Concorrência de cada estágio
+            cache: Cache de transcrições (opcional). Vídeos encontrados no
+                cache vão direto para a avaliação
+            work_root: Onde criar os arquivos temporários do lote
+                (padrão: output_dir/.work)
+            backend: Motor de transcrição (padrão: openai-whisper)
+            decode_options: Opções de decodificação do Whisper (perfil e
+                idioma padrão). O idioma da vaga de cada vídeo tem prioridade
+            async_client: BackgroundAsyncClient (opcional). Com ele, o estágio
+                de avaliação agenda as avaliações no event loop do cliente em
+                vez de esperar cada uma: as requisições em andamento são
+                limitadas por GROQ_MAX_CONCURRENCY, e não por evaluate_workers
+        """
+        self.output_dir = output_dir
+        self.evaluator = evaluator
+        self.model_size = model_size
+        self.device = device
+        self.config = config or PipelineConfig()
+        self.cache = cache
+        self.work_root = work_root or os.path.join(output_dir, ".work")
+        self.backend = backend
+        self.decode_options = decode_options or {}
+        self.async_client = async_client
+
+        self._results: Dict[str, dict] = {}
+        self._results_lock = threading.Lock()
+
+        # Capturas de frames em andamento: (vídeo, Future)
+        self._frame_futures: List[Tuple[str, object]] = []
+        # Erro que interrompeu o envio dos vídeos à extração
+        self._feed_error: Optional[BaseException] = None
+        # Avaliações agendadas no async_client: (vídeos, Future)
+        self._evaluation_futures: List[Tuple[List[str], object]] = []
+
+        # Avaliação em lote: respostas acumuladas por (candidato, vaga)
+        self._groups: Dict[str, Tuple[str, str]] = {}
+        self._pending: Dict[Tuple[str, str], Dict[str, Optional[str]]] = {}
+        self._group_sizes: Dict[Tuple[str, str], int] = {}
+
+    def _set_result(self, video_path: str, **fields):
+        with self._results_lock:
+            self._results.setdefault(video_path, {"video": video_path}).update(fields)
+
+    def _save_transcription(self, video_path: str, result: Dict) -> Tuple[str, SegmentArray]:
+        """
+        Grava output_dir/transcription_<vídeo>.json, como no processamento
+        vídeo a vídeo (lido pelo comando evaluate). Retorna o texto e o
+        SegmentArray com os tempos, usado nas gravações completas.
+        """
+        transcript = transcript_of(result)
+        path = save_transcription(
+            transcript, self.output_dir, name=f"transcription_{video_stem(video_path)}"
+        )
+        self._set_result(video_path, transcription=result["text"], transcription_path=path)
+        return result["text"], transcript
+
+    def _submit_frame_capture(self, pool, video_path: str):
+        options = {"prefix": f"{video_stem(video_path)}_", **self.config.frame_options}
+        future = pool.submit(capture_frames, video_path, self.output_dir, **options)
+        self._frame_futures.append((video_path, future))
+
+    def _collect_frames(self):
+        """Registra o resultado das capturas de frames (já concluídas)."""
+        for video_path, future in self._frame_futures:
+            try:
+                self._set_result(video_path, frames=future.result())
+            except Exception as e:
+                print(f"Erro ao capturar os frames de {video_path}: {str(e)}")
+                self._set_result(video_path, frames_error=str(e))
+
+    def _cache_options(self, language: Optional[str] = None) -> Dict:
+        options = dict(self.decode_options)
+        if language:
+            options["language"] = language
+        if self.config.transcribe_batch_size > 1:
+            # A transcrição em lote descarta silêncios e produz outros segmentos
+            options["batched_vad"] = True
+        return options
+
+    def _feed_extraction(
+        self, pool, video_paths: List[str], audio_queue, text_queue, scratch_dir
+    ):
+        """
+        Envia os vídeos ao pool de extração respeitando o limite da fila.
+        Se o envio falhar (ex: BrokenProcessPool), o erro fica em
+        _feed_error para run() e os transcritores são liberados mesmo assim.
+        """
+        try:
+            for video_path in video_paths:
+                if self.config.capture_frames:
+                    self._submit_frame_capture(pool, video_path)
+                cache_key = None
+                language = job_language(video_path)
+                if self.cache:
+                    try:
+                        cache_key = TranscriptionCache.make_key(
+                            hash_file(video_path),
+                            model_tag(self.model_size, self.backend),
+                            self._cache_options(language),
+                        )
+                        cached = self.cache.get(cache_key)
+                    except OSError as e:
+                        print(f"Erro ao ler o vídeo {video_path}: {str(e)}")
+                        self._set_result(video_path, error=str(e))
+                        if self.config.batch_evaluation:
+                            text_queue.put((video_path, None, None))
+                        continue
+                    if cached:
+                        self._set_result(video_path, cached=True)
+                        try:
+                            transcription, transcript = self._save_transcription(video_path, cached)
+                        except OSError as e:
+                            self._transcription_failed(video_path, e, text_queue)
+                            continue
+                        text_queue.put((video_path, transcription, transcript))
+                        continue
+
+                future = pool.submit(
+                    _extract_worker, video_path, scratch_dir, self.config.audio_file
+                )
+                audio_queue.put((video_path, future, cache_key, language))
+        except BaseException as e:
+            self._feed_error = e
+        finally:
+            for _ in range(self.config.transcribe_workers):
+                audio_queue.put(_DONE)
+
+    def _next_batch(self, audio_queue) -> Tuple[list, bool]:
+        """
+        Aguarda um item da fila e junta a ele os que já estiverem prontos,
+        até transcribe_batch_size. Retorna (itens, fim_da_fila).
+        """
+        item = audio_queue.get()
+        if item is _DONE:
+            return [], True
+        items = [item]
+        while len(items) < self.config.transcribe_batch_size:
+            try:
+                item = audio_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _DONE:
+                return items, True
+            items.append(item)
+        return items, False
+
+    def _transcription_failed(self, video_path: str, error: Exception, text_queue):
+        print(f"Erro ao transcrever o vídeo {video_path}: {str(error)}")
+        self._set_result(video_path, error=str(error))
+        if self.config.batch_evaluation:
+            # O lote do candidato não deve esperar por este vídeo
+            text_queue.put((video_path, None, None))
+
+    def _transcribe_items(self, transcriber: Transcriber, items: list, text_queue):
+        """Transcreve um ou mais áudios extraídos e envia os textos à avaliação."""
+        ready = []
+        audio_paths = []
+        for video_path, future, cache_key, language in items:
+            try:
+                audio = future.result()
+            except Exception as e:
+                self._transcription_failed(video_path, e, text_queue)
+                continue
+            if isinstance(audio, str):
+                audio_paths.append(audio)
+            ready.append((video_path, audio, cache_key, language))
+
+        try:
+            if not ready:
+                return
+            names = ", ".join(os.path.basename(video_path) for video_path, *_ in ready)
+            print(f"Transcrevendo: {names}")
+            # Com um vídeo por vez, o span entra no rastro do próprio vídeo
+            trace = video_stem(ready[0][0]) if len(ready) == 1 else None
+            try:
+                with tracer.span("transcribe", trace=trace, videos=len(ready)):
+                    if self.config.transcribe_batch_size == 1:
+                        _, audio, _, language = ready[0]
+                        results = [transcriber.transcribe_with_segments(audio, language=language)]
+                    else:
+                        results = self._transcribe_batch(transcriber, ready)
+            except Exception as e:
+                for video_path, *_ in ready:
+                    self._transcription_failed(video_path, e, text_queue)
+                return
+
+            for (video_path, _, cache_key, _), result in zip(ready, results):
+                if self.cache:
+                    self.cache.put(cache_key, result)
+                try:
+                    transcription, transcript = self._save_transcription(video_path, result)
+                except OSError as e:
+                    self._transcription_failed(video_path, e, text_queue)
+                    continue
+                text_queue.put((video_path, transcription, transcript))
+        finally:
+            for audio_path in audio_paths:
+                shutil.rmtree(os.path.dirname(audio_path), ignore_errors=True)
+
+    @staticmethod
+    def _transcribe_batch(transcriber: Transcriber, ready: list) -> List[Dict]:
+        """
+        transcribe_batch agrupando os áudios por idioma, que é uma opção do
+        lote inteiro. Os resultados voltam na ordem de `ready`.
+        """
+        by_language: Dict[Optional[str], List[int]] = {}
+        for index, (_, _, _, language) in enumerate(ready):
+            by_language.setdefault(language, []).append(index)
+
+        results: List[Optional[Dict]] = [None] * len(ready)
+        for language, indexes in by_language.items():
+            audios = [ready[index][1] for index in indexes]
+            batch = transcriber.transcribe_batch(audios, language=language)
+            for index, result in zip(indexes, batch):
+                results[index] = result
+        return results
+
+    def _transcribe_loop(self, replica: int, audio_queue, text_queue):
+        """Consome áudios extraídos e produz transcrições."""
+        transcriber = Transcriber(
+            self.model_size,
+            device=self.device,
+            replica=replica,
+            decode_options=self.decode_options,
+            backend=self.backend,
+        )
+        try:
+            done = False
+            while not done:
+                items, done = self._next_batch(audio_queue)
+                if items:
+                    self._transcribe_items(transcriber, items, text_queue)
+        finally:
+            if replica > 0:
+                # Réplicas extras só existem durante o lote
+                transcriber.release()
+
+    def _collect_for_batch(self, video_path: str, transcription: Optional[str]):
+        """
+        Acumula a transcrição no grupo (candidato, vaga) do vídeo. Retorna o
+        grupo e suas transcrições quando todos os vídeos dele chegaram.
+        """
+        group = self._groups[video_path]
+        with self._results_lock:
+            pending = self._pending.setdefault(group, {})
+            pending[video_path] = transcription
+            if len(pending) < self._group_sizes[group]:
+                return None
+            return group, self._pending.pop(group)
+
+    def _evaluate_group(self, group: Tuple[str, str], transcriptions: Dict[str, Optional[str]]):
+        candidate_name, job_position = group
+        answers = {}
+        for video_path, transcription in transcriptions.items():
+            if transcription is not None:
+                _, _, question_number = self.evaluator.parse_video_filename(
+                    os.path.basename(video_path)
+                )
+                answers[question_number] = transcription
+        if not answers:
+            return
+        video_paths = [
+            video_path
+            for video_path, transcription in transcriptions.items()
+            if transcription is not None
+        ]
+
+        if self.async_client is not None:
+            self._submit_evaluation(
+                video_paths,
+                self.evaluator.evaluate_candidate_async(
+                    self.async_client.client,
+                    candidate_name,
+                    job_position,
+                    answers,
+                    self.output_dir,
+                ),
+            )
+            return
+
+        evaluation_path = self.evaluator.evaluate_candidate(
+            candidate_name, job_position, answers, self.output_dir
+        )
+        for video_path in video_paths:
+            self._set_result(video_path, evaluation_path=evaluation_path)
+
+    def _evaluate_video(self, video_path: str, transcription: str, transcript):
+        options = dict(
+            video_filename=os.path.basename(video_path),
+            transcription=transcription,
+            output_dir=self.output_dir,
+            # Gravações completas são divididas por questão pelos tempos
+            transcript=transcript,
+        )
+        if self.async_client is not None:
+            self._submit_evaluation(
+                [video_path],
+                self.evaluator.evaluate_interview_async(self.async_client.client, **options),
+                trace=video_stem(video_path),
+            )
+            return
+
+        with tracer.span("evaluate", trace=video_stem(video_path)):
+            evaluation_path = self.evaluator.evaluate_interview(**options)
+        self._set_result(video_path, evaluation_path=evaluation_path)
+
+    def _submit_evaluation(self, video_paths: List[str], coroutine, trace: Optional[str] = None):
+        """
+        Agenda a avaliação no event loop do async_client e volta logo a
+        consumir a fila; o resultado é registrado ao terminar.
+        """
+        async def evaluate():
+            try:
+                with tracer.span("evaluate", trace=trace):
+                    evaluation_path = await coroutine
+            except Exception as e:
+                print(f"Erro ao avaliar o vídeo {video_paths[0]}: {str(e)}")
+                for video_path in video_paths:
+                    self._set_result(video_path, error=str(e))
+                return
+            for video_path in video_paths:
+                self._set_result(video_path, evaluation_path=evaluation_path)
+
+        future = self.async_client.submit(evaluate())
+        with self._results_lock:
+            self._evaluation_futures.append((video_paths, future))
+
+    def _wait_evaluations(self):
+        """Aguarda as avaliações agendadas no async_client."""
+        for video_paths, future in self._evaluation_futures:
+            try:
+                future.result()
+            except BaseException as e:
+                for video_path in video_paths:
+                    self._set_result(video_path, error=str(e) or type(e).__name__)
+
+    def _evaluate_loop(self, text_queue):
+        """Consome transcrições e grava as avaliações."""
+        while True:
+            item = text_queue.get()
+            if item is _DONE:
+                break
+            video_path, transcription, transcript = item
+            if self.config.batch_evaluation and video_path in self._groups:
+                try:
+                    ready = self._collect_for_batch(video_path, transcription)
+                    if ready:
+                        self._evaluate_group(*ready)
+                except Exception as e:
+                    print(f"Erro ao avaliar o lote do vídeo {video_path}: {str(e)}")
+                    self._set_result(video_path, error=str(e))
+                continue
+            if transcription is None:
+                continue
+            try:
+                self._evaluate_video(video_path, transcription, transcript)
+            except Exception as e:
+                print(f"Erro ao avaliar o vídeo {video_path}: {str(e)}")
+                self._set_result(video_path, error=str(e))
+
+    def run(self, video_paths: List[str]) -> List[dict]:
+        """
+        Processa todos os vídeos do lote.
+
+        Returns:
+            Lista, na ordem de entrada, com um dict por vídeo contendo
+            "video", "transcription", "transcription_path", "frames" (com
+            capture_frames), "evaluation_path" e/ou "error"
+        """
+        self._results = {}
+        self._frame_futures = []
+        self._evaluation_futures = []
+        self._feed_error = None
+        self._pending = {}
+        self._groups = {}
+        self._group_sizes = {}
+        if self.config.batch_evaluation:
+            by_name = {os.path.basename(path): path for path in video_paths}
+            for group, filenames in self.evaluator.group_videos(list(by_name)).items():
+                self._group_sizes[group] = len(filenames)
+                for filename in filenames:
+                    self._groups[by_name[filename]] = group
+
+        audio_queue = queue.Queue(maxsize=self.config.queue_size)
+        text_queue = queue.Queue(maxsize=self.config.queue_size)
+        os.makedirs(self.work_root, exist_ok=True)
+        scratch_dir = tempfile.mkdtemp(prefix="pipeline_", dir=self.work_root)
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.config.extract_workers) as pool:
+                feeder = threading.Thread(
+                    target=self._feed_extraction,
+                    args=(pool, video_paths, audio_queue, text_queue, scratch_dir),
+                    daemon=True,
+                )
+                transcribers = [
+                    threading.Thread(
+                        target=self._transcribe_loop,
+                        args=(replica, audio_queue, text_queue),
+                        daemon=True,
+                    )
+                    for replica in range(self.config.transcribe_workers)
+                ]
+                evaluators = [
+                    threading.Thread(
+                        target=self._evaluate_loop, args=(text_queue,), daemon=True
+                    )
+                    for _ in range(self.config.evaluate_workers)
+                ]
+
+                for thread in [feeder, *transcribers, *evaluators]:
+                    thread.start()
+
+                feeder.join()
+                for thread in transcribers:
+                    thread.join()
+                for _ in evaluators:
+                    text_queue.put(_DONE)
+                for thread in evaluators:
+                    thread.join()
+                self._wait_evaluations()
+        finally:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+        if self._feed_error is not None:
+            raise self._feed_error
+
+        # O pool só encerra depois de todas as capturas de frames
+        self._collect_frames()
+        return [self._results.get(path, {"video": path}) for path in video_paths]
@@ -0,0 +1,345 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Adiciona o diretório raiz ao PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmark import (
+    FakeGroqServer,
+    StageTimer,
+    compare_reports,
+    generate_interview_set,
+    peak_rss_mb,
+)
+from ffmpeg_setup import setup_ffmpeg
+from workspace import atomic_write_json
+
+BENCHMARK_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "output", "benchmarks"
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description=(
+            "Mede o caminho VideoProcessor -> InterviewEvaluator com vídeos "
+            "sintéticos e um servidor local no lugar do Groq"
+        )
+    )
+    parser.add_argument(
+        "--job",
+        default="frontend",
+        help="Vaga de data/job_positions usada nos vídeos",
+    )
+    parser.add_argument(
+        "--candidates",
+        type=int,
+        default=2,
+        help="Candidatos sintéticos (um vídeo por questão)",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=30.0,
+        help="Duração de cada vídeo, em segundos",
+    )
+    parser.add_argument(
+        "--resolution",
+        default="640x360",
+        help="Resolução dos vídeos (LARGURAxALTURA)",
+    )
+    parser.add_argument(
+        "--speech-ratio",
+        type=float,
+        default=0.6,
+        help="Fração de fala no áudio (0 a 1)",
+    )
+    parser.add_argument("--model-size", default="tiny", help="Modelo do Whisper")
+    parser.add_argument("--backend", default="openai-whisper", help="Motor de transcrição")
+    parser.add_argument(
+        "--decoding-profile",
+        default="default",
+        help="Perfil de decodificação do Whisper (default, fast, balanced, accurate)",
+    )
+    parser.add_argument(
+        "--language",
+        help="Idioma fixo da transcrição (ex: pt); sem ele, o Whisper detecta o idioma",
+    )
+    parser.add_argument(
+        "--compare-profiles",
+        metavar="DIR",
+        help=(
+            "Compara a vazão e a taxa de erro por palavra dos perfis de decodificação "
+            "nas gravações de DIR (com a transcrição correta em <arquivo>.txt)"
+        ),
+    )
+    parser.add_argument(
+        "--audio-file",
+        action="store_true",
+        help="Extrai o áudio para arquivo (em vez de memória)",
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=300.0,
+        help="Latência média do LLM falso",
+    )
+    parser.add_argument(
+        "--jitter-ms",
+        type=float,
+        default=50.0,
+        help="Desvio padrão da latência do LLM falso",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fração de respostas 429 do LLM falso",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Semente dos vídeos e do LLM falso")
+    parser.add_argument(
+        "--output",
+        help="Arquivo JSON do relatório (padrão: output/benchmarks/<data>.json)",
+    )
+    parser.add_argument(
+        "--baseline",
+        help="Relatório anterior para comparar (variação do p50 e da vazão)",
+    )
+    parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="Mantém o diretório com os vídeos e resultados",
+    )
+    return parser.parse_args(argv)
+
+
+def configure_environment(base_url: str):
+    """
+    Aponta o SDK do Groq para o servidor local. Precisa ser chamado antes do
+    primeiro uso do cliente (transcription.groq_client.get_client).
+    """
+    os.environ["GROQ_BASE_URL"] = base_url
+    os.environ.setdefault("GROQ_API_KEY", "benchmark")
+    os.environ.setdefault("GROQ_MODEL", "benchmark-model")
+    # Sem limites de RPM/TPM: mede o sistema, não o plano da API
+    os.environ["GROQ_RPM"] = "0"
+    os.environ["GROQ_TPM"] = "0"
+
+
+def run(args, server: FakeGroqServer) -> dict:
+    configure_environment(server.base_url)
+
+    # Importados só agora, com o ambiente já apontando para o servidor local
+    from evaluation import answer_evaluator
+    from evaluation.interview_evaluator import InterviewEvaluator
+    from evaluation.job_matcher import load_job_questions
+    from transcription import video_processor
+    from transcription.decoding import decoding_options
+    from transcription.token_budget import token_meter
+    from transcription.transcriber import Transcriber
+
+    job = load_job_questions(args.job)
+    if not job:
+        raise SystemExit(f"Vaga não encontrada: {args.job}")
+    width, height = (int(v) for v in args.resolution.lower().split("x"))
+
+    work_dir = tempfile.mkdtemp(prefix="benchmark_")
+    input_dir = os.path.join(work_dir, "input")
+    output_dir = os.path.join(work_dir, "output")
+    os.makedirs(output_dir)
+    timer = StageTimer()
+    try:
+        print(f"Gerando vídeos sintéticos em {input_dir}...")
+        started = time.perf_counter()
+        videos = generate_interview_set(
+            input_dir,
+            args.job,
+            questions=len(job.questions),
+            candidates=args.candidates,
+            duration=args.duration,
+            resolution=(width, height),
+            speech_ratio=args.speech_ratio,
+            seed=args.seed,
+        )
+        generation_seconds = time.perf_counter() - started
+
+        transcriber = Transcriber(
+            args.model_size,
+            backend=args.backend,
+            decode_options=decoding_options(args.decoding_profile, language=args.language),
+        )
+        started = time.perf_counter()
+        transcriber.model  # carrega os pesos fora das medições por vídeo
+        model_load_seconds = time.perf_counter() - started
+
+        timer.wrap(video_processor, "load_audio", "audio_extraction")
+        timer.wrap(video_processor, "extract_audio", "audio_extraction")
+        timer.wrap(video_processor, "capture_frames", "frame_capture")
+        timer.wrap(Transcriber, "transcribe_with_segments", "transcription")
+        timer.wrap(answer_evaluator, "chat_completion", "llm_request")
+
+        evaluator = InterviewEvaluator(auto_export=False)
+        token_meter.reset()
+        failures = 0
+        run_started = time.perf_counter()
+        for video in videos:
+            print(f"Processando {video}")
+            started = time.perf_counter()
+            processor = video_processor.VideoProcessor(
+                os.path.join(input_dir, video),
+                output_dir,
+                transcriber=transcriber,
+                work_root=os.path.join(work_dir, ".work"),
+            )
+            result = processor.process_video(capture=True, audio_file=args.audio_file)
+            processed = time.perf_counter()
+            timer.add("video_processing", processed - started)
+
+            path = evaluator.evaluate_interview(
+                video_filename=video,
+                transcription=result["transcription"],
+                output_dir=output_dir,
+                transcript=result["transcript"],
+            )
+            finished = time.perf_counter()
+            failures += path is None
+            timer.add("evaluation", finished - processed)
+            timer.add("end_to_end", finished - started)
+        wall_seconds = time.perf_counter() - run_started
+    finally:
+        timer.restore()
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    stages = timer.summary()
+    audio_seconds = args.duration * len(videos)
+    transcription_seconds = stages.get("transcription", {}).get("total") or 0.0
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("output", "baseline", "compare_profiles")
+        },
+        "videos": len(videos),
+        "failures": failures,
+        "audio_seconds": audio_seconds,
+        "generation_seconds": round(generation_seconds, 3),
+        "model_load_seconds": round(model_load_seconds, 3),
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput": {
+            # Segundos de áudio processados por segundo de relógio
+            "audio_seconds_per_second": (
+                round(audio_seconds / wall_seconds, 3) if wall_seconds else None
+            ),
+            "transcription_audio_seconds_per_second": (
+                round(audio_seconds / transcription_seconds, 3) if transcription_seconds else None
+            ),
+        },
+        "stages": stages,
+        "peak_rss_mb": peak_rss_mb(),
+        "llm_server": dict(server.stats),
+        "llm_tokens": token_meter.report(),
+        "work_dir": work_dir if args.keep else None,
+    }
+
+
+def run_profiles(args) -> dict:
+    """
+    Mede os perfis de decodificação em gravações reais: a fala sintética
+    não tem texto, então a qualidade precisa de transcrições de referência.
+    """
+    from transcription.audio_extractor import load_audio
+    from transcription.transcriber import Transcriber, compare_profiles
+
+    audios, references = [], []
+    for name in sorted(os.listdir(args.compare_profiles)):
+        path = os.path.join(args.compare_profiles, name)
+        reference_path = os.path.splitext(path)[0] + ".txt"
+        if name.endswith(".txt") or not os.path.exists(reference_path):
+            continue
+        print(f"Carregando {name}")
+        audios.append(load_audio(path))
+        with open(reference_path, "r", encoding="utf-8") as f:
+            references.append(f.read())
+    if not audios:
+        raise SystemExit(f"Nenhuma gravação com <arquivo>.txt em {args.compare_profiles}")
+
+    transcriber = Transcriber(args.model_size, backend=args.backend)
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "model_size": args.model_size,
+            "backend": args.backend,
+            "language": args.language,
+        },
+        "recordings": len(audios),
+        "decoding_profiles": compare_profiles(
+            transcriber, audios, references, language=args.language
+        ),
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_ffmpeg()
+
+    if args.compare_profiles:
+        report = run_profiles(args)
+        output = args.output or os.path.join(
+            BENCHMARK_DIR, f"profiles_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        atomic_write_json(output, report)
+        print(f"\nRelatório salvo em: {output}")
+        for profile, stats in report["decoding_profiles"].items():
+            print(
+                f"  {profile}: {stats['audio_seconds_per_second']} s de áudio por segundo, "
+                f"WER {stats['wer']:.1%}"
+            )
+        return
+
+    with FakeGroqServer(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    ) as server:
+        report = run(args, server)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            report["comparison"] = compare_reports(report, json.load(f))
+
+    output = args.output or os.path.join(
+        BENCHMARK_DIR, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    atomic_write_json(output, report)
+
+    print(f"\nRelatório salvo em: {output}")
+    print(f"Vazão: {report['throughput']['audio_seconds_per_second']} s de áudio por segundo")
+    for stage, stats in report["stages"].items():
+        print(f"  {stage}: p50 {stats['p50']}s, p90 {stats['p90']}s, p99 {stats['p99']}s")
+    for key, change in report.get("comparison", {}).items():
+        print(f"  {key}: {change:+.1%} em relação ao baseline")
+
+
+if __name__ == "__main__":
+    main()
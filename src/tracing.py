@@ -0,0 +1,268 @@
+import contextvars
+import cProfile
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from workspace import shared_file_mode
+
+# Atributos numéricos somados por etapa nas métricas (além de tempo e bytes)
+COUNTED_ATTRIBUTES = ("prompt_tokens", "completion_tokens", "retries")
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+def _io_counters() -> Optional[Dict[str, int]]:
+    """Bytes lidos e escritos pelo processo (inclui pipes, ex: saída do ffmpeg). Só Linux."""
+    try:
+        with open("/proc/self/io", "r") as f:
+            fields = dict(line.split(": ") for line in f.read().splitlines())
+        return {"read": int(fields["rchar"]), "written": int(fields["wchar"])}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+
+    def set(self, key: str, value):
+        self.attributes[key] = value
+
+    def add(self, key: str, amount=1):
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+
+class _NoopSpan:
+    """Span usado com o rastreamento desativado: não registra nada."""
+
+    def set(self, key: str, value):
+        pass
+
+    def add(self, key: str, amount=1):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    def __init__(self):
+        """
+        Rastreamento leve por vídeo e por etapa. Cada span registra tempo de
+        relógio, tempo de CPU da thread, bytes lidos/escritos pelo processo
+        e atributos como tokens e novas tentativas. Os spans terminados são
+        gravados em JSONL e agregados em métricas no formato do Prometheus.
+        Desativado (padrão), span() não faz nada.
+        """
+        self.enabled = False
+        self.trace_path: Optional[str] = None
+        self._lock = threading.Lock()
+        self._trace_file = None
+        self._metrics: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self._server = None
+
+    def configure(self, trace_path: Optional[str] = None, metrics_port: int = 0):
+        """
+        Ativa o rastreamento.
+
+        Args:
+            trace_path: Arquivo JSONL onde cada span terminado é acrescentado
+            metrics_port: Porta do endpoint HTTP /metrics (0 = desativado)
+        """
+        self.enabled = True
+        if trace_path:
+            os.makedirs(os.path.dirname(os.path.abspath(trace_path)), exist_ok=True)
+            self.trace_path = trace_path
+            self._trace_file = open(trace_path, "a", encoding="utf-8")
+        if metrics_port:
+            self.serve_metrics(metrics_port)
+
+    @contextmanager
+    def span(self, name: str, trace: Optional[str] = None, **attributes) -> Iterator:
+        """
+        Mede o bloco como uma etapa. Spans abertos dentro dele (na mesma
+        thread ou corrotina) ficam como filhos.
+
+        Args:
+            name: Nome da etapa (ex: "transcribe", "llm_request")
+            trace: Identificador do rastro, normalmente o nome do vídeo.
+                Permite ligar etapas executadas em threads diferentes
+            attributes: Atributos iniciais do span
+        """
+        if not self.enabled:
+            yield _NOOP_SPAN
+            return
+
+        parent = _current_span.get()
+        trace_id = trace or (parent.trace_id if parent else uuid.uuid4().hex[:16])
+        parent_id = parent.span_id if parent and parent.trace_id == trace_id else None
+        span = Span(name, trace_id, parent_id, attributes)
+        token = _current_span.set(span)
+
+        started_at = time.time()
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        io = _io_counters()
+        try:
+            yield span
+        except BaseException as e:
+            span.set("error", type(e).__name__)
+            raise
+        finally:
+            _current_span.reset(token)
+            record = {
+                "name": name,
+                "trace_id": trace_id,
+                "span_id": span.span_id,
+                "parent_id": parent_id,
+                "start": round(started_at, 6),
+                "wall_seconds": round(time.perf_counter() - wall, 6),
+                "cpu_seconds": round(time.thread_time() - cpu, 6),
+                "thread": threading.current_thread().name,
+            }
+            end_io = _io_counters() if io else None
+            if end_io:
+                record["bytes_read"] = end_io["read"] - io["read"]
+                record["bytes_written"] = end_io["written"] - io["written"]
+            record["attributes"] = span.attributes
+            self._finish(record)
+
+    def current(self):
+        """Span aberto no contexto atual (ou um span que ignora as chamadas)."""
+        return _current_span.get() or _NOOP_SPAN
+
+    def _finish(self, record: Dict):
+        with self._lock:
+            metrics = self._metrics[record["name"]]
+            metrics["count"] += 1
+            metrics["wall_seconds"] += record["wall_seconds"]
+            metrics["cpu_seconds"] += record["cpu_seconds"]
+            metrics["bytes_read"] += record.get("bytes_read", 0)
+            metrics["bytes_written"] += record.get("bytes_written", 0)
+            metrics["errors"] += "error" in record["attributes"]
+            for key in COUNTED_ATTRIBUTES:
+                value = record["attributes"].get(key)
+                if isinstance(value, (int, float)):
+                    metrics[key] += value
+            if self._trace_file:
+                self._trace_file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                self._trace_file.flush()
+
+    def render_metrics(self) -> str:
+        """Métricas agregadas por etapa no formato de texto do Prometheus."""
+        with self._lock:
+            snapshot = {name: dict(values) for name, values in sorted(self._metrics.items())}
+
+        series = [
+            ("interview_stage_seconds", "summary", "Tempo de relógio por etapa", None),
+            ("interview_stage_cpu_seconds_total", "counter", "Tempo de CPU por etapa", "cpu_seconds"),
+            ("interview_stage_read_bytes_total", "counter", "Bytes lidos por etapa", "bytes_read"),
+            (
+                "interview_stage_written_bytes_total", "counter",
+                "Bytes escritos por etapa", "bytes_written",
+            ),
+            ("interview_stage_errors_total", "counter", "Etapas encerradas com erro", "errors"),
+            (
+                "interview_llm_prompt_tokens_total", "counter",
+                "Tokens de prompt enviados ao LLM", "prompt_tokens",
+            ),
+            (
+                "interview_llm_completion_tokens_total", "counter",
+                "Tokens gerados pelo LLM", "completion_tokens",
+            ),
+            ("interview_llm_retries_total", "counter", "Novas tentativas de chamadas ao LLM", "retries"),
+        ]
+        lines = []
+        for metric, kind, description, key in series:
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for stage, values in snapshot.items():
+                label = f'{{stage="{stage}"}}'
+                if key is None:
+                    lines.append(f"{metric}_count{label} {int(values['count'])}")
+                    lines.append(f"{metric}_sum{label} {values['wall_seconds']:.6f}")
+                elif key in values:
+                    lines.append(f"{metric}{label} {values[key]:g}")
+        return "\n".join(lines) + "\n"
+
+    def write_metrics(self, path: str) -> str:
+        """Grava as métricas de forma atômica (ex: para o textfile collector do node_exporter)."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(self.render_metrics())
+        os.chmod(tmp_path, shared_file_mode(path))
+        os.replace(tmp_path, path)
+        return path
+
+    def serve_metrics(self, port: int, host: str = "0.0.0.0"):
+        """Serve as métricas em http://host:port/metrics, em uma thread de fundo."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        tracer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+                body = tracer.render_metrics().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server
+
+    def close(self):
+        with self._lock:
+            if self._trace_file:
+                self._trace_file.close()
+                self._trace_file = None
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+# Rastreador compartilhado pelo processo
+tracer = Tracer()
+
+
+@contextmanager
+def profiled(name: str, directory: str) -> Iterator[str]:
+    """
+    Executa o bloco sob o cProfile e grava <directory>/<name>.prof (abra com
+    pstats ou snakeviz). O PID é mostrado para acompanhar o mesmo trecho
+    com `py-spy record --pid <pid>`.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}.prof")
+    print(f"Perfilando {name} (pid {os.getpid()}) -> {path}")
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield path
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
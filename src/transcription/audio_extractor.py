@@ -1,10 +1,28 @@
-from moviepy.editor import VideoFileClip
 import os
+import subprocess
+import tempfile
+from typing import Iterator
+import numpy as np
+from ffmpeg_setup import get_ffmpeg_binary
+
+# Taxa de amostragem esperada pelo Whisper
+SAMPLE_RATE = 16000
+
+# Formatos PCM suportados na saída do ffmpeg -> dtype do NumPy
+_PCM_FORMATS = {
+    "f32le": np.float32,
+    "s16le": np.int16,
+}
+
 
 def extract_audio(video_path: str, output_dir: str) -> str:
     """
     Extrai o áudio do vídeo e salva como arquivo temporário.
+    Mantido como alternativa baseada em arquivo, útil para depuração
+    (o áudio pode ser ouvido); o caminho padrão é load_audio().
     """
+    from moviepy.editor import VideoFileClip
+
     video = VideoFileClip(video_path)
     if video.audio is None:
         raise Exception("O vídeo não contém áudio!")
@@ -13,3 +31,109 @@ def extract_audio(video_path: str, output_dir: str) -> str:
     video.audio.write_audiofile(audio_path)
     video.close()
     return audio_path
+
+
+def load_audio(
+    video_path: str, sample_rate: int = SAMPLE_RATE, sample_format: str = "f32le"
+) -> np.ndarray:
+    """
+    Decodifica o áudio do vídeo direto do ffmpeg para a memória, já em mono
+    e na taxa do Whisper, sem gravar arquivo intermediário.
+    Args:
+        video_path: Caminho do arquivo de vídeo
+        sample_rate: Taxa de amostragem de saída (Hz)
+        sample_format: Formato PCM lido do ffmpeg ("f32le" ou "s16le")
+    Returns:
+        np.ndarray: Amostras float32 normalizadas em [-1, 1]
+    """
+    if sample_format not in _PCM_FORMATS:
+        raise ValueError(f"Formato de áudio não suportado: {sample_format}")
+
+    cmd = [
+        get_ffmpeg_binary(),
+        "-nostdin",
+        "-threads", "0",
+        "-i", video_path,
+        "-map", "0:a:0",
+        "-vn",
+        "-f", sample_format,
+        "-acodec", f"pcm_{sample_format}",
+        "-ac", "1",
+        "-ar", str(sample_rate),
+        "-",
+    ]
+    process = subprocess.run(cmd, capture_output=True)
+
+    if process.returncode != 0:
+        stderr = process.stderr.decode("utf-8", errors="ignore")
+        if "matches no streams" in stderr:
+            raise Exception("O vídeo não contém áudio!")
+        raise RuntimeError(f"Falha ao decodificar o áudio de {video_path}: {stderr.strip()[-500:]}")
+
+    audio = np.frombuffer(process.stdout, dtype=_PCM_FORMATS[sample_format])
+    if sample_format == "s16le":
+        return audio.astype(np.float32) / 32768.0
+    return audio.copy()
+
+
+def stream_audio(
+    video_path: str,
+    window_seconds: float = 30.0,
+    sample_rate: int = SAMPLE_RATE,
+) -> Iterator[np.ndarray]:
+    """
+    Decodifica o áudio do vídeo em blocos de window_seconds, lendo a saída
+    do ffmpeg aos poucos. Apenas um bloco fica em memória por vez, o que
+    permite processar gravações longas com consumo constante.
+    Args:
+        video_path: Caminho do arquivo de vídeo
+        window_seconds: Duração de cada bloco
+        sample_rate: Taxa de amostragem de saída (Hz)
+    Yields:
+        np.ndarray: Blocos de amostras float32 mono
+    Raises:
+        RuntimeError: Se o ffmpeg terminar com erro, mesmo depois de alguns
+            blocos (vídeo corrompido ou truncado)
+    """
+    cmd = [
+        get_ffmpeg_binary(),
+        "-nostdin",
+        "-loglevel", "error",
+        "-i", video_path,
+        "-map", "0:a:0",
+        "-vn",
+        "-f", "f32le",
+        "-acodec", "pcm_f32le",
+        "-ac", "1",
+        "-ar", str(sample_rate),
+        "-",
+    ]
+    bytes_per_window = int(window_seconds * sample_rate) * 4
+    # O stderr vai para um arquivo temporário: um pipe lido só no final
+    # poderia encher e travar o ffmpeg enquanto o stdout é consumido
+    stderr_file = tempfile.TemporaryFile()
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file)
+
+    try:
+        while True:
+            data = process.stdout.read(bytes_per_window)
+            if not data:
+                break
+            # Garante um número inteiro de amostras float32
+            if len(data) % 4:
+                data += process.stdout.read(4 - len(data) % 4)
+            yield np.frombuffer(data, dtype=np.float32)
+
+        returncode = process.wait()
+        if returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", errors="ignore")
+            if "matches no streams" in stderr:
+                raise Exception("O vídeo não contém áudio!")
+            raise RuntimeError(f"Falha ao decodificar o áudio de {video_path}: {stderr.strip()[-500:]}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        stderr_file.close()
@@ -0,0 +1,255 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from transcription.vad import SpeechWindow
+
+# Duração de cada token de tempo do Whisper (<|0.00|>, <|0.02|>, ...)
+_TIMESTAMP_STEP = 0.02
+
+
+def segments_from_tokens(tokens, tokenizer, window: SpeechWindow) -> List[Dict]:
+    """Monta os segmentos a partir dos tokens de texto e de tempo decodificados."""
+    segments = []
+    start, text_tokens = None, []
+
+    def emit(end):
+        text = tokenizer.decode(text_tokens).strip()
+        if text:
+            segments.append({
+                "start": round(window.to_absolute(start or 0.0), 3),
+                "end": round(window.to_absolute(end, end=True), 3),
+                "text": text,
+            })
+
+    for token in tokens:
+        if token < tokenizer.timestamp_begin:
+            text_tokens.append(token)
+            continue
+        t = (token - tokenizer.timestamp_begin) * _TIMESTAMP_STEP
+        if start is not None and text_tokens:
+            emit(t)
+            start, text_tokens = None, []
+        else:
+            start = t
+    if text_tokens:
+        emit(window.duration)
+    return segments
+
+
+def shift_segment(segment: Dict, window: SpeechWindow) -> Dict:
+    """Converte os tempos do segmento (e das palavras) para tempos na gravação original."""
+    shifted = {
+        "start": round(window.to_absolute(segment["start"]), 3),
+        "end": round(window.to_absolute(segment["end"], end=True), 3),
+        "text": segment["text"],
+    }
+    if segment.get("words"):
+        shifted["words"] = [
+            {
+                "start": round(window.to_absolute(word["start"]), 3),
+                "end": round(window.to_absolute(word["end"], end=True), 3),
+                "word": word["word"],
+            }
+            for word in segment["words"]
+        ]
+    return shifted
+
+
+class TranscriptionBackend(ABC):
+    """
+    Motor de transcrição usado pelo Transcriber. Todos os backends retornam
+    segmentos no mesmo formato ({"start", "end", "text"} e, com
+    word_timestamps=True, "words": [{"start", "end", "word"}]), então o
+    restante do sistema não depende do motor escolhido.
+    """
+    name = ""
+
+    @property
+    def key(self) -> str:
+        """Identifica o backend e as opções que alteram o modelo carregado."""
+        return self.name
+
+    @abstractmethod
+    def load(self, model_size: str, device: Optional[str] = None):
+        """Carrega os pesos do modelo."""
+
+    @abstractmethod
+    def transcribe(self, model, audio: Union[str, np.ndarray], **options) -> List[Dict]:
+        """Transcreve um áudio e retorna seus segmentos."""
+
+    def decode_windows(self, model, windows: List[SpeechWindow], **options) -> List[List[Dict]]:
+        """
+        Transcreve várias janelas de até 30 s. Os tempos dos segmentos são
+        absolutos (SpeechWindow.to_absolute). Por padrão, uma janela por vez.
+        """
+        return [
+            [
+                shift_segment(segment, window)
+                for segment in self.transcribe(model, window.audio, **options)
+            ]
+            for window in windows
+        ]
+
+
+class WhisperBackend(TranscriptionBackend):
+    """openai-whisper em PyTorch (padrão)."""
+    name = "openai-whisper"
+
+    def load(self, model_size: str, device: Optional[str] = None):
+        # O import é feito aqui para que o torch só seja carregado quando
+        # um modelo for realmente necessário
+        import whisper
+
+        return whisper.load_model(model_size, device=device)
+
+    @staticmethod
+    def _fp16(model, options: Dict) -> Dict:
+        """fp16=None (automático) vira True apenas fora da CPU."""
+        if options.get("fp16") is None:
+            options = {**options, "fp16": str(model.device) != "cpu"}
+        return options
+
+    def transcribe(self, model, audio: Union[str, np.ndarray], **options) -> List[Dict]:
+        result = model.transcribe(audio, **self._fp16(model, options))
+        segments = []
+        for segment in result["segments"]:
+            converted = {
+                "start": segment["start"], "end": segment["end"], "text": segment["text"].strip()
+            }
+            if segment.get("words"):
+                converted["words"] = [
+                    {"start": word["start"], "end": word["end"], "word": word["word"]}
+                    for word in segment["words"]
+                ]
+            segments.append(converted)
+        return segments
+
+    @staticmethod
+    def _decoding_options(model, options: Dict):
+        """
+        Converte as opções de model.transcribe para as DecodingOptions usadas
+        na decodificação em lote.
+        """
+        import whisper
+
+        fields = whisper.DecodingOptions.__dataclass_fields__
+        decoding = {k: v for k, v in WhisperBackend._fp16(model, options).items() if k in fields}
+        temperature = decoding.get("temperature")
+        if isinstance(temperature, (tuple, list)):
+            # Sem fallback de temperatura no lote: usa apenas a primeira
+            decoding["temperature"] = temperature = temperature[0]
+        # Como em model.transcribe: best_of só vale com amostragem, beam_size só na gulosa
+        if not temperature:
+            decoding.pop("best_of", None)
+        else:
+            decoding.pop("beam_size", None)
+        return whisper.DecodingOptions(without_timestamps=False, **decoding)
+
+    def decode_windows(self, model, windows: List[SpeechWindow], **options) -> List[List[Dict]]:
+        """
+        Decodifica as janelas de uma só vez: os log-mel spectrogramas são
+        completados até 30 s, empilhados em um tensor (janelas, n_mels,
+        quadros) e passam juntos pelo modelo.
+        """
+        import torch
+        import whisper
+
+        mels = torch.stack([
+            whisper.log_mel_spectrogram(
+                whisper.pad_or_trim(torch.from_numpy(window.audio)),
+                n_mels=model.dims.n_mels,
+            )
+            for window in windows
+        ]).to(model.device)
+
+        tokenizer = whisper.tokenizer.get_tokenizer(
+            model.is_multilingual, num_languages=model.num_languages
+        )
+        results = whisper.decode(model, mels, self._decoding_options(model, options))
+        return [
+            segments_from_tokens(result.tokens, tokenizer, window)
+            for result, window in zip(results, windows)
+        ]
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    name = "faster-whisper"
+
+    def __init__(self, compute_type: str = "int8", cpu_threads: int = 0, num_workers: int = 1):
+        """
+        faster-whisper (CTranslate2), com pesos quantizados. Bem mais rápido
+        que o openai-whisper em CPU.
+
+        Args:
+            compute_type: Quantização dos pesos (int8, int8_float16, float16, float32)
+            cpu_threads: Threads por transcrição (0 = padrão do CTranslate2)
+            num_workers: Transcrições simultâneas suportadas pelo mesmo modelo
+        """
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}:{self.compute_type}:{self.cpu_threads}:{self.num_workers}"
+
+    def load(self, model_size: str, device: Optional[str] = None):
+        from faster_whisper import WhisperModel
+
+        return WhisperModel(
+            model_size,
+            device=device or "auto",
+            compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads,
+            num_workers=self.num_workers,
+        )
+
+    @staticmethod
+    def _adapt_options(options: Dict) -> Dict:
+        """
+        Converte as opções dos perfis (nomes do openai-whisper) para o
+        faster-whisper: a precisão vem do compute_type (sem fp16), a busca
+        gulosa é beam_size=1 e as temperaturas são uma lista.
+        """
+        adapted = {k: v for k, v in options.items() if k != "fp16" and v is not None}
+        if "beam_size" in options and options["beam_size"] is None:
+            adapted["beam_size"] = 1
+        if isinstance(adapted.get("temperature"), tuple):
+            adapted["temperature"] = list(adapted["temperature"])
+        return adapted
+
+    def transcribe(self, model, audio: Union[str, np.ndarray], **options) -> List[Dict]:
+        # Os segmentos são gerados sob demanda: a lista força a transcrição
+        segments, _info = model.transcribe(audio, **self._adapt_options(options))
+        converted = []
+        for segment in segments:
+            item = {"start": segment.start, "end": segment.end, "text": segment.text.strip()}
+            if segment.words:
+                item["words"] = [
+                    {"start": word.start, "end": word.end, "word": word.word}
+                    for word in segment.words
+                ]
+            converted.append(item)
+        return converted
+
+
+BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def create_backend(name: str = WhisperBackend.name, **options) -> TranscriptionBackend:
+    """
+    Cria o backend pelo nome. Opções que o backend não usa (ex: cpu_threads
+    no openai-whisper) são ignoradas.
+    """
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Backend de transcrição inválido: {name}. Use um de {list(BACKENDS)}")
+    if backend_class is WhisperBackend:
+        return WhisperBackend()
+    return backend_class(**options)
@@ -0,0 +1,99 @@
+import re
+from typing import Dict, List, Optional
+
+# Perfis de decodificação do Whisper. "default" reproduz os padrões de
+# model.transcribe; os demais vão do mais rápido ao mais preciso. As opções
+# seguem os nomes de model.transcribe do openai-whisper; cada backend adapta
+# o que não suporta (ver backends.py). fp16=None = automático (só em GPU)
+DECODING_PROFILES: Dict[str, Dict] = {
+    # Padrões do openai-whisper: gulosa, todas as temperaturas de reserva e
+    # condicionada no texto anterior (fp16 em GPU, como no próprio Whisper)
+    "default": {
+        "beam_size": None,
+        "best_of": 5,
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "condition_on_previous_text": True,
+        "fp16": None,
+    },
+    # Busca gulosa, sem nova decodificação com outras temperaturas e sem
+    # condicionar cada janela no texto anterior (evita laços de repetição)
+    "fast": {
+        "beam_size": None,
+        "best_of": None,
+        "temperature": 0.0,
+        "condition_on_previous_text": False,
+        "fp16": None,
+    },
+    # Gulosa, com poucas temperaturas de reserva para janelas ruins
+    "balanced": {
+        "beam_size": None,
+        "best_of": 3,
+        "temperature": (0.0, 0.4, 0.8),
+        "condition_on_previous_text": False,
+        "fp16": None,
+    },
+    # Beam search e todas as temperaturas de reserva, em precisão total
+    "accurate": {
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "condition_on_previous_text": True,
+        "fp16": False,
+    },
+}
+
+
+def decoding_options(
+    profile: str = "default",
+    language: Optional[str] = None,
+    word_timestamps: bool = False,
+) -> Dict:
+    """
+    Opções de decodificação do perfil, prontas para Transcriber(decode_options=...).
+
+    Args:
+        profile: Nome do perfil (default, fast, balanced, accurate)
+        language: Idioma padrão das gravações (ex: "pt"). None = detecção
+            automática em cada áudio
+        word_timestamps: Inclui os tempos de cada palavra
+
+    Raises:
+        ValueError: Se o perfil não existir
+    """
+    try:
+        options = dict(DECODING_PROFILES[profile])
+    except KeyError:
+        raise ValueError(
+            f"Perfil de decodificação inválido: {profile}. Use um de {list(DECODING_PROFILES)}"
+        )
+    if language:
+        options["language"] = language
+    if word_timestamps:
+        options["word_timestamps"] = True
+    return options
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Taxa de erro por palavra (substituições + inserções + remoções, sobre
+    o número de palavras da referência), sem caixa e pontuação.
+    """
+    ref, hyp = _words(reference), _words(hypothesis)
+    if not ref:
+        return float(bool(hyp))
+    # Distância de edição entre as sequências de palavras, linha a linha
+    previous = list(range(len(hyp) + 1))
+    for i, word in enumerate(ref, start=1):
+        current = [i]
+        for j, other in enumerate(hyp, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (word != other),
+            ))
+        previous = current
+    return previous[-1] / len(ref)
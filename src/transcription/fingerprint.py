@@ -0,0 +1,286 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from transcription.audio_extractor import SAMPLE_RATE
+
+# Impressão digital no estilo de Haitsma e Kalker: a cada quadro, 32 bits
+# com o sinal da variação de energia entre bandas vizinhas (300 Hz a 2 kHz)
+# em relação a alguns quadros antes. Depende só da forma do espectro, então
+# resiste a recodificação, mudança de contêiner e ganho
+FRAME_SIZE = 4096  # 256 ms a 16 kHz: janelas longas toleram desalinhamento
+HOP_SIZE = 512  # 32 ms entre quadros
+_LAG = 4  # quadros entre os espectros comparados em cada bit
+_BANDS = 33  # 33 bandas -> 32 bits por quadro
+_KEY_BANDS = 17  # 17 bandas -> chaves de 16 bits
+_MIN_HZ, _MAX_HZ = 300.0, 2000.0
+SILENCE_DB = -55.0  # quadros mais baixos que isso viram 0 e são ignorados
+MAX_OFFSET = 8  # deslocamento máximo testado na comparação (± 256 ms)
+MIN_FRAMES = 32  # quadros com som necessários para comparar (~1 s)
+KEY_FRAMES = 32  # quadros resumidos em cada chave do índice (~1 s)
+KEY_STRIDE = 16  # o índice guarda uma chave a cada 16 quadros
+_BLOCK_FRAMES = 1024  # quadros por FFT, para limitar a memória em áudios longos
+
+
+@dataclass
+class AudioFingerprint:
+    # Bits por quadro (uint32, 0 = silêncio), usados na comparação fina
+    frames: np.ndarray
+    # Forma do espectro médio da janela de KEY_FRAMES quadros que começa em
+    # cada quadro (16 bits, -1 = janela em silêncio), usada para achar
+    # candidatos no índice. Quase não muda com pequenos desalinhamentos
+    keys: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    @property
+    def audible_frames(self) -> int:
+        return int(np.count_nonzero(self.frames))
+
+
+def _band_bins(bands: int, sample_rate: int) -> np.ndarray:
+    """Índices das raias da FFT que delimitam as bandas (escala logarítmica)."""
+    edges = np.geomspace(_MIN_HZ, _MAX_HZ, bands + 1)
+    return np.round(edges * FRAME_SIZE / sample_rate).astype(np.int64)
+
+
+def _pack(bits: np.ndarray, dtype: str) -> np.ndarray:
+    return np.packbits(bits, axis=1, bitorder="little").view(dtype).ravel()
+
+
+def audio_fingerprint(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> AudioFingerprint:
+    """
+    Impressão digital acústica do áudio: 32 bits por quadro de 32 ms (cerca
+    de 125 bytes por segundo), mais as chaves usadas no índice.
+
+    Args:
+        samples: Amostras float32 mono (ver audio_extractor.load_audio)
+        sample_rate: Taxa de amostragem
+
+    Returns:
+        AudioFingerprint: Vazia para áudios com menos de um segundo
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    if len(samples) < FRAME_SIZE + KEY_FRAMES * HOP_SIZE:
+        return AudioFingerprint(np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.int64))
+
+    frames = np.lib.stride_tricks.sliding_window_view(samples, FRAME_SIZE)[::HOP_SIZE]
+    window = np.hanning(FRAME_SIZE).astype(np.float32)
+    bins = _band_bins(_BANDS, sample_rate)
+    key_bins = _band_bins(_KEY_BANDS, sample_rate)
+    energies = np.empty((len(frames), _BANDS), dtype=np.float64)
+    key_energies = np.empty((len(frames), _KEY_BANDS), dtype=np.float64)
+    loudness = np.empty(len(frames), dtype=np.float64)
+    for start in range(0, len(frames), _BLOCK_FRAMES):
+        block = frames[start:start + _BLOCK_FRAMES]
+        end = start + len(block)
+        power = np.abs(np.fft.rfft(block * window, axis=1)) ** 2
+        energies[start:end] = np.add.reduceat(
+            power[:, bins[0]:bins[-1]], bins[:-1] - bins[0], axis=1
+        )
+        key_energies[start:end] = np.add.reduceat(
+            power[:, key_bins[0]:key_bins[-1]], key_bins[:-1] - key_bins[0], axis=1
+        )
+        loudness[start:end] = np.mean(block.astype(np.float64) ** 2, axis=1)
+    loud = 10 * np.log10(loudness + 1e-12) > SILENCE_DB
+
+    # Bits finos: a diferença entre bandas vizinhas cresceu desde _LAG quadros antes?
+    band_diff = energies[:, :-1] - energies[:, 1:]
+    fingerprint = np.zeros(len(frames), dtype=np.uint32)
+    fingerprint[_LAG:] = _pack((band_diff[_LAG:] - band_diff[:-_LAG]) > 0, "<u4")
+    fingerprint[_LAG:][~(loud[_LAG:] & loud[:-_LAG])] = 0
+
+    # Chaves: banda mais forte que a seguinte no espectro médio da janela
+    totals = np.cumsum(np.vstack([np.zeros((1, _KEY_BANDS)), key_energies]), axis=0)
+    windowed = totals[KEY_FRAMES:] - totals[:-KEY_FRAMES]
+    keys = _pack(windowed[:, :-1] > windowed[:, 1:], "<u2").astype(np.int64)
+    loud_count = np.convolve(loud, np.ones(KEY_FRAMES, dtype=np.int64), mode="valid")
+    keys[loud_count < KEY_FRAMES // 2] = -1
+    return AudioFingerprint(fingerprint, keys)
+
+
+def fingerprint_similarity(a: np.ndarray, b: np.ndarray, max_offset: int = MAX_OFFSET) -> float:
+    """
+    Fração de bits iguais (1 - taxa de erro de bits) no melhor alinhamento
+    entre os bits por quadro de duas impressões, ignorando quadros em
+    silêncio. Cerca de 0.5 para áudios diferentes e perto de 1 para o mesmo
+    áudio recodificado.
+    """
+    best = 0.0
+    for offset in range(-max_offset, max_offset + 1):
+        x, y = a[max(offset, 0):], b[max(-offset, 0):]
+        n = min(len(x), len(y))
+        x, y = x[:n], y[:n]
+        valid = (x != 0) & (y != 0)
+        count = int(valid.sum())
+        if count < MIN_FRAMES:
+            continue
+        errors = int(np.unpackbits((x[valid] ^ y[valid]).view(np.uint8)).sum())
+        best = max(best, 1.0 - errors / (32 * count))
+    return best
+
+
+@dataclass
+class FingerprintMatch:
+    content_hash: str  # hash do arquivo já processado (chave no cache de transcrições)
+    video: str
+    similarity: float
+
+
+class FingerprintIndex:
+    def __init__(
+        self,
+        db_path: str,
+        min_similarity: float = 0.65,
+        duration_tolerance: float = 0.05,
+        max_candidates: int = 5,
+    ):
+        """
+        Índice persistente (SQLite) das impressões digitais dos áudios já
+        transcritos, para encontrar reenvios do mesmo áudio em outro
+        contêiner ou codificação, que têm outro hash de arquivo.
+
+        Cada impressão é indexada por uma chave a cada KEY_STRIDE quadros.
+        A busca calcula as chaves em todos os quadros do áudio novo, conta
+        no índice as chaves em comum com cada áudio de duração parecida e
+        compara bit a bit só os que têm mais chaves em comum.
+
+        Args:
+            db_path: Caminho do arquivo SQLite
+            min_similarity: Fração mínima de bits iguais para considerar
+                duplicata (cerca de 0.5 = áudios sem relação)
+            duration_tolerance: Diferença relativa de duração aceita
+            max_candidates: Áudios comparados bit a bit em cada busca
+        """
+        self.db_path = db_path
+        self.min_similarity = min_similarity
+        self.duration_tolerance = duration_tolerance
+        self.max_candidates = max_candidates
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS fingerprints (
+                id INTEGER PRIMARY KEY,
+                content_hash TEXT NOT NULL UNIQUE,
+                video TEXT NOT NULL,
+                frames INTEGER NOT NULL,
+                fingerprint BLOB NOT NULL,
+                created_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS fingerprint_keys (
+                key INTEGER NOT NULL,
+                fingerprint_id INTEGER NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_fingerprint_keys_key ON fingerprint_keys (key)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_fingerprints_frames ON fingerprints (frames)"
+        )
+        self._conn.commit()
+
+    def add(self, content_hash: str, video: str, fingerprint: AudioFingerprint):
+        """Registra a impressão do áudio (substitui a anterior do mesmo arquivo)."""
+        if fingerprint.audible_frames < MIN_FRAMES:
+            return  # curto ou silencioso demais para ser comparado
+        keys = {int(key) for key in fingerprint.keys[::KEY_STRIDE] if key >= 0}
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM fingerprint_keys WHERE fingerprint_id IN "
+                "(SELECT id FROM fingerprints WHERE content_hash = ?)",
+                (content_hash,),
+            )
+            self._conn.execute("DELETE FROM fingerprints WHERE content_hash = ?", (content_hash,))
+            cursor = self._conn.execute(
+                "INSERT INTO fingerprints (content_hash, video, frames, fingerprint, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    content_hash,
+                    video,
+                    len(fingerprint),
+                    fingerprint.frames.astype("<u4").tobytes(),
+                    time.time(),
+                ),
+            )
+            self._conn.executemany(
+                "INSERT INTO fingerprint_keys (key, fingerprint_id) VALUES (?, ?)",
+                [(key, cursor.lastrowid) for key in sorted(keys)],
+            )
+            self._conn.commit()
+
+    def find(
+        self, fingerprint: AudioFingerprint, exclude: Optional[str] = None
+    ) -> Optional[FingerprintMatch]:
+        """
+        Áudio indexado mais parecido, se passar de min_similarity.
+
+        Args:
+            fingerprint: Impressão do áudio novo
+            exclude: content_hash a ignorar (o próprio arquivo, se já indexado)
+        """
+        keys = sorted({int(key) for key in fingerprint.keys if key >= 0})
+        if fingerprint.audible_frames < MIN_FRAMES or not keys:
+            return None
+        low = int(len(fingerprint) * (1 - self.duration_tolerance))
+        high = int(len(fingerprint) * (1 + self.duration_tolerance)) + 1
+
+        hits = Counter()
+        with self._lock:
+            # Em blocos, abaixo do limite de parâmetros do SQLite
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._conn.execute(
+                    "SELECT k.fingerprint_id, COUNT(*) FROM fingerprint_keys k "
+                    "JOIN fingerprints f ON f.id = k.fingerprint_id "
+                    f"WHERE k.key IN ({','.join('?' * len(chunk))}) "
+                    "AND f.frames BETWEEN ? AND ? GROUP BY k.fingerprint_id",
+                    [*chunk, low, high],
+                ).fetchall()
+                hits.update(dict(rows))
+
+            best = None
+            for fingerprint_id, _ in hits.most_common(self.max_candidates):
+                content_hash, video, blob = self._conn.execute(
+                    "SELECT content_hash, video, fingerprint FROM fingerprints WHERE id = ?",
+                    (fingerprint_id,),
+                ).fetchone()
+                if content_hash == exclude:
+                    continue
+                similarity = fingerprint_similarity(
+                    fingerprint.frames, np.frombuffer(blob, dtype="<u4")
+                )
+                if similarity >= self.min_similarity and (
+                    best is None or similarity > best.similarity
+                ):
+                    best = FingerprintMatch(content_hash, video, round(similarity, 4))
+        return best
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+    def clear(self) -> int:
+        """Remove todas as impressões. Retorna quantas foram removidas."""
+        with self._lock:
+            self._conn.execute("DELETE FROM fingerprint_keys")
+            removed = self._conn.execute("DELETE FROM fingerprints").rowcount
+            self._conn.commit()
+            return removed
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
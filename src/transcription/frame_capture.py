@@ -1,14 +1,103 @@
 import os
-from moviepy.editor import VideoFileClip
+import re
+import shutil
+import subprocess
+import tempfile
+from typing import List, Optional
+from ffmpeg_setup import get_ffmpeg_binary
 
-def capture_frames(video_path: str, output_dir: str, interval: int = 60) -> list:
-    video = VideoFileClip(video_path)
-    frame_paths = []
+FRAME_MODES = ("interval", "keyframes", "scene")
 
-    for t in range(0, int(video.duration), interval):
-        frame_path = os.path.join(output_dir, f"frame_{t}s.jpg")
-        video.save_frame(frame_path, t)
-        frame_paths.append(frame_path)
+_PTS_TIME = re.compile(r"pts_time:\s*([0-9.]+)")
 
-    video.close()
-    return frame_paths
+
+def _frame_filter(mode: str, interval: int, scene_threshold: float, width: Optional[int]) -> str:
+    """Monta a cadeia de filtros do ffmpeg que seleciona e redimensiona os frames."""
+    if mode == "scene":
+        # Primeiro frame + cada mudança de cena acima do limiar
+        select = f"select='eq(n\\,0)+gt(scene\\,{scene_threshold})'"
+    else:
+        # Um frame a cada `interval` segundos (no modo keyframes, só entre keyframes)
+        select = f"select='isnan(prev_selected_t)+gte(t-prev_selected_t\\,{interval})'"
+
+    filters = [select]
+    if width:
+        filters.append(f"scale={width}:-2")
+    filters.append("showinfo")
+    return ",".join(filters)
+
+
+def _frame_name(timestamp: float, prefix: str = "") -> str:
+    return f"{prefix}frame_{round(timestamp, 3):g}s.jpg"
+
+
+def capture_frames(
+    video_path: str,
+    output_dir: str,
+    interval: int = 60,
+    mode: str = "interval",
+    scene_threshold: float = 0.3,
+    width: Optional[int] = None,
+    threads: int = 0,
+    prefix: str = "",
+) -> list:
+    """
+    Captura frames do vídeo em uma única passada sequencial do ffmpeg, sem
+    um seek e uma decodificação por frame.
+
+    Args:
+        video_path: Caminho do arquivo de vídeo
+        output_dir: Diretório onde os JPEGs são salvos ({prefix}frame_{t}s.jpg)
+        interval: Intervalo em segundos entre frames (modos interval e keyframes)
+        mode: "interval" (decodifica tudo, tempo exato), "keyframes" (decodifica
+            apenas keyframes, bem mais rápido, tempo aproximado) ou "scene"
+            (um frame por mudança de cena)
+        scene_threshold: Sensibilidade da detecção de cena (0 a 1)
+        width: Se informado, redimensiona os frames para esta largura na decodificação
+        threads: Threads do ffmpeg para decodificar e codificar os JPEGs (0 = automático)
+        prefix: Prefixo dos arquivos (ex: nome do vídeo), para que frames de
+            vídeos diferentes não se sobrescrevam no mesmo diretório
+
+    Returns:
+        list: Caminhos dos frames salvos, em ordem de tempo
+    """
+    if mode not in FRAME_MODES:
+        raise ValueError(f"Modo de captura inválido: {mode}. Use um de {FRAME_MODES}")
+
+    work_dir = tempfile.mkdtemp(prefix="frames_", dir=output_dir)
+    try:
+        cmd = [get_ffmpeg_binary(), "-nostdin", "-hide_banner", "-threads", str(threads)]
+        if mode == "keyframes":
+            cmd += ["-skip_frame", "nokey"]
+        cmd += [
+            "-i", video_path,
+            "-an",
+            "-vf", _frame_filter(mode, interval, scene_threshold, width),
+            "-vsync", "vfr",
+            "-q:v", "2",
+            "-threads", str(threads),
+            os.path.join(work_dir, "%06d.jpg"),
+        ]
+        process = subprocess.run(cmd, capture_output=True)
+        stderr = process.stderr.decode("utf-8", errors="ignore")
+        if process.returncode != 0:
+            raise RuntimeError(f"Falha ao capturar frames de {video_path}: {stderr.strip()[-500:]}")
+
+        # O filtro showinfo registra o tempo de cada frame selecionado, na ordem
+        timestamps = [
+            float(match.group(1))
+            for line in stderr.splitlines()
+            if "Parsed_showinfo" in line
+            for match in [_PTS_TIME.search(line)]
+            if match
+        ]
+        generated = sorted(os.listdir(work_dir))
+
+        frame_paths: List[str] = []
+        for filename, timestamp in zip(generated, timestamps):
+            frame_path = os.path.join(output_dir, _frame_name(timestamp, prefix))
+            os.replace(os.path.join(work_dir, filename), frame_path)
+            frame_paths.append(frame_path)
+        return frame_paths
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -1,4 +1,210 @@
-from groq import Groq
-from config import GROQ_API_KEY
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import config
+from config import (
+    GROQ_MAX_CONCURRENCY,
+    GROQ_MAX_CONNECTIONS,
+    GROQ_MAX_RETRIES,
+    GROQ_RPM,
+    GROQ_TPM,
+)
+from tracing import tracer
+from .rate_limiter import RateLimiter, backoff_delay, estimate_tokens, retry_after_seconds
+
+# Cliente síncrono, criado no primeiro uso (get_client): o SDK do Groq (httpx,
+# pydantic) só é importado pelos comandos que chamam o LLM
+client = None
+_client_lock = threading.Lock()
+
+# Limitador compartilhado pelo cliente síncrono e pelos assíncronos do processo
+rate_limiter = RateLimiter(requests_per_minute=GROQ_RPM, tokens_per_minute=GROQ_TPM)
+
+# Fração de max_completion_tokens reservada no limitador (ver estimate_request_tokens)
+COMPLETION_RESERVE_FRACTION = 0.25
+
+
+def get_client():
+    """Cliente síncrono do Groq compartilhado pelo processo."""
+    global client
+    with _client_lock:
+        if client is None:
+            from groq import Groq
+
+            # As novas tentativas são feitas aqui (com o limitador), não pelo SDK
+            client = Groq(api_key=config.GROQ_API_KEY, max_retries=0)
+        return client
+
+
+def retryable_errors() -> Tuple[type, ...]:
+    """Erros transitórios do Groq: vale a pena tentar de novo."""
+    from groq import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+
+    return (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+
+def estimate_request_tokens(messages: List[Dict], params: Dict) -> int:
+    """
+    Tokens estimados de uma requisição: prompt + saída esperada. A saída
+    reservada é uma fração de max_completion_tokens, que é só um teto: uma
+    avaliação usa poucas centenas de tokens, e reservar o teto inteiro
+    faria o limitador de TPM segurar requisições que caberiam no limite.
+    """
+    prompt_tokens = sum(estimate_tokens(m["content"]) for m in messages)
+    return prompt_tokens + int(
+        params.get("max_completion_tokens", 0) * COMPLETION_RESERVE_FRACTION
+    )
+
+
+def chat_completion(messages: List[Dict], max_retries: int = GROQ_MAX_RETRIES, **params):
+    """
+    Chamada síncrona ao chat do Groq respeitando os limites de RPM/TPM e
+    tentando novamente (backoff exponencial, Retry-After) em erros
+    transitórios como 429. Se as tentativas se esgotarem, o erro é propagado.
+    """
+    tokens = estimate_request_tokens(messages, params)
+    for attempt in range(max_retries + 1):
+        time.sleep(rate_limiter.reserve(tokens))
+        try:
+            return get_client().chat.completions.create(messages=messages, **params)
+        except retryable_errors() as e:
+            if attempt == max_retries:
+                raise
+            tracer.current().add("retries")
+            delay = backoff_delay(attempt, retry_after_seconds(e))
+            print(f"Erro temporário do Groq ({type(e).__name__}), nova tentativa em {delay:.1f}s")
+            time.sleep(delay)
+
+
+class AsyncGroqClient:
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_concurrency: int = GROQ_MAX_CONCURRENCY,
+        max_connections: int = GROQ_MAX_CONNECTIONS,
+        max_retries: int = GROQ_MAX_RETRIES,
+        limiter: Optional[RateLimiter] = None,
+    ):
+        """
+        Cliente assíncrono do Groq para muitas requisições simultâneas.
+
+        Usa um pool de conexões HTTP compartilhado, limita as requisições em
+        andamento com um semáforo e respeita os limites de RPM/TPM do modelo.
+
+        Args:
+            api_key: Chave da API (padrão: config.GROQ_API_KEY)
+            max_concurrency: Máximo de requisições em andamento
+            max_connections: Tamanho do pool de conexões HTTP
+            max_retries: Novas tentativas em erros transitórios
+            limiter: Limitador de taxa (padrão: o compartilhado do processo)
+        """
+        import httpx
+        from groq import AsyncGroq
+
+        self.max_retries = max_retries
+        self.limiter = limiter or rate_limiter
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+        )
+        self._client = AsyncGroq(
+            api_key=api_key or config.GROQ_API_KEY,
+            max_retries=0,
+            http_client=self._http_client,
+        )
+
+    async def chat_completion(self, messages: List[Dict], **params):
+        """Equivalente assíncrono de chat_completion()."""
+        tokens = estimate_request_tokens(messages, params)
+        for attempt in range(self.max_retries + 1):
+            await asyncio.sleep(self.limiter.reserve(tokens))
+            try:
+                async with self._semaphore:
+                    return await self._client.chat.completions.create(
+                        messages=messages, **params
+                    )
+            except retryable_errors() as e:
+                if attempt == self.max_retries:
+                    raise
+                tracer.current().add("retries")
+                await asyncio.sleep(backoff_delay(attempt, retry_after_seconds(e)))
+
+    async def aclose(self):
+        await self._http_client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+class BackgroundAsyncClient:
+    def __init__(self, **client_options):
+        """
+        AsyncGroqClient rodando em um event loop próprio, em uma thread de
+        fundo. Permite que código síncrono (ex: as threads de avaliação do
+        pipeline) faça as chamadas ao LLM por um único cliente assíncrono,
+        compartilhando o pool de conexões e o limite de concorrência.
+
+        Args:
+            client_options: Repassadas ao AsyncGroqClient
+        """
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="groq-async", daemon=True
+        )
+        self._thread.start()
+        # Criado dentro do loop, ao qual o semáforo do cliente fica ligado
+        self.client: AsyncGroqClient = self.run(self._create_client(client_options))
+
+    @staticmethod
+    async def _create_client(client_options: Dict) -> AsyncGroqClient:
+        return AsyncGroqClient(**client_options)
+
+    def run(self, coroutine):
+        """Executa a corrotina no loop e aguarda o resultado (ou o erro)."""
+        return self.submit(coroutine).result()
+
+    def submit(self, coroutine) -> concurrent.futures.Future:
+        """
+        Agenda a corrotina no loop sem esperar por ela, para manter muitas
+        requisições em andamento a partir de poucas threads. O contexto da
+        thread que chama é preservado, então os spans abertos nela
+        continuam sendo os pais das etapas da corrotina.
+        """
+        future = concurrent.futures.Future()
+
+        def start():
+            task = self._loop.create_task(coroutine)
+
+            def done(task):
+                if task.cancelled():
+                    future.cancel()
+                elif task.exception() is not None:
+                    future.set_exception(task.exception())
+                else:
+                    future.set_result(task.result())
+
+            task.add_done_callback(done)
+
+        self._loop.call_soon_threadsafe(start, context=contextvars.copy_context())
+        return future
+
+    def close(self):
+        """Fecha as conexões do cliente e encerra o loop."""
+        if not self._loop.is_running():
+            return
+        self.run(self.client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
 
-client = Groq(api_key=GROQ_API_KEY)
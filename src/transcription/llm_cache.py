@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+def normalize_messages(messages: List[Dict]) -> List[Dict]:
+    """
+    Normaliza as mensagens do prompt para gerar a chave do cache:
+    espaços em branco repetidos (indentação, quebras de linha) viram um só.
+    """
+    return [
+        {"role": m["role"], "content": re.sub(r"\s+", " ", m["content"]).strip()}
+        for m in messages
+    ]
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        db_path: str,
+        ttl_seconds: Optional[float] = 30 * 24 * 3600,
+        max_entries: int = 10000,
+    ):
+        """
+        Cache persistente (SQLite) de respostas do LLM.
+
+        A chave é o hash do prompt normalizado junto com os parâmetros da
+        requisição (modelo, temperatura, etc.), de modo que reprocessar um
+        lote não repete chamadas idênticas à API.
+
+        Args:
+            db_path: Caminho do arquivo SQLite
+            ttl_seconds: Validade de cada entrada. None = não expira
+            max_entries: Número máximo de entradas; as acessadas há mais
+                tempo são removidas primeiro
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(messages: List[Dict], params: Dict) -> str:
+        """Gera a chave a partir do prompt normalizado e dos parâmetros."""
+        payload = json.dumps(
+            {"messages": normalize_messages(messages), "params": params},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, messages: List[Dict], params: Dict) -> Optional[str]:
+        """Retorna a resposta salva para o prompt, ou None (contabiliza acerto/falha)."""
+        key = self.make_key(messages, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, messages: List[Dict], params: Dict, response: str):
+        """Grava a resposta e remove as entradas excedentes."""
+        key = self.make_key(messages, params)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            self._conn.execute(
+                """DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def clear(self) -> int:
+        """Remove todas as entradas. Retorna quantas foram removidas."""
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM responses").rowcount
+            self._conn.commit()
+            return removed
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de acertos e falhas desde a criação do cache."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
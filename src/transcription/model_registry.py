@@ -0,0 +1,76 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+from tracing import tracer
+from transcription.backends import TranscriptionBackend, WhisperBackend
+
+# Registro de modelos carregados no processo, indexado por (tamanho, device, réplica, backend)
+_models: Dict[Tuple[str, Optional[str], int, str], object] = {}
+_lock = threading.Lock()
+
+
+def _load_model(model_size: str, device: Optional[str], backend: TranscriptionBackend):
+    """
+    Carrega os pesos pelo backend. Os imports do motor (torch, ctranslate2)
+    ficam no backend, para que só sejam carregados quando um modelo for
+    realmente necessário.
+    """
+    print(f"Carregando modelo de transcrição ({model_size}, {backend.key})...")
+    with tracer.span("load_model", model=model_size, backend=backend.key):
+        return backend.load(model_size, device)
+
+
+def get_model(
+    model_size: str = "small",
+    device: Optional[str] = None,
+    replica: int = 0,
+    backend: Optional[TranscriptionBackend] = None,
+):
+    """
+    Retorna o modelo compartilhado para (tamanho, device, réplica, backend),
+    carregando-o apenas no primeiro uso.
+    Args:
+        model_size: Tamanho do modelo (tiny, base, small, medium, large)
+        device: Dispositivo (ex: "cpu", "cuda"). None = automático
+        replica: Índice da cópia do modelo. O Whisper não suporta duas
+            transcrições simultâneas na mesma instância, então workers
+            paralelos usam réplicas diferentes
+        backend: Motor de transcrição (padrão: openai-whisper)
+    Returns:
+        Modelo carregado
+    """
+    backend = backend or WhisperBackend()
+    key = (model_size, device, replica, backend.key)
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            model = _load_model(model_size, device, backend)
+            _models[key] = model
+        return model
+
+
+def release_model(
+    model_size: str = "small",
+    device: Optional[str] = None,
+    replica: int = 0,
+    backend: Optional[TranscriptionBackend] = None,
+) -> bool:
+    """
+    Remove o modelo do registro para que a memória possa ser liberada.
+    Retorna True se havia um modelo carregado para a chave.
+    """
+    backend = backend or WhisperBackend()
+    with _lock:
+        return _models.pop((model_size, device, replica, backend.key), None) is not None
+
+
+def clear_models():
+    """Remove todos os modelos carregados do registro."""
+    with _lock:
+        _models.clear()
+
+
+def loaded_models() -> list:
+    """Lista as chaves (tamanho, device, réplica, backend) dos modelos carregados."""
+    with _lock:
+        return list(_models.keys())
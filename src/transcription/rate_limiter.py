@@ -0,0 +1,117 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, per_minute: float):
+        """
+        Balde de tokens com reabastecimento contínuo.
+
+        As reservas podem deixar o saldo negativo: quem reserva recebe o
+        tempo que precisa esperar, o que permite usar o mesmo balde a partir
+        de threads (time.sleep) e de corrotinas (asyncio.sleep).
+
+        Args:
+            capacity: Máximo de tokens acumulados (rajada permitida)
+            per_minute: Tokens repostos por minuto
+        """
+        self.capacity = capacity
+        self.rate = per_minute / 60.0
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Reserva `amount` tokens e retorna quantos segundos aguardar antes de usá-los."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            # Pedidos maiores que a capacidade nunca caberiam no balde
+            self._tokens -= min(amount, self.capacity)
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        """
+        Limita requisições por minuto (RPM) e tokens por minuto (TPM),
+        seguindo os limites do modelo no Groq. 0 desativa o limite.
+        """
+        self.requests = (
+            TokenBucket(requests_per_minute, requests_per_minute)
+            if requests_per_minute > 0
+            else None
+        )
+        self.tokens = (
+            TokenBucket(tokens_per_minute, tokens_per_minute)
+            if tokens_per_minute > 0
+            else None
+        )
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Reserva uma requisição com `tokens` estimados; retorna a espera em segundos."""
+        wait = 0.0
+        if self.requests:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        return wait
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Lê o tempo de espera sugerido pela API nos cabeçalhos da resposta de
+    erro (retry-after-ms, ou Retry-After em segundos ou como data HTTP).
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(
+    attempt: int,
+    retry_after: Optional[float] = None,
+    base: float = 1.0,
+    maximum: float = 60.0,
+) -> float:
+    """
+    Tempo de espera antes da próxima tentativa: respeita o Retry-After
+    quando informado; senão, backoff exponencial com jitter.
+    """
+    if retry_after is not None:
+        return min(retry_after, maximum)
+    delay = min(maximum, base * (2 ** attempt))
+    return delay * (0.5 + random.random() / 2)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa grosseira de tokens (~4 caracteres por token)."""
+    return len(text) // 4 + 1
@@ -0,0 +1,141 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+def _to_ms(values: np.ndarray) -> List[int]:
+    return np.rint(values * 1000).astype(np.int64).tolist()
+
+
+def _from_ms(values: List[int]) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64) / 1000
+
+
+def _bounds(offsets: List[int], text: str) -> np.ndarray:
+    """Início de cada trecho no texto, mais o fim do texto (n + 1 valores)."""
+    return np.asarray(offsets + [len(text)], dtype=np.int32)
+
+
+@dataclass
+class SegmentArray:
+    """
+    Transcrição compacta: o texto em um único buffer e, em arrays
+    paralelos, o início e o fim de cada segmento e sua posição no texto.
+    O segmento i é text[offsets[i]:offsets[i + 1]]. Os tempos das palavras
+    (word_timestamps) seguem o mesmo formato, quando disponíveis.
+    """
+    text: str
+    start: np.ndarray  # segundos
+    end: np.ndarray
+    offsets: np.ndarray  # n + 1 posições no texto
+    word_start: Optional[np.ndarray] = None
+    word_end: Optional[np.ndarray] = None
+    word_offsets: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_segments(cls, segments: List[Dict]) -> "SegmentArray":
+        """
+        Converte a lista de segmentos {"start", "end", "text", "words"?}
+        retornada pelos backends. O texto resultante é o mesmo de
+        Transcriber.clean_transcription.
+        """
+        parts, offsets = [], []
+        word_start, word_end, word_offsets = [], [], []
+        position = 0
+        for segment in segments:
+            text = segment["text"].strip()
+            offsets.append(position)
+
+            cursor = 0
+            for word in segment.get("words") or []:
+                # Localiza a palavra no texto do segmento, a partir da anterior
+                token = word["word"].strip()
+                found = text.find(token, cursor)
+                if found < 0:
+                    found = cursor
+                else:
+                    cursor = found + len(token)
+                word_start.append(word["start"])
+                word_end.append(word["end"])
+                word_offsets.append(position + found)
+
+            parts.append(text)
+            position += len(text) + 1  # espaço entre segmentos
+
+        text = " ".join(parts)
+        has_words = bool(word_offsets)
+        return cls(
+            text=text,
+            start=np.asarray([s["start"] for s in segments], dtype=np.float64),
+            end=np.asarray([s["end"] for s in segments], dtype=np.float64),
+            offsets=_bounds(offsets, text),
+            word_start=np.asarray(word_start, dtype=np.float64) if has_words else None,
+            word_end=np.asarray(word_end, dtype=np.float64) if has_words else None,
+            word_offsets=_bounds(word_offsets, text) if has_words else None,
+        )
+
+    @classmethod
+    def from_text(cls, text: str) -> "SegmentArray":
+        """Transcrição sem tempos (ex: entradas antigas do cache)."""
+        empty = np.zeros(0, dtype=np.float64)
+        return cls(text, empty, empty.copy(), _bounds([], text))
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    @property
+    def has_words(self) -> bool:
+        return self.word_offsets is not None
+
+    def segment_text(self, index: int) -> str:
+        return self.text[self.offsets[index]:self.offsets[index + 1]].strip()
+
+    def segments(self) -> List[Dict]:
+        """Segmentos no formato de lista de dicts ({"start", "end", "text"})."""
+        return [
+            {"start": float(self.start[i]), "end": float(self.end[i]), "text": self.segment_text(i)}
+            for i in range(len(self))
+        ]
+
+    def words(self) -> List[Dict]:
+        """Palavras com tempos ({"start", "end", "word"}), ou [] sem word_timestamps."""
+        if not self.has_words:
+            return []
+        return [
+            {
+                "start": float(self.word_start[i]),
+                "end": float(self.word_end[i]),
+                "word": self.text[self.word_offsets[i]:self.word_offsets[i + 1]].strip(),
+            }
+            for i in range(len(self.word_start))
+        ]
+
+    def to_dict(self) -> Dict:
+        """Formato compacto para JSON: tempos em milissegundos inteiros."""
+        data = {
+            "text": self.text,
+            "start_ms": _to_ms(self.start),
+            "end_ms": _to_ms(self.end),
+            "offsets": self.offsets.tolist(),
+        }
+        if self.has_words:
+            data["words"] = {
+                "start_ms": _to_ms(self.word_start),
+                "end_ms": _to_ms(self.word_end),
+                "offsets": self.word_offsets.tolist(),
+            }
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SegmentArray":
+        words = data.get("words")
+        return cls(
+            text=data["text"],
+            start=_from_ms(data["start_ms"]),
+            end=_from_ms(data["end_ms"]),
+            offsets=np.asarray(data["offsets"], dtype=np.int32),
+            word_start=_from_ms(words["start_ms"]) if words else None,
+            word_end=_from_ms(words["end_ms"]) if words else None,
+            word_offsets=np.asarray(words["offsets"], dtype=np.int32) if words else None,
+        )
@@ -1,15 +1,20 @@
-from config import GROQ_MODEL
-from .groq_client import client
+import asyncio
+from typing import Dict, List, Optional, Tuple
+import config
+from config import LLM_MAX_PROMPT_TOKENS
+from .groq_client import AsyncGroqClient, chat_completion
+from .llm_cache import ResponseCache
+from .rate_limiter import estimate_tokens
+from .token_budget import fit_to_budget, token_meter
+from tracing import tracer
 
 
-def summarize_text(text: str, verbose: bool = False) -> str:
+def _build_request(
+    text: str, max_prompt_tokens: int = LLM_MAX_PROMPT_TOKENS
+) -> Tuple[List[Dict], Dict]:
     """
-    Chama a API do Groq para resumir um texto.
-    Args:
-        text (str): Texto a ser resumido.
-        verbose (bool): Se True, mostra o progresso da geração.
-    Returns:
-        str: Resumo gerado.
+    Monta as mensagens e os parâmetros da requisição de resumo. O texto é
+    reduzido se o prompt passar de max_prompt_tokens.
     """
     system_prompt = """Você é um especialista em avaliação de entrevistas técnicas para desenvolvedores.
 
@@ -38,26 +43,107 @@ def summarize_text(text: str, verbose: bool = False) -> str:
     - Detalhes não técnicos irrelevantes
     """
 
-    response = client.chat.completions.create(
-        model=GROQ_MODEL,
-        messages=[
-            {
-                "role": "system",
-                "content": system_prompt,
-            },
-            {"role": "user", "content": text},
-        ],
-        temperature=0.3,  # Baixa temperatura para respostas mais consistentes
-        max_completion_tokens=1024,
-        top_p=1,
-        stream=True,
-        stop=None,
-    )
+    text, method = fit_to_budget(text, max(max_prompt_tokens - estimate_tokens(system_prompt), 1))
+    token_meter.record_compression("summary", method)
+
+    messages = [
+        {
+            "role": "system",
+            "content": system_prompt,
+        },
+        {"role": "user", "content": text},
+    ]
+    params = {
+        "model": config.GROQ_MODEL,
+        "temperature": 0.3,  # Baixa temperatura para respostas mais consistentes
+        "max_completion_tokens": 1024,
+        "top_p": 1,
+    }
+    return messages, params
+
+
+def summarize_text(
+    text: str, verbose: bool = False, cache: Optional[ResponseCache] = None
+) -> str:
+    """
+    Chama a API do Groq para resumir um texto.
+    Args:
+        text (str): Texto a ser resumido.
+        verbose (bool): Se True, mostra o progresso da geração.
+        cache (ResponseCache): Cache de respostas do LLM (opcional).
+    Returns:
+        str: Resumo gerado.
+    """
+    messages, params = _build_request(text)
+
+    if cache:
+        cached = cache.get(messages, params)
+        if cached is not None:
+            token_meter.record_cached("summary")
+            if verbose:
+                print(cached, end="")
+            return cached
 
-    summary = ""
-    for chunk in response:
-        part = chunk.choices[0].delta.content or ""
-        summary += part
-        if verbose:
-            print(part, end="")
+    with tracer.span("llm_request", stage="summary"):
+        response = chat_completion(
+            messages,
+            **params,
+            stream=True,
+            stop=None,
+        )
+
+        summary = ""
+        for chunk in response:
+            part = chunk.choices[0].delta.content or ""
+            summary += part
+            if verbose:
+                print(part, end="")
+        # Em streaming a API não informa o uso: os tokens são estimados
+        token_meter.record("summary", messages, summary)
+
+    if cache and summary:
+        cache.set(messages, params, summary)
+    return summary
+
+
+async def summarize_text_async(
+    client: AsyncGroqClient, text: str, cache: Optional[ResponseCache] = None
+) -> str:
+    """
+    Versão assíncrona de summarize_text, para resumir muitos textos ao
+    mesmo tempo com um AsyncGroqClient compartilhado.
+    """
+    messages, params = _build_request(text)
+
+    if cache:
+        cached = cache.get(messages, params)
+        if cached is not None:
+            token_meter.record_cached("summary")
+            return cached
+
+    with tracer.span("llm_request", stage="summary"):
+        response = await client.chat_completion(messages, **params, stream=True, stop=None)
+
+        summary = ""
+        async for chunk in response:
+            summary += chunk.choices[0].delta.content or ""
+        token_meter.record("summary", messages, summary)
+
+    if cache and summary:
+        cache.set(messages, params, summary)
     return summary
+
+
+async def summarize_texts_async(
+    client: AsyncGroqClient, texts: List[str], cache: Optional[ResponseCache] = None
+) -> List[str]:
+    """
+    Resume vários textos em paralelo; o cliente controla a concorrência e
+    os limites de taxa.
+
+    Returns:
+        Resumos na mesma ordem de texts
+    """
+    return list(
+        await asyncio.gather(*(summarize_text_async(client, text, cache) for text in texts))
+    )
@@ -0,0 +1,191 @@
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from tracing import tracer
+from .rate_limiter import estimate_tokens
+
+# Hesitações comuns na fala transcrita, que não mudam o conteúdo da resposta
+_FILLERS = re.compile(
+    r"(?<!\w)(?:hu?m+|h[ãa]+m*|ahn+|uhm*|eh+|ah+|é{2,}|né|tipo assim)(?!\w)[,.?!]*\s*",
+    re.IGNORECASE,
+)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"\w+")
+
+
+def remove_fillers(text: str) -> str:
+    """Remove hesitações ("hum", "ahn", "né", ...) e espaços duplicados."""
+    return re.sub(r"\s{2,}", " ", _FILLERS.sub("", text)).strip()
+
+
+def _normalize(word: str) -> str:
+    return "".join(_WORD.findall(word.lower()))
+
+
+def _repetition_at(words: List[str], i: int, max_ngram: int, max_repeats: int) -> Tuple[int, int]:
+    """(tamanho da sequência, repetições) do laço que começa em i, ou (1, 1)."""
+    for n in range(1, max_ngram + 1):
+        chunk = words[i:i + n]
+        if len(chunk) < n:
+            break
+        repeats = 1
+        while words[i + repeats * n:i + (repeats + 1) * n] == chunk:
+            repeats += 1
+        if repeats > max_repeats:
+            return n, repeats
+    return 1, 1
+
+
+def collapse_repetitions(text: str, max_ngram: int = 8, max_repeats: int = 2) -> str:
+    """
+    Remove laços de repetição típicos de alucinação do Whisper ("obrigado.
+    obrigado. obrigado. ..."): uma sequência de até max_ngram palavras
+    repetida mais de max_repeats vezes seguidas fica com uma só cópia.
+    Repetições curtas e naturais ("muito, muito") são mantidas.
+    """
+    words = text.split()
+    normalized = [_normalize(w) for w in words]
+    kept: List[str] = []
+    i = 0
+    while i < len(words):
+        n, repeats = _repetition_at(normalized, i, max_ngram, max_repeats)
+        kept.extend(words[i:i + n])
+        i += n * repeats
+    return " ".join(kept)
+
+
+def extractive_summary(text: str, max_tokens: int) -> str:
+    """
+    Resumo extrativo: mantém as frases com mais palavras frequentes no
+    texto, na ordem original, até max_tokens.
+    """
+    sentences = [s for s in _SENTENCE_END.split(text) if s.strip()]
+    frequencies = Counter(
+        w for w in (_normalize(w) for w in text.split()) if len(w) > 3
+    )
+
+    def score(sentence: str) -> float:
+        words = [_normalize(w) for w in sentence.split()]
+        content = [frequencies[w] for w in words if len(w) > 3]
+        return sum(content) / (len(words) ** 0.5) if words else 0.0
+
+    ranked = sorted(range(len(sentences)), key=lambda i: -score(sentences[i]))
+    chosen, used = set(), 0
+    for index in ranked:
+        cost = estimate_tokens(sentences[index])
+        if used + cost <= max_tokens:
+            chosen.add(index)
+            used += cost
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Corta o texto em uma fronteira de palavra para caber em max_tokens."""
+    limit = max(0, (max_tokens - 1) * 4)
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] + " [...]"
+
+
+def fit_to_budget(text: str, max_tokens: int) -> Tuple[str, Optional[str]]:
+    """
+    Reduz o texto até caber em max_tokens, do passo menos ao mais agressivo:
+    limpeza (hesitações e laços de repetição), resumo extrativo e, por
+    último, corte do texto.
+
+    Returns:
+        Tuple[texto, passo aplicado]. O passo é None se o texto já cabia,
+        ou "cleanup", "extractive" ou "truncated"
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text, None
+
+    text = collapse_repetitions(remove_fillers(text))
+    if estimate_tokens(text) <= max_tokens:
+        return text, "cleanup"
+
+    summary = extractive_summary(text, max_tokens)
+    if summary and estimate_tokens(summary) <= max_tokens:
+        return summary, "extractive"
+
+    return truncate_to_tokens(summary or text, max_tokens), "truncated"
+
+
+def response_usage(response) -> Optional[Tuple[int, int]]:
+    """(tokens do prompt, tokens da saída) informados pela API, se houver."""
+    usage = getattr(response, "usage", None)
+    prompt = getattr(usage, "prompt_tokens", None)
+    completion = getattr(usage, "completion_tokens", None)
+    if isinstance(prompt, int) and isinstance(completion, int):
+        return prompt, completion
+    return None
+
+
+class TokenMeter:
+    def __init__(self):
+        """
+        Contabiliza os tokens gastos em cada etapa (ex: "evaluation",
+        "batch_evaluation", "summary") durante a execução. Usa os valores
+        de usage da API quando disponíveis e a estimativa caso contrário
+        (respostas em streaming).
+        """
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, int]] = {}
+
+    def _stage(self, stage: str) -> Dict[str, int]:
+        return self._stages.setdefault(stage, {
+            "requests": 0,
+            "cached": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "estimated": 0,
+            "compressed": 0,
+        })
+
+    def record_compression(self, stage: str, method: Optional[str]):
+        """Registra um texto reduzido por fit_to_budget (method None é ignorado)."""
+        if method:
+            with self._lock:
+                self._stage(stage)["compressed"] += 1
+
+    def record_cached(self, stage: str):
+        with self._lock:
+            self._stage(stage)["cached"] += 1
+
+    def record(self, stage: str, messages: List[Dict], content: str = "", response=None):
+        """Registra uma requisição feita ao LLM."""
+        usage = response_usage(response)
+        estimated = usage is None
+        if estimated:
+            usage = (
+                sum(estimate_tokens(m["content"]) for m in messages),
+                estimate_tokens(content or ""),
+            )
+        span = tracer.current()
+        span.add("prompt_tokens", usage[0])
+        span.add("completion_tokens", usage[1])
+        span.set("tokens_estimated", estimated)
+        with self._lock:
+            stats = self._stage(stage)
+            stats["requests"] += 1
+            stats["prompt_tokens"] += usage[0]
+            stats["completion_tokens"] += usage[1]
+            stats["estimated"] += int(estimated)
+
+    def report(self) -> Dict[str, Dict[str, int]]:
+        """Cópia dos totais por etapa, com o total de tokens de cada uma."""
+        with self._lock:
+            return {
+                stage: {**stats, "total_tokens": stats["prompt_tokens"] + stats["completion_tokens"]}
+                for stage, stats in sorted(self._stages.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+
+# Medidor compartilhado pelo processo
+token_meter = TokenMeter()
@@ -1,16 +1,130 @@
-import os
-import whisper
 import json
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from workspace import atomic_write_json
+from transcription import model_registry
+from transcription.audio_extractor import SAMPLE_RATE, load_audio, stream_audio
+from transcription.decoding import DECODING_PROFILES, decoding_options, word_error_rate
+from transcription.backends import (
+    TranscriptionBackend,
+    WhisperBackend,
+    create_backend,
+    shift_segment,
+)
+from transcription.segments import SegmentArray
+from transcription.vad import EnergyVAD, SpeechWindow, pack_regions
+
+
+def model_tag(model_size: str, backend: Optional[TranscriptionBackend] = None) -> str:
+    """
+    Identifica o modelo nas chaves de cache e no manifesto. O backend
+    padrão não entra no nome, para manter as entradas já gravadas.
+    """
+    if backend is None or backend.name == WhisperBackend.name:
+        return model_size
+    return f"{backend.key}/{model_size}"
+
+
+def transcript_of(transcription: Dict) -> SegmentArray:
+    """SegmentArray de um resultado de transcrição (só o texto, se não houver segmentos)."""
+    segments = transcription.get("segments")
+    if segments:
+        return SegmentArray.from_segments(segments)
+    return SegmentArray.from_text(transcription["text"])
+
+
+def save_transcription(
+    transcription: Union[str, SegmentArray],
+    output_dir: str,
+    name: str = "transcription",
+) -> str:
+    """
+    Salva a transcrição em um arquivo JSON, de forma atômica. Com um
+    SegmentArray, os tempos são gravados no formato compacto em
+    "segments", ao lado do texto em "transcription".
+    Args:
+        transcription: Texto transcrito ou SegmentArray
+        output_dir: Diretório de saída
+        name: Nome do arquivo, sem extensão (ex: transcription_<vídeo>)
+    Returns:
+        str: Caminho do arquivo salvo
+    """
+    data = {"transcription": transcription}
+    if isinstance(transcription, SegmentArray):
+        compact = transcription.to_dict()
+        data = {"transcription": compact.pop("text"), "segments": compact}
+    output_path = os.path.join(output_dir, f"{name}.json")
+    return atomic_write_json(output_path, data, indent=None)
+
 
 class Transcriber:
-    def __init__(self, model_size: str = "small"):
+    def __init__(
+        self,
+        model_size: str = "small",
+        device: Optional[str] = None,
+        model=None,
+        replica: int = 0,
+        decode_options: Optional[Dict] = None,
+        backend: Union[TranscriptionBackend, str, None] = None,
+    ):
         """
-        Inicializa o modelo Whisper para transcrição.
+        Inicializa o transcritor. O modelo Whisper é obtido do registro do
+        processo apenas no primeiro uso, e pode ser compartilhado entre
+        várias instâncias.
         Args:
             model_size: Tamanho do modelo (tiny, base, small, medium, large)
+            device: Dispositivo do torch (ex: "cpu", "cuda"). None = automático
+            model: Modelo já carregado (opcional). Se informado, é usado diretamente
+            replica: Réplica do modelo no registro (uma por worker paralelo)
+            decode_options: Opções repassadas ao transcribe do backend
+                (ver transcription.decoding.decoding_options)
+            backend: Motor de transcrição, ou seu nome (padrão: openai-whisper)
+        """
+        self.model_size = model_size
+        self.device = device
+        self.replica = replica
+        self.decode_options = decode_options or {}
+        if isinstance(backend, str):
+            backend = create_backend(backend)
+        self.backend = backend or WhisperBackend()
+        self._model = model
+
+    @property
+    def model_tag(self) -> str:
+        """Modelo e backend, usado nas chaves de cache (ver model_tag())."""
+        return model_tag(self.model_size, self.backend)
+
+    @property
+    def model(self):
+        """Modelo Whisper, carregado (ou obtido do registro) no primeiro acesso."""
+        if self._model is None:
+            self._model = model_registry.get_model(
+                self.model_size, self.device, self.replica, self.backend
+            )
+        return self._model
+
+    def release(self):
+        """
+        Libera o modelo desta instância e o remove do registro do processo.
+        Um novo acesso a `model` recarrega os pesos.
+        """
+        self._model = None
+        model_registry.release_model(
+            self.model_size, self.device, self.replica, self.backend
+        )
+
+    def options_for(self, language: Optional[str] = None) -> Dict:
         """
-        print("Carregando modelo de transcrição...")
-        self.model = whisper.load_model(model_size)
+        Opções de decodificação de um áudio. O idioma informado (ex: o da
+        vaga) substitui o padrão e dispensa a detecção de idioma do Whisper.
+        """
+        if not language:
+            return self.decode_options
+        return {**self.decode_options, "language": language}
 
     def clean_transcription(self, segments) -> str:
         """
@@ -19,32 +133,222 @@ class Transcriber:
         """
         return " ".join(segment["text"].strip() for segment in segments)
 
-    def transcribe(self, audio_path: str) -> str:
+    def transcribe_with_segments(
+        self, audio: Union[str, np.ndarray], language: Optional[str] = None
+    ) -> Dict:
         """
-        Transcreve um arquivo de áudio para texto.
+        Transcreve um áudio mantendo os segmentos com seus tempos.
         Args:
-            audio_path: Caminho do arquivo de áudio
+            audio: Caminho do arquivo de áudio, ou amostras float32 mono em
+                16 kHz (ver audio_extractor.load_audio)
+            language: Idioma do áudio (None = o de decode_options, ou detecção)
         Returns:
-            str: Texto transcrito
+            dict: {"text": texto limpo, "segments": [{"start", "end", "text"}]}
         """
         print("Transcrevendo áudio (pode levar alguns minutos)...")
-        result = self.model.transcribe(audio_path)
-        
-        # Retorna apenas o texto limpo
-        return self.clean_transcription(result["segments"])
+        segments = self.backend.transcribe(self.model, audio, **self.options_for(language))
+        return {"text": self.clean_transcription(segments), "segments": segments}
+
+    def transcribe(
+        self, audio: Union[str, np.ndarray], language: Optional[str] = None
+    ) -> SegmentArray:
+        """
+        Transcreve um áudio mantendo os tempos dos segmentos (e das palavras,
+        com decode_options={"word_timestamps": True}).
+        Args:
+            audio: Caminho do arquivo de áudio, ou amostras float32 mono em
+                16 kHz (ver audio_extractor.load_audio)
+            language: Idioma do áudio (None = o de decode_options, ou detecção)
+        Returns:
+            SegmentArray: Transcrição compacta; o texto limpo está em `.text`
+        """
+        result = self.transcribe_with_segments(audio, language)
+        return SegmentArray.from_segments(result["segments"])
 
-    def save_transcription(self, transcription: str, output_dir: str) -> str:
+    def transcribe_stream(
+        self,
+        source: Union[str, Iterable[np.ndarray]],
+        vad: Optional[EnergyVAD] = None,
+        window_seconds: float = 30.0,
+        language: Optional[str] = None,
+    ) -> Iterator[Dict]:
         """
-        Salva a transcrição em um arquivo JSON.
+        Transcreve gravações longas em streaming: o áudio é lido em blocos,
+        os silêncios são descartados pelo VAD e apenas as regiões de fala,
+        agrupadas em janelas de até window_seconds, passam pelo Whisper.
+        O uso de memória não cresce com a duração da gravação.
         Args:
-            transcription: Texto transcrito
-            output_dir: Diretório de saída
+            source: Caminho do vídeo/áudio, ou iterável de blocos float32 mono em 16 kHz
+            vad: Detector de voz (padrão: EnergyVAD com valores padrão)
+            window_seconds: Duração máxima de áudio enviada ao Whisper por vez
+            language: Idioma da gravação (None = o de decode_options, ou detecção)
+        Yields:
+            dict: Segmentos {"start", "end", "text"} com tempos absolutos na gravação
+        """
+        vad = vad or EnergyVAD(max_region_seconds=window_seconds)
+        chunks = stream_audio(source, window_seconds) if isinstance(source, str) else source
+        options = self.options_for(language)
+
+        for window in pack_regions(vad.iter_regions(chunks), max_seconds=window_seconds):
+            for segment in self.backend.transcribe(self.model, window.audio, **options):
+                if segment["text"]:
+                    yield shift_segment(segment, window)
+
+    def transcribe_streaming(
+        self,
+        source: Union[str, Iterable[np.ndarray]],
+        vad: Optional[EnergyVAD] = None,
+        language: Optional[str] = None,
+    ) -> Dict:
+        """
+        Consome transcribe_stream e retorna o resultado completo, no mesmo
+        formato de transcribe_with_segments.
+        """
+        print("Transcrevendo áudio em streaming (regiões de fala)...")
+        segments = list(self.transcribe_stream(source, vad, language=language))
+        return {"text": self.clean_transcription(segments), "segments": segments}
+
+    def _decode_windows(
+        self, windows: List[SpeechWindow], language: Optional[str] = None
+    ) -> List[List[Dict]]:
+        """Transcreve um lote de janelas pelo backend (tempos absolutos)."""
+        return self.backend.decode_windows(self.model, windows, **self.options_for(language))
+
+    def transcribe_batch(
+        self,
+        audios: Sequence[Union[str, np.ndarray]],
+        batch_size: int = 8,
+        vad: Optional[EnergyVAD] = None,
+        language: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Transcreve vários áudios curtos (ex: respostas _qN) decodificando
+        janelas de vários deles juntas, em vez de um model.transcribe por
+        áudio. Cada áudio é dividido pelo VAD em janelas de até 30 s, sem
+        os silêncios.
+
+        Diferente de model.transcribe, o lote não refaz a decodificação com
+        outras temperaturas quando o resultado é ruim.
+        Args:
+            audios: Caminhos de áudio/vídeo, ou amostras float32 mono em 16 kHz
+            batch_size: Janelas de 30 s decodificadas por vez
+            vad: Detector de voz (padrão: EnergyVAD com valores padrão)
+            language: Idioma de todos os áudios do lote (None = o de
+                decode_options, ou detecção)
         Returns:
-            str: Caminho do arquivo salvo
-        """
-        output_path = os.path.join(output_dir, "transcription.json")
-        
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump({"transcription": transcription}, f, ensure_ascii=False, indent=2)
-            
-        return output_path
+            list: Um resultado por áudio, na ordem de entrada, no formato de
+                transcribe_with_segments
+        """
+        vad = vad or EnergyVAD()
+        windows: List[Tuple[int, SpeechWindow]] = []
+        for index, audio in enumerate(audios):
+            samples = load_audio(audio) if isinstance(audio, str) else audio
+            regions = vad.iter_regions([samples])
+            windows.extend((index, window) for window in pack_regions(regions))
+
+        print(f"Transcrevendo {len(audios)} áudio(s) em lote ({len(windows)} janela(s))...")
+        segments: List[List[Dict]] = [[] for _ in audios]
+        for offset in range(0, len(windows), batch_size):
+            batch = windows[offset:offset + batch_size]
+            decoded = self._decode_windows([window for _, window in batch], language=language)
+            for (index, _), window_segments in zip(batch, decoded):
+                segments[index].extend(window_segments)
+
+        return [
+            {"text": self.clean_transcription(clip_segments), "segments": clip_segments}
+            for clip_segments in segments
+        ]
+
+    def save_transcription(
+        self,
+        transcription: Union[str, SegmentArray],
+        output_dir: str,
+        name: str = "transcription",
+    ) -> str:
+        """Salva a transcrição em JSON (ver save_transcription)."""
+        return save_transcription(transcription, output_dir, name)
+
+    @staticmethod
+    def load_transcription(path: str) -> SegmentArray:
+        """Lê um arquivo gravado por save_transcription."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if "segments" not in data:
+            return SegmentArray.from_text(data["transcription"])
+        return SegmentArray.from_dict({"text": data["transcription"], **data["segments"]})
+
+
+def measure_throughput(
+    transcriber: Transcriber, audios: Sequence[np.ndarray], batch_size: int = 8
+) -> Dict:
+    """
+    Compara a transcrição um a um com a transcrição em lote, em segundos de
+    áudio processados por segundo de relógio.
+    Args:
+        transcriber: Transcriber já configurado
+        audios: Amostras float32 mono em 16 kHz
+        batch_size: Tamanho do lote usado em transcribe_batch
+    Returns:
+        dict: {"audio_seconds", "sequential", "batched", "speedup"}, com a
+            vazão de cada modo em segundos de áudio por segundo
+    """
+    audio_seconds = sum(len(audio) for audio in audios) / SAMPLE_RATE
+    transcriber.model  # carrega o modelo fora da medição
+
+    start = time.perf_counter()
+    for audio in audios:
+        transcriber.transcribe_with_segments(audio)
+    sequential = audio_seconds / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    transcriber.transcribe_batch(audios, batch_size=batch_size)
+    batched = audio_seconds / (time.perf_counter() - start)
+
+    return {
+        "audio_seconds": audio_seconds,
+        "sequential": sequential,
+        "batched": batched,
+        "speedup": batched / sequential,
+    }
+
+
+def compare_profiles(
+    transcriber: Transcriber,
+    audios: Sequence[np.ndarray],
+    references: Optional[Sequence[str]] = None,
+    profiles: Sequence[str] = tuple(DECODING_PROFILES),
+    language: Optional[str] = None,
+) -> Dict[str, Dict]:
+    """
+    Compara os perfis de decodificação com o mesmo modelo: vazão e, se as
+    transcrições de referência forem informadas, taxa de erro por palavra.
+    Args:
+        transcriber: Transcriber cujo modelo e backend são usados
+        audios: Amostras float32 mono em 16 kHz
+        references: Texto correto de cada áudio (opcional)
+        profiles: Perfis comparados
+        language: Idioma dos áudios (None = detecção automática)
+    Returns:
+        dict: {perfil: {"audio_seconds_per_second", "wer"}}; "wer" é a
+            média dos áudios e só aparece com references
+    """
+    audio_seconds = sum(len(audio) for audio in audios) / SAMPLE_RATE
+    model = transcriber.model  # carrega o modelo fora da medição
+
+    report = {}
+    for profile in profiles:
+        candidate = Transcriber(
+            transcriber.model_size,
+            model=model,
+            backend=transcriber.backend,
+            decode_options=decoding_options(profile, language=language),
+        )
+        start = time.perf_counter()
+        texts = [candidate.transcribe_with_segments(audio)["text"] for audio in audios]
+        elapsed = time.perf_counter() - start
+
+        report[profile] = {"audio_seconds_per_second": round(audio_seconds / elapsed, 3)}
+        if references:
+            errors = [word_error_rate(ref, text) for ref, text in zip(references, texts)]
+            report[profile]["wer"] = round(sum(errors) / len(errors), 4)
+    return report
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+from workspace import atomic_write_json
+
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Calcula o SHA-256 do conteúdo de um arquivo, lendo em blocos."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TranscriptionCache:
+    def __init__(self, cache_dir: str, max_bytes: int = 500 * 1024 * 1024):
+        """
+        Cache em disco de transcrições, endereçado pelo conteúdo.
+
+        Cada entrada é um JSON nomeado pelo hash de (conteúdo do vídeo,
+        tamanho do modelo, opções de decodificação). O horário de
+        modificação do arquivo marca o último acesso, e as entradas menos
+        usadas são removidas quando o cache passa de max_bytes.
+
+        Args:
+            cache_dir: Diretório onde as entradas são gravadas
+            max_bytes: Tamanho máximo do cache em bytes
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(content_hash: str, model_size: str, options: Optional[Dict] = None) -> str:
+        """Gera a chave da entrada a partir do conteúdo e dos parâmetros do Whisper."""
+        payload = json.dumps(
+            {"content": content_hash, "model": model_size, "options": options or {}},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Retorna a entrada salva para a chave, ou None se não existir.
+        Um acerto atualiza a posição da entrada na ordem LRU.
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Entrada inválida no cache de transcrições, ignorando: {str(e)}")
+            return None
+
+    def put(self, key: str, data: Dict):
+        """Grava a entrada de forma atômica e aplica o limite de tamanho."""
+        atomic_write_json(self._entry_path(key), data, indent=None)
+        self.evict()
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self) -> int:
+        """Tamanho total ocupado pelas entradas, em bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> int:
+        """
+        Remove as entradas usadas há mais tempo até o cache caber em max_bytes.
+        Retorna o número de entradas removidas.
+        """
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+            return removed
+
+    def purge(self) -> int:
+        """Remove todas as entradas do cache. Retorna quantas foram removidas."""
+        with self._lock:
+            entries = self._entries()
+            for _, _, path in entries:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            return len(entries)
@@ -0,0 +1,163 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from transcription.audio_extractor import SAMPLE_RATE
+
+
+@dataclass
+class SpeechWindow:
+    """
+    Trecho de áudio com fala enviado ao Whisper de uma vez. Pode juntar
+    várias regiões de fala separadas por silêncio removido; `pieces`
+    guarda onde cada uma estava na gravação original.
+    """
+    audio: np.ndarray
+    # (início absoluto em s, início dentro da janela em s, duração em s)
+    pieces: List[Tuple[float, float, float]] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        return len(self.audio) / SAMPLE_RATE
+
+    def to_absolute(self, t: float, end: bool = False) -> float:
+        """
+        Converte um tempo relativo à janela para o tempo na gravação original.
+        Na fronteira entre duas regiões, um início pertence à região seguinte
+        e um fim (end=True) à anterior.
+        """
+        for absolute_start, window_start, duration in self.pieces:
+            boundary = window_start + duration
+            if t < boundary or (end and t <= boundary):
+                return absolute_start + max(0.0, t - window_start)
+        absolute_start, window_start, duration = self.pieces[-1]
+        return absolute_start + duration
+
+
+class EnergyVAD:
+    def __init__(
+        self,
+        threshold_db: float = -40.0,
+        frame_ms: int = 30,
+        min_silence_ms: int = 600,
+        min_speech_ms: int = 250,
+        padding_ms: int = 200,
+        max_region_seconds: float = 30.0,
+        sample_rate: int = SAMPLE_RATE,
+    ):
+        """
+        Detector de atividade de voz baseado em energia.
+
+        Um quadro é considerado fala quando sua energia RMS passa de
+        threshold_db (dBFS). Regiões de fala terminam após min_silence_ms de
+        silêncio e recebem padding_ms de margem nas bordas.
+
+        Args:
+            threshold_db: Limiar de energia em dBFS
+            frame_ms: Duração de cada quadro analisado
+            min_silence_ms: Silêncio necessário para encerrar uma região
+            min_speech_ms: Regiões mais curtas são descartadas (ruídos, cliques)
+            padding_ms: Margem mantida antes e depois da fala
+            max_region_seconds: Regiões mais longas são cortadas neste tamanho
+            sample_rate: Taxa de amostragem do áudio
+        """
+        self.threshold_db = threshold_db
+        self.sample_rate = sample_rate
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.min_silence_frames = max(1, min_silence_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.padding_frames = padding_ms // frame_ms
+        self.max_region_frames = max(1, int(max_region_seconds * 1000) // frame_ms)
+
+    def is_speech(self, frame: np.ndarray) -> bool:
+        rms = np.sqrt(np.mean(np.square(frame, dtype=np.float64)))
+        return 20 * np.log10(max(rms, 1e-10)) > self.threshold_db
+
+    def iter_regions(self, chunks: Iterable[np.ndarray]) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Percorre o áudio em blocos e gera as regiões de fala como
+        (amostra inicial absoluta, amostras). Apenas a região atual fica em
+        memória, então o consumo não depende da duração da gravação.
+        """
+        frame_length = self.frame_length
+        preroll = deque(maxlen=self.padding_frames or None)
+        region: List[np.ndarray] = []
+        region_start = 0
+        speech_frames = 0
+        silence_run = 0
+        position = 0  # índice absoluto da próxima amostra
+        leftover = np.zeros(0, dtype=np.float32)
+
+        def finish():
+            # Mantém apenas padding_frames do silêncio final
+            keep = len(region) - max(0, silence_run - self.padding_frames)
+            samples = np.concatenate(region[:keep])
+            return region_start, samples
+
+        for chunk in chunks:
+            buffer = np.concatenate([leftover, chunk]) if len(leftover) else chunk
+            usable = len(buffer) - len(buffer) % frame_length
+            leftover = buffer[usable:]
+
+            for offset in range(0, usable, frame_length):
+                frame = buffer[offset:offset + frame_length]
+                speech = self.is_speech(frame)
+
+                if not region:
+                    if speech:
+                        region = list(preroll) + [frame]
+                        region_start = position - len(preroll) * frame_length
+                        preroll.clear()
+                        speech_frames, silence_run = 1, 0
+                    elif self.padding_frames:
+                        preroll.append(frame)
+                else:
+                    region.append(frame)
+                    if speech:
+                        speech_frames += 1
+                        silence_run = 0
+                    else:
+                        silence_run += 1
+
+                    if silence_run >= self.min_silence_frames:
+                        if speech_frames >= self.min_speech_frames:
+                            yield finish()
+                        region, speech_frames, silence_run = [], 0, 0
+                    elif len(region) >= self.max_region_frames:
+                        # Corta a região longa; a fala seguinte abre uma nova
+                        yield finish()
+                        region, speech_frames, silence_run = [], 0, 0
+                        preroll.clear()
+
+                position += frame_length
+
+        if region and speech_frames >= self.min_speech_frames:
+            yield finish()
+
+
+def pack_regions(
+    regions: Iterable[Tuple[int, np.ndarray]],
+    max_seconds: float = 30.0,
+    sample_rate: int = SAMPLE_RATE,
+) -> Iterator[SpeechWindow]:
+    """
+    Junta regiões de fala consecutivas em janelas de até max_seconds, para
+    que o Whisper processe janelas cheias em vez de muitos trechos curtos.
+    """
+    max_samples = int(max_seconds * sample_rate)
+    parts: List[np.ndarray] = []
+    pieces: List[Tuple[float, float, float]] = []
+    size = 0
+
+    for start, samples in regions:
+        if parts and size + len(samples) > max_samples:
+            yield SpeechWindow(np.concatenate(parts), pieces)
+            parts, pieces, size = [], [], 0
+        pieces.append((start / sample_rate, size / sample_rate, len(samples) / sample_rate))
+        parts.append(samples)
+        size += len(samples)
+
+    if parts:
+        yield SpeechWindow(np.concatenate(parts), pieces)
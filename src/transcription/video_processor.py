@@ -1,11 +1,31 @@
 import os
-import json
-from transcription.audio_extractor import extract_audio
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from transcription.audio_extractor import extract_audio, load_audio
+from transcription.fingerprint import FingerprintIndex, audio_fingerprint
 from transcription.frame_capture import capture_frames
-from transcription.transcriber import Transcriber
+from transcription.transcriber import Transcriber, transcript_of
+from transcription.transcription_cache import TranscriptionCache, hash_file
+from transcription.vad import EnergyVAD
+from tracing import tracer
+from workspace import create_work_dir, video_stem
 
 class VideoProcessor:
-    def __init__(self, input_path: str, output_dir: str, model_size: str = "small"):
+    def __init__(
+        self,
+        input_path: str,
+        output_dir: str,
+        model_size: str = "small",
+        transcriber: Optional[Transcriber] = None,
+        model=None,
+        cache: Optional[TranscriptionCache] = None,
+        vad: Optional[EnergyVAD] = None,
+        frame_options: Optional[Dict] = None,
+        work_root: Optional[str] = None,
+        language: Optional[str] = None,
+        fingerprints: Optional[FingerprintIndex] = None,
+    ):
         """
         Inicializa o processador de vídeo.
 
@@ -13,46 +33,183 @@ class VideoProcessor:
             input_path: Caminho do arquivo de vídeo
             output_dir: Diretório para salvar os resultados
             model_size: Tamanho do modelo de transcrição
+            transcriber: Transcriber já criado, para reaproveitar entre vídeos
+            model: Modelo Whisper já carregado (usado se transcriber não for informado)
+            cache: Cache de transcrições (opcional). Se informado, vídeos já
+                transcritos com o mesmo modelo e opções não passam pelo Whisper
+            vad: Detector de voz usado no modo streaming (process_video(stream=True))
+            frame_options: Opções repassadas a capture_frames (intervalo, modo, largura...)
+            work_root: Onde criar o diretório de trabalho exclusivo do vídeo
+                (padrão: output_dir/.work)
+            language: Idioma da entrevista (ex: o da vaga, em job_language).
+                None = o padrão do transcriber, ou detecção automática
+            fingerprints: Índice de impressões digitais do áudio (requer cache).
+                Um reenvio do mesmo áudio em outro contêiner ou codificação
+                reaproveita a transcrição já feita
         """
         self.input_path = input_path
         self.output_dir = output_dir
-        self.transcriber = Transcriber(model_size)
+        self.transcriber = transcriber or Transcriber(model_size, model=model)
+        self.cache = cache
+        self.vad = vad
+        self.frame_options = frame_options or {}
+        self.work_root = work_root or os.path.join(output_dir, ".work")
+        self.language = language
+        self.fingerprints = fingerprints if cache is not None else None
+        # Vídeo já processado com o mesmo áudio (ver fingerprints)
+        self.duplicate_of: Optional[str] = None
+        self._content_hash: Optional[str] = None
+        # Prefixo dos artefatos, para vários vídeos compartilharem output_dir
+        self.stem = video_stem(input_path)
 
-    def process_video(self, capture: bool = False) -> dict:
+    @property
+    def content_hash(self) -> str:
+        if self._content_hash is None:
+            self._content_hash = hash_file(self.input_path)
+        return self._content_hash
+
+    def cache_key(self, stream: bool = False, content_hash: Optional[str] = None) -> str:
+        """
+        Chave do vídeo no cache: conteúdo + modelo + opções de decodificação.
+        content_hash permite montar a chave de outro arquivo com o mesmo áudio.
+        """
+        options = dict(self.transcriber.options_for(self.language))
+        if stream:
+            # O modo streaming descarta silêncios e produz segmentos diferentes
+            options["streaming_vad"] = vars(self.vad) if self.vad else True
+        return TranscriptionCache.make_key(
+            content_hash or self.content_hash, self.transcriber.model_tag, options
+        )
+
+    def process_video(
+        self, capture: bool = False, audio_file: bool = False, stream: bool = False
+    ) -> dict:
         """
         Processa o vídeo completo: extrai áudio, transcreve e opcionalmente captura frames.
 
         Args:
-            capture_frames: Se True, também captura frames do vídeo
+            capture: Se True, também captura frames do vídeo
+            audio_file: Se True, extrai o áudio para um arquivo temporário
+                (modo de depuração) em vez de decodificá-lo em memória
+            stream: Se True, lê o áudio em blocos e transcreve apenas as
+                regiões de fala (indicado para gravações longas)
 
         Returns:
             dict: Resultado do processamento com caminhos dos arquivos gerados
         """
-        # Extrai o áudio
-        audio_path = extract_audio(self.input_path, self.output_dir)
-        
+        # A captura de frames roda em paralelo com a extração e a transcrição
+        with tracer.span("video_processing", trace=self.stem) as span:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                frames = None
+                if capture:
+                    frames = executor.submit(self._capture_frames)
+
+                transcription, cached = self._transcribe(audio_file, stream)
+                span.set("cached", cached)
+                return self._build_result(transcription, frames, cached)
+
+    def _capture_frames(self) -> list:
+        options = {"prefix": f"{self.stem}_", **self.frame_options}
+        mode = options.get("mode", "interval")
+        with tracer.span("capture_frames", trace=self.stem, mode=mode) as span:
+            frames = capture_frames(self.input_path, self.output_dir, **options)
+            span.set("frames", len(frames))
+            return frames
+
+    def _transcribe(self, audio_file: bool, stream: bool) -> Tuple[dict, bool]:
+        """Obtém a transcrição do cache ou do Whisper. Retorna (transcrição, veio_do_cache)."""
+        cache_key = self.cache_key(stream) if self.cache else None
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached:
+            print("Transcrição encontrada no cache.")
+            return cached, True
+
+        if stream:
+            with tracer.span("transcribe", streaming=True):
+                transcription = self.transcriber.transcribe_streaming(
+                    self.input_path, self.vad, language=self.language
+                )
+            if self.cache:
+                self.cache.put(cache_key, transcription)
+            return transcription, False
+
+        # Extrai o áudio (no modo arquivo, em um diretório exclusivo do vídeo)
+        work_dir = None
+        with tracer.span("extract_audio", audio_file=audio_file):
+            if audio_file:
+                work_dir = create_work_dir(self.work_root, self.input_path)
+                audio = extract_audio(self.input_path, work_dir)
+            else:
+                audio = load_audio(self.input_path)
+
         try:
+            fingerprint = None
+            if self.fingerprints is not None:
+                fingerprint = self._fingerprint(audio)
+                duplicate = self._reuse_duplicate(fingerprint, cache_key)
+                if duplicate:
+                    return duplicate, True
+
             # Transcreve o áudio
-            transcription = self.transcriber.transcribe(audio_path)
-            
-            # Salva a transcrição
-            transcription_path = self.transcriber.save_transcription(
-                transcription, self.output_dir
-            )
-
-            result = {
-                "transcription_path": transcription_path,
-                "transcription": transcription,  # Inclui a transcrição diretamente
-                "frames": None
-            }
-
-            # Captura frames se solicitado
-            if capture:
-                result["frames"] = capture_frames(self.input_path, self.output_dir)
-
-            return result
-            
+            with tracer.span("transcribe", model=self.transcriber.model_tag):
+                transcription = self.transcriber.transcribe_with_segments(
+                    audio, language=self.language
+                )
+            if self.cache:
+                self.cache.put(cache_key, transcription)
+            if fingerprint is not None:
+                self.fingerprints.add(self.content_hash, self.stem, fingerprint)
+            return transcription, False
+
         finally:
-            # Limpa o arquivo de áudio temporário
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
+            # Limpa o diretório de trabalho com o áudio temporário
+            if work_dir:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _fingerprint(self, audio):
+        """Impressão digital do áudio decodificado (no modo arquivo, lê o áudio extraído)."""
+        with tracer.span("fingerprint") as span:
+            samples = load_audio(audio) if isinstance(audio, str) else audio
+            fingerprint = audio_fingerprint(samples)
+            span.set("frames", len(fingerprint))
+            return fingerprint
+
+    def _reuse_duplicate(self, fingerprint, cache_key: str) -> Optional[dict]:
+        """Transcrição de um vídeo já processado com o mesmo áudio, se houver."""
+        match = self.fingerprints.find(fingerprint, exclude=self.content_hash)
+        if not match:
+            return None
+        transcription = self.cache.get(self.cache_key(content_hash=match.content_hash))
+        if not transcription:
+            return None  # transcrito com outro modelo/opções ou removido do cache
+
+        print(
+            f"Áudio igual ao de {match.video} (semelhança {match.similarity:.2f}): "
+            "transcrição reaproveitada."
+        )
+        self.cache.put(cache_key, transcription)
+        self.fingerprints.add(self.content_hash, self.stem, fingerprint)
+        self.duplicate_of = match.video
+        tracer.current().set("duplicate_of", match.video)
+        return transcription
+
+    def _build_result(
+        self, transcription: dict, frames: Optional[Future], cached: bool
+    ) -> dict:
+        # Salva a transcrição com os tempos dos segmentos
+        segments = transcription.get("segments")
+        transcript = transcript_of(transcription)
+        transcription_path = self.transcriber.save_transcription(
+            transcript, self.output_dir, name=f"transcription_{self.stem}"
+        )
+
+        return {
+            "transcription_path": transcription_path,
+            "transcription": transcription["text"],  # Inclui a transcrição diretamente
+            "segments": segments,
+            "transcript": transcript,
+            "cached": cached,
+            "duplicate_of": self.duplicate_of,
+            # Aguarda a captura de frames iniciada junto com a transcrição
+            "frames": frames.result() if frames else None
+        }
@@ -0,0 +1,166 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from transcription.transcription_cache import hash_file
+from workspace import atomic_write_json
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov")
+
+
+class Manifest:
+    def __init__(self, path: str):
+        """
+        Registro dos vídeos já processados: caminho, tamanho, mtime, hash do
+        conteúdo e modelo usado. Um vídeo só é reprocessado se o conteúdo
+        ou o modelo mudar.
+
+        Args:
+            path: Arquivo JSON do manifesto
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Manifesto inválido, todos os vídeos serão processados: {str(e)}")
+
+    def is_processed(self, video_path: str, model: str) -> bool:
+        """
+        Verifica se o vídeo já foi processado com este modelo. Tamanho e
+        mtime iguais evitam recalcular o hash; se só o mtime mudou (cópia,
+        touch), o hash decide.
+        """
+        entry = self._entries.get(os.path.abspath(video_path))
+        if not entry or entry["model"] != model:
+            return False
+
+        stat = os.stat(video_path)
+        if entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return True
+        if entry["size"] != stat.st_size or entry["hash"] != hash_file(video_path):
+            return False
+
+        self.record(video_path, model, entry["hash"])
+        return True
+
+    def record(self, video_path: str, model: str, content_hash: Optional[str] = None):
+        """Registra o vídeo como processado e grava o manifesto."""
+        stat = os.stat(video_path)
+        with self._lock:
+            self._entries[os.path.abspath(video_path)] = {
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "hash": content_hash or hash_file(video_path),
+                "model": model,
+            }
+            atomic_write_json(self.path, self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class InputWatcher:
+    def __init__(
+        self,
+        input_dir: str,
+        settle_seconds: float = 3.0,
+        poll_interval: float = 2.0,
+        extensions: Tuple[str, ...] = VIDEO_EXTENSIONS,
+    ):
+        """
+        Observa a pasta de entrada e informa os vídeos prontos para
+        processamento. Um arquivo só fica pronto depois que tamanho e mtime
+        ficam estáveis por settle_seconds (upload ou cópia concluídos).
+
+        Com o pacote inotify_simple instalado (Linux), a espera acorda assim
+        que a pasta muda; sem ele, a pasta é consultada a cada poll_interval.
+
+        Args:
+            input_dir: Pasta observada
+            settle_seconds: Tempo sem alterações para considerar o arquivo completo
+            poll_interval: Intervalo máximo entre varreduras
+            extensions: Extensões de vídeo aceitas
+        """
+        self.input_dir = input_dir
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.extensions = extensions
+        # caminho -> (tamanho, mtime, instante em que foi visto assim pela primeira vez)
+        self._seen: Dict[str, Tuple[int, float, float]] = {}
+        self._inotify = self._create_inotify()
+
+    def _create_inotify(self):
+        try:
+            from inotify_simple import INotify, flags
+        except ImportError:
+            return None
+        inotify = INotify()
+        inotify.add_watch(
+            self.input_dir, flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE | flags.MODIFY
+        )
+        return inotify
+
+    def scan(self, now: Optional[float] = None) -> List[str]:
+        """Retorna os vídeos da pasta cujo conteúdo está estável."""
+        now = time.time() if now is None else now
+        ready = []
+        current = {}
+        for name in sorted(os.listdir(self.input_dir)):
+            if not name.endswith(self.extensions):
+                continue
+            path = os.path.join(self.input_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+
+            size, mtime, since = self._seen.get(path, (None, None, now))
+            if (size, mtime) != (stat.st_size, stat.st_mtime):
+                since = now
+            current[path] = (stat.st_size, stat.st_mtime, since)
+            if now - since >= self.settle_seconds:
+                ready.append(path)
+
+        self._seen = current
+        return ready
+
+    def mtime(self, path: str) -> Optional[float]:
+        """mtime do arquivo na última varredura."""
+        seen = self._seen.get(path)
+        return seen[1] if seen else None
+
+    def wait(self):
+        """Aguarda a próxima varredura (ou um evento do inotify, se disponível)."""
+        if self._inotify is not None:
+            self._inotify.read(timeout=int(self.poll_interval * 1000))
+        else:
+            time.sleep(self.poll_interval)
+
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+
+
+def pending_videos(
+    watcher: InputWatcher, manifest: Manifest, model: str, failed: Dict[str, float]
+) -> List[str]:
+    """
+    Vídeos prontos da varredura que ainda precisam ser processados: fora do
+    manifesto e sem falha anterior com o mesmo mtime. Arquivos removidos ou
+    renomeados depois da varredura são ignorados.
+    """
+    pending = []
+    for path in watcher.scan():
+        try:
+            if failed.get(path) != watcher.mtime(path) and not manifest.is_processed(path, model):
+                pending.append(path)
+        except FileNotFoundError:
+            continue
+    return pending
@@ -0,0 +1,68 @@
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# umask do processo, lida uma vez na importação (os.umask só pode ser
+# consultado alterando o valor, o que não é seguro com várias threads)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def video_stem(video_path: str) -> str:
+    """Nome do vídeo sem diretório e extensão, usado para prefixar os artefatos."""
+    return os.path.splitext(os.path.basename(video_path))[0]
+
+
+def create_work_dir(root: str, video_path: str) -> str:
+    """
+    Cria um diretório de trabalho exclusivo para o vídeo dentro de root.
+    O nome é único mesmo que o mesmo vídeo seja processado por dois
+    workers ao mesmo tempo. root pode apontar para um tmpfs (ex: /dev/shm).
+    """
+    os.makedirs(root, exist_ok=True)
+    return tempfile.mkdtemp(prefix=f"{video_stem(video_path)}_", dir=root)
+
+
+@contextmanager
+def work_dir(root: str, video_path: str) -> Iterator[str]:
+    """Diretório de trabalho do vídeo, removido ao final do bloco."""
+    path = create_work_dir(root, video_path)
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def shared_file_mode(path: str) -> int:
+    """
+    Permissões para gravar path: as do arquivo existente ou, para um arquivo
+    novo, as de um open() comum (0o666 sem a umask). mkstemp cria os
+    temporários com 0o600, o que deixaria o arquivo legível só pelo usuário
+    que o gravou, mesmo com outros workers compartilhando o diretório.
+    """
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def atomic_write_json(path: str, data, indent: Optional[int] = 2) -> str:
+    """
+    Grava JSON de forma atômica: escreve em um arquivo temporário no mesmo
+    diretório e o renomeia sobre o destino. Leitores nunca veem um arquivo
+    pela metade, e vários workers podem compartilhar o mesmo diretório.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+        os.chmod(tmp_path, shared_file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
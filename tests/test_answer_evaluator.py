@@ -0,0 +1,172 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from evaluation.answer_evaluator import AnswerEvaluator, BatchItem, EvaluationResult
+from transcription.groq_client import BackgroundAsyncClient
+from transcription.rate_limiter import RateLimiter
+
+
+def completion(content, chunk_size=8):
+    """Resposta do chat que funciona com e sem streaming."""
+    response = MagicMock()
+    response.choices[0].message.content = content
+    chunks = []
+    for start in range(0, len(content), chunk_size):
+        chunk = MagicMock()
+        chunk.choices[0].delta.content = content[start:start + chunk_size]
+        chunks.append(chunk)
+    response.__iter__.side_effect = lambda: iter(chunks)
+    return response
+
+
+def items(count, answer="resposta"):
+    return [
+        BatchItem(
+            question_index=i,
+            transcribed_answer=answer,
+            question=f"Pergunta {i}?",
+            expected_answer=f"Esperada {i}",
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+@patch("evaluation.answer_evaluator.chat_completion")
+def test_evaluate_answers_sends_one_request(mock_chat):
+    mock_chat.return_value = completion(json.dumps([
+        {"question_index": 1, "score": 7, "feedback": "bom"},
+        {"question_index": 2, "score": 4.5, "feedback": "fraco"},
+    ]))
+
+    results = AnswerEvaluator().evaluate_answers(items(2))
+
+    assert mock_chat.call_count == 1
+    assert results == {
+        1: EvaluationResult(score=7.0, feedback="bom"),
+        2: EvaluationResult(score=4.5, feedback="fraco"),
+    }
+
+
+def test_split_batch_respects_token_budget():
+    evaluator = AnswerEvaluator()
+    answers = items(4, answer="palavra " * 400)
+
+    batches = evaluator.split_batch(answers, max_tokens=2000)
+
+    assert len(batches) > 1
+    assert [item for batch in batches for item in batch] == answers
+    assert evaluator.split_batch(answers, max_tokens=100000) == [answers]
+
+
+@patch("evaluation.answer_evaluator.chat_completion")
+def test_missing_questions_fall_back_to_single_evaluation(mock_chat):
+    mock_chat.side_effect = [
+        completion(json.dumps([{"question_index": 1, "score": 9, "feedback": "ótimo"}])),
+        completion(json.dumps({"score": 3, "feedback": "individual"})),
+    ]
+
+    results = AnswerEvaluator().evaluate_answers(items(2))
+
+    assert mock_chat.call_count == 2
+    assert results[1].score == 9.0
+    assert results[2] == EvaluationResult(score=3.0, feedback="individual")
+
+
+@patch("evaluation.answer_evaluator.chat_completion")
+def test_stream_is_closed_once_json_is_complete(mock_chat):
+    content = 'Aqui está:\n```json\n{"score": 8, "feedback": "bom"}\n```\nObservações adicionais...'
+    response = completion(content, chunk_size=4)
+    consumed = []
+    chunks = list(response.__iter__.side_effect())
+    response.__iter__.side_effect = lambda: (consumed.append(c) or c for c in chunks)
+    mock_chat.return_value = response
+
+    result = AnswerEvaluator().evaluate_answer("resposta", "Pergunta?", "Esperada")
+
+    assert result == EvaluationResult(score=8.0, feedback="bom")
+    assert mock_chat.call_args.kwargs["stream"] is True
+    assert len(consumed) < len(chunks)
+    response.close.assert_called_once()
+
+
+@patch("evaluation.answer_evaluator.chat_completion")
+def test_json_mode_requests_constrained_output(mock_chat):
+    mock_chat.return_value = completion(json.dumps({"score": 6, "feedback": "ok"}))
+
+    result = AnswerEvaluator(response_mode="json").evaluate_answer("resposta", "Pergunta?", "Esperada")
+
+    assert result.score == 6.0
+    assert mock_chat.call_args.kwargs["response_format"] == {"type": "json_object"}
+    assert "stream" not in mock_chat.call_args.kwargs
+
+
+@patch("evaluation.answer_evaluator.chat_completion")
+def test_threads_share_the_background_async_client(mock_chat):
+    async_client = BackgroundAsyncClient(
+        api_key="test", max_concurrency=2, limiter=RateLimiter()
+    )
+    running = 0
+    peak = 0
+
+    async def fake_create(messages, stream=False, **params):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        answer = messages[1]["content"].split("(transcrita): ")[1].split('"')[1]
+        content = json.dumps({"score": int(answer), "feedback": answer})
+
+        async def chunks():
+            for start in range(0, len(content), 8):
+                chunk = MagicMock()
+                chunk.choices[0].delta.content = content[start:start + 8]
+                yield chunk
+
+        return chunks()
+
+    async_client.client._client = MagicMock()
+    async_client.client._client.chat.completions.create = fake_create
+    evaluator = AnswerEvaluator(async_client=async_client)
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(pool.map(
+            lambda i: evaluator.evaluate_answer(str(i), "Pergunta?", "Esperada"), range(6)
+        ))
+    async_client.close()
+
+    assert results == [EvaluationResult(score=float(i), feedback=str(i)) for i in range(6)]
+    assert peak == 2
+    mock_chat.assert_not_called()
+
+
+def test_evaluate_answers_async_sends_batches_concurrently():
+    running = 0
+    peak = 0
+
+    async def chat_completion(messages, **params):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        prompt = messages[1]["content"]
+        indexes = [i for i in range(1, 5) if f"Pergunta {i}?" in prompt]
+        return completion(json.dumps([
+            {"question_index": i, "score": i, "feedback": "ok"} for i in indexes
+        ]))
+
+    client = MagicMock()
+    client.chat_completion = chat_completion
+    evaluator = AnswerEvaluator(response_mode="json")
+
+    results = asyncio.run(evaluator.evaluate_answers_async(
+        client, items(4, answer="palavra " * 400), max_tokens=2000
+    ))
+
+    assert {index: result.score for index, result in results.items()} == {
+        1: 1.0, 2: 2.0, 3: 3.0, 4: 4.0
+    }
+    assert peak > 1
@@ -0,0 +1,70 @@
+import io
+from unittest.mock import MagicMock, patch
+import numpy as np
+import pytest
+
+from transcription.audio_extractor import load_audio, stream_audio
+
+
+def completed(stdout=b"", stderr=b"", returncode=0):
+    process = MagicMock()
+    process.stdout = stdout
+    process.stderr = stderr
+    process.returncode = returncode
+    return process
+
+
+@patch("transcription.audio_extractor.subprocess.run")
+def test_load_audio_reads_float_pcm_from_pipe(mock_run):
+    samples = np.array([0.0, 0.5, -0.25], dtype=np.float32)
+    mock_run.return_value = completed(stdout=samples.tobytes())
+
+    audio = load_audio("video.mp4")
+
+    np.testing.assert_array_equal(audio, samples)
+    cmd = mock_run.call_args[0][0]
+    assert cmd[-1] == "-"  # saída para o pipe, sem arquivo intermediário
+    assert cmd[cmd.index("-ar") + 1] == "16000"
+    assert cmd[cmd.index("-ac") + 1] == "1"
+
+
+@patch("transcription.audio_extractor.subprocess.run")
+def test_load_audio_normalizes_s16le(mock_run):
+    samples = np.array([0, 16384, -32768], dtype=np.int16)
+    mock_run.return_value = completed(stdout=samples.tobytes())
+
+    audio = load_audio("video.mp4", sample_format="s16le")
+
+    assert audio.dtype == np.float32
+    np.testing.assert_allclose(audio, [0.0, 0.5, -1.0])
+
+
+@patch("transcription.audio_extractor.subprocess.run")
+def test_load_audio_without_audio_stream(mock_run):
+    mock_run.return_value = completed(
+        stderr=b"Stream map '0:a:0' matches no streams.", returncode=1
+    )
+
+    with pytest.raises(Exception, match="não contém áudio"):
+        load_audio("video.mp4")
+
+
+def test_stream_audio_raises_when_ffmpeg_fails_midway():
+    samples = np.zeros(16000, dtype=np.float32)
+
+    def popen(cmd, stdout, stderr):
+        stderr.write(b"Invalid data found when processing input")
+        process = MagicMock()
+        process.stdout = io.BytesIO(samples.tobytes())
+        process.wait.return_value = 1
+        process.poll.return_value = 1
+        return process
+
+    blocks = []
+    with patch("transcription.audio_extractor.subprocess.Popen", side_effect=popen):
+        with pytest.raises(RuntimeError, match="Invalid data"):
+            for block in stream_audio("video.mp4", window_seconds=0.5):
+                blocks.append(block)
+
+    # Os blocos lidos antes da falha não escondem o erro
+    assert len(blocks) == 2
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from transcription.backends import (
+    FasterWhisperBackend,
+    TranscriptionBackend,
+    WhisperBackend,
+    create_backend,
+)
+from transcription.transcriber import Transcriber
+
+
+def test_backends_return_the_same_segment_structure():
+    whisper_model = MagicMock()
+    whisper_model.transcribe.return_value = {
+        "segments": [{"start": 0.0, "end": 1.5, "text": " Olá ", "tokens": [1, 2]}]
+    }
+    faster_model = MagicMock()
+    faster_model.transcribe.return_value = (
+        iter([SimpleNamespace(start=0.0, end=1.5, text=" Olá ", words=None)]),
+        SimpleNamespace(language="pt"),
+    )
+
+    expected = [{"start": 0.0, "end": 1.5, "text": "Olá"}]
+    assert WhisperBackend().transcribe(whisper_model, "audio.wav") == expected
+    assert FasterWhisperBackend().transcribe(faster_model, "audio.wav", language="pt") == expected
+    faster_model.transcribe.assert_called_once_with("audio.wav", language="pt")
+
+
+def test_create_backend_by_name():
+    backend = create_backend("faster-whisper", compute_type="int8", cpu_threads=4, num_workers=2)
+
+    assert isinstance(backend, FasterWhisperBackend)
+    assert backend.key == "faster-whisper:int8:4:2"
+    # Opções do CTranslate2 não se aplicam ao openai-whisper
+    assert isinstance(create_backend("openai-whisper", cpu_threads=4), WhisperBackend)
+    with pytest.raises(ValueError):
+        create_backend("desconhecido")
+
+
+def test_transcriber_delegates_to_backend():
+    backend = MagicMock(spec=FasterWhisperBackend, key="faster-whisper:int8:0:1")
+    backend.name = "faster-whisper"
+    backend.transcribe.return_value = [
+        {"start": 0.0, "end": 1.0, "text": "primeira"},
+        {"start": 1.0, "end": 2.0, "text": "segunda"},
+    ]
+    transcriber = Transcriber("small", model=MagicMock(), backend=backend)
+
+    result = transcriber.transcribe_with_segments("audio.wav")
+
+    assert result["text"] == "primeira segunda"
+    assert transcriber.model_tag == "faster-whisper:int8:0:1/small"
+    assert Transcriber("small").model_tag == "small"
+
+
+def test_backend_missing_a_method_fails_at_instantiation():
+    class NoTranscribe(TranscriptionBackend):
+        name = "incompleto"
+
+        def load(self, model_size, device=None):
+            return None
+
+    with pytest.raises(TypeError):
+        NoTranscribe()
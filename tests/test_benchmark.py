@@ -0,0 +1,78 @@
+import json
+import types
+
+import groq
+import numpy as np
+import pytest
+
+from benchmark import FakeGroqServer, StageTimer, compare_reports, latency_summary, synthetic_speech
+from benchmark.synthetic_media import SAMPLE_RATE
+
+
+def test_synthetic_speech_respects_speech_ratio():
+    audio, intervals = synthetic_speech(20.0, speech_ratio=0.4, seed=1)
+
+    assert audio.dtype == np.float32
+    assert len(audio) == 20 * SAMPLE_RATE
+    assert sum(end - start for start, end in intervals) == pytest.approx(8.0)
+    assert all(0 <= start < end <= 20.0 for start, end in intervals)
+    # Silêncio entre as falas fica perto de -60 dBFS
+    start, _ = intervals[0]
+    if start > 0.1:
+        assert np.abs(audio[: int(start * SAMPLE_RATE)]).max() < 0.01
+
+
+def chat(base_url, **kwargs):
+    client = groq.Groq(api_key="test", base_url=base_url, max_retries=0)
+    return client.chat.completions.create(
+        model="fake",
+        messages=[{"role": "user", "content": 'Retorne {"score": float, "feedback": "string"}'}],
+        **kwargs,
+    )
+
+
+def test_fake_server_answers_like_groq():
+    with FakeGroqServer(latency_ms=0, jitter_ms=0) as server:
+        response = chat(server.base_url)
+        streamed = "".join(
+            chunk.choices[0].delta.content or "" for chunk in chat(server.base_url, stream=True)
+        )
+
+    data = json.loads(response.choices[0].message.content)
+    assert set(data) == {"score", "feedback"}
+    assert response.usage.completion_tokens > 0
+    assert set(json.loads(streamed)) == {"score", "feedback"}
+    assert server.stats["requests"] == 2
+    assert server.stats["streamed"] == 1
+
+
+def test_fake_server_injects_rate_limit_errors():
+    with FakeGroqServer(latency_ms=0, jitter_ms=0, error_rate=1.0) as server:
+        with pytest.raises(groq.RateLimitError):
+            chat(server.base_url)
+    assert server.stats["errors_injected"] == 1
+
+
+def test_stage_timer_wraps_and_restores():
+    module = types.SimpleNamespace(work=lambda x: x * 2)
+    original = module.work
+    timer = StageTimer()
+
+    timer.wrap(module, "work", "stage")
+    assert module.work(2) == 4
+    assert module.work(3) == 6
+    timer.restore()
+
+    assert module.work is original
+    assert timer.summary()["stage"]["count"] == 2
+
+
+def test_latency_summary_and_comparison():
+    summary = latency_summary([1.0, 2.0, 3.0, 4.0])
+    assert summary["p50"] == 2.5
+    assert summary["max"] == 4.0
+    assert latency_summary([]) == {"count": 0}
+
+    baseline = {"stages": {"transcription": {"p50": 2.0}}, "throughput": {"audio_seconds_per_second": 10}}
+    current = {"stages": {"transcription": {"p50": 2.5}}, "throughput": {"audio_seconds_per_second": 8}}
+    assert compare_reports(current, baseline) == {"transcription.p50": 0.25, "throughput": -0.2}
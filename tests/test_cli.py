@@ -0,0 +1,123 @@
+import os
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import main
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+HEAVY_MODULES = ("groq", "httpx", "numpy", "torch", "whisper", "moviepy")
+
+
+def run_python(code, tmp_path):
+    """Executa o código em um processo novo, sem as variáveis do Groq."""
+    env = {
+        key: value for key, value in os.environ.items()
+        if key not in ("GROQ_API_KEY", "GROQ_MODEL")
+    }
+    env["PYTHONPATH"] = os.pathsep.join([os.path.join(ROOT, "src"), ROOT])
+    return subprocess.run(
+        [sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True, text=True
+    )
+
+
+def test_without_command_runs_previous_interface():
+    args = main.parse_args(["--pipeline", "--batch-eval"])
+    assert args.command == "run"
+    assert args.pipeline and args.batch_eval
+
+
+def test_subcommands_only_accept_their_options():
+    assert main.parse_args(["transcribe", "--stream"]).stream
+    assert main.parse_args(["evaluate", "--no-llm-cache"]).no_llm_cache
+    with pytest.raises(SystemExit):
+        main.parse_args(["report", "--stream"])
+    # O pipeline não tem modo streaming: a opção é recusada em vez de ignorada
+    with pytest.raises(SystemExit):
+        main.parse_args(["--pipeline", "--stream"])
+
+
+def test_light_commands_skip_heavy_imports_and_credentials(tmp_path):
+    result = run_python(
+        "import sys, main\n"
+        "main.main(['list'])\n"
+        "import evaluation, transcription.summarizer\n"
+        f"print(sorted(set({HEAVY_MODULES!r}) & set(sys.modules)))\n",
+        tmp_path,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_required_settings_are_validated_on_first_use(tmp_path):
+    result = run_python(
+        "import config\n"
+        "print(config.check_required_vars())\n"
+        "try:\n"
+        "    config.GROQ_API_KEY\n"
+        "except ValueError as e:\n"
+        "    print(e)\n",
+        tmp_path,
+    )
+    assert result.returncode == 0, result.stderr
+    missing, error = result.stdout.strip().splitlines()
+    assert missing == "['GROQ_API_KEY', 'GROQ_MODEL']"
+    assert "GROQ_API_KEY" in error
+
+
+def test_process_videos_releases_resources_when_interrupted():
+    args = main.parse_args(["transcribe"])
+    transcriber = MagicMock()
+    fingerprints = MagicMock()
+    with patch.object(main, "create_transcriber", return_value=transcriber), \
+            patch.object(main, "open_fingerprint_index", return_value=fingerprints), \
+            patch("transcription.video_processor.VideoProcessor", side_effect=KeyboardInterrupt):
+        with pytest.raises(KeyboardInterrupt):
+            main.process_videos(["candidato_joao_frontend_q1.mp4"], None, None, args)
+
+    transcriber.release.assert_called_once()
+    fingerprints.close.assert_called_once()
+
+
+def test_evaluate_releases_llm_client_and_cache_on_error():
+    args = main.parse_args(["evaluate"])
+    evaluator = MagicMock()
+    evaluator.evaluate_interview.side_effect = RuntimeError("falhou")
+    response_cache = MagicMock()
+    with patch.object(main, "check_groq_settings", return_value=True), \
+            patch.object(main, "create_evaluator", return_value=(evaluator, response_cache)), \
+            patch.object(main, "input_videos", return_value=["candidato_joao_frontend_q1.mp4"]), \
+            patch.object(main.os.path, "exists", return_value=True), \
+            patch("transcription.transcriber.Transcriber.load_transcription"), \
+            patch.object(main, "finish_tracing") as finish_tracing:
+        with pytest.raises(RuntimeError):
+            main.evaluate_transcriptions(args)
+
+    evaluator.close.assert_called_once()
+    response_cache.close.assert_called_once()
+    finish_tracing.assert_called_once()
+
+
+def test_batch_evaluated_videos_count_as_processed_only_if_evaluation_succeeds():
+    from evaluation.interview_evaluator import InterviewEvaluator
+
+    args = main.parse_args(["run", "--batch-eval"])
+    videos = ["candidato_joao_frontend_q1.mp4", "candidato_maria_frontend_q1.mp4"]
+    evaluator = InterviewEvaluator()
+    evaluator.evaluate_candidates = MagicMock(return_value={
+        ("joao", "frontend"): "evaluation_joao_frontend.json",
+        ("maria", "frontend"): None,
+    })
+    processor = MagicMock()
+    processor.process_video.return_value = {
+        "cached": False, "frames": [], "transcription": "texto", "transcript": None,
+    }
+    with patch.object(main, "create_transcriber"), \
+            patch.object(main, "open_fingerprint_index", return_value=None), \
+            patch("transcription.video_processor.VideoProcessor", return_value=processor):
+        processed = main.process_videos(videos, evaluator, None, args)
+
+    # O vídeo cuja avaliação em lote falhou fica de fora do manifesto do --watch
+    assert processed == ["candidato_joao_frontend_q1.mp4"]
@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from evaluation.job_matcher import job_language, validate_job_data
+from transcription.backends import FasterWhisperBackend, WhisperBackend
+from transcription.decoding import decoding_options, word_error_rate
+from transcription.transcriber import Transcriber, compare_profiles
+from transcription.video_processor import VideoProcessor
+
+
+def test_profiles_trade_speed_for_quality():
+    fast = decoding_options("fast")
+    accurate = decoding_options("accurate", language="pt", word_timestamps=True)
+
+    assert fast["temperature"] == 0.0 and fast["beam_size"] is None
+    assert not fast["condition_on_previous_text"]
+    assert accurate["beam_size"] == 5 and len(accurate["temperature"]) == 6
+    assert accurate["language"] == "pt" and accurate["word_timestamps"]
+    assert "language" not in decoding_options("balanced")
+    # Sem perfil, a decodificação é a mesma de model.transcribe sem opções
+    assert decoding_options() == {
+        "beam_size": None,
+        "best_of": 5,
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "condition_on_previous_text": True,
+        "fp16": None,
+    }
+    with pytest.raises(ValueError):
+        decoding_options("turbo")
+
+
+def test_backends_adapt_profile_options():
+    whisper_model = MagicMock(device="cpu")
+    whisper_model.transcribe.return_value = {"segments": []}
+    WhisperBackend().transcribe(whisper_model, "audio.wav", **decoding_options("fast"))
+    assert whisper_model.transcribe.call_args.kwargs["fp16"] is False
+
+    faster_model = MagicMock()
+    faster_model.transcribe.return_value = (iter([]), SimpleNamespace(language="pt"))
+    FasterWhisperBackend().transcribe(faster_model, "audio.wav", **decoding_options("balanced"))
+    faster_model.transcribe.assert_called_once_with(
+        "audio.wav",
+        beam_size=1,
+        best_of=3,
+        temperature=[0.0, 0.4, 0.8],
+        condition_on_previous_text=False,
+    )
+
+
+def test_job_language_comes_from_job_position_file():
+    # data/job_positions/frontend.json define "language": "pt"
+    assert job_language("/input/candidato_joao_frontend_q1.mp4") == "pt"
+    assert job_language("candidato_joao_frontend.mp4") == "pt"
+    assert job_language("candidato_joao_inexistente_q1.mp4") is None
+    assert validate_job_data({
+        "name": "frontend",
+        "language": "",
+        "questions": [{"question": "P?", "expected_answer": "R"}],
+    }) == ["'language' deve ser um código de idioma (ex: \"pt\")"]
+
+
+def test_job_language_overrides_default_and_changes_cache_key(tmp_path):
+    backend = MagicMock(spec=WhisperBackend)
+    backend.name = "openai-whisper"
+    backend.transcribe.return_value = [{"start": 0.0, "end": 1.0, "text": "olá"}]
+    transcriber = Transcriber(
+        model=MagicMock(), backend=backend, decode_options=decoding_options("fast", "en")
+    )
+
+    transcriber.transcribe_with_segments("audio.wav", language="pt")
+    assert backend.transcribe.call_args.kwargs["language"] == "pt"
+    assert transcriber.decode_options["language"] == "en"
+
+    video = tmp_path / "candidato_joao_frontend_q1.mp4"
+    video.write_bytes(b"video")
+    keys = {
+        VideoProcessor(str(video), str(tmp_path), transcriber=transcriber, language=language)
+        .cache_key()
+        for language in (None, "pt")
+    }
+    assert len(keys) == 2
+
+
+def test_compare_profiles_reports_speed_and_word_error_rate():
+    backend = MagicMock(spec=WhisperBackend)
+    backend.name = "openai-whisper"
+    backend.transcribe.side_effect = lambda model, audio, **options: [
+        {"start": 0.0, "end": 1.0, "text": "o virtual dom" if options["beam_size"] else "o virtual"}
+    ]
+    transcriber = Transcriber(model=MagicMock(), backend=backend)
+
+    report = compare_profiles(
+        transcriber, [np.zeros(16000, dtype=np.float32)], ["O Virtual DOM."],
+        profiles=("fast", "accurate"),
+    )
+
+    assert report["fast"]["wer"] == pytest.approx(1 / 3, abs=1e-4)
+    assert report["accurate"]["wer"] == 0.0
+    assert report["fast"]["audio_seconds_per_second"] > 0
+
+
+def test_word_error_rate():
+    assert word_error_rate("o virtual dom", "O virtual DOM!") == 0.0
+    assert word_error_rate("a b c d", "a x c") == pytest.approx(0.5)
+    assert word_error_rate("", "") == 0.0
@@ -0,0 +1,99 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from transcription.backends import WhisperBackend
+from transcription.fingerprint import FingerprintIndex, audio_fingerprint, fingerprint_similarity
+from transcription.transcriber import Transcriber
+from transcription.transcription_cache import TranscriptionCache
+from transcription.video_processor import VideoProcessor
+
+SAMPLE_RATE = 16000
+
+
+def voice(seed, seconds=20):
+    """Sinal sintético com espectro variando a cada 250 ms entre 300 Hz e 2 kHz."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(seconds * SAMPLE_RATE) / SAMPLE_RATE
+    steps = np.arange(seconds * 4 + 1) / 4
+    out = np.zeros_like(t)
+    for freq in rng.uniform(300, 2000, 24):
+        envelope = np.interp(t, steps, rng.random(len(steps)) ** 2)
+        out += envelope * np.sin(2 * np.pi * freq * t + rng.uniform(0, 6))
+    return (0.05 * out).astype(np.float32)
+
+
+def reencode(samples):
+    """Simula outra codificação: atraso, ganho, filtro passa-baixa e ruído."""
+    rng = np.random.default_rng(0)
+    delayed = np.concatenate([np.zeros(300, dtype=np.float32), samples]) * 0.5
+    filtered = np.convolve(delayed, np.ones(3) / 3, mode="same")
+    return (filtered + rng.normal(0, 10 ** (-45 / 20), len(filtered))).astype(np.float32)
+
+
+def test_reencoded_audio_matches_and_different_audio_does_not(tmp_path):
+    original = audio_fingerprint(voice(1))
+    copy = audio_fingerprint(reencode(voice(1)))
+    other = audio_fingerprint(voice(2))
+
+    assert fingerprint_similarity(original.frames, copy.frames) > 0.75
+    assert fingerprint_similarity(original.frames, other.frames) < 0.6
+
+    index = FingerprintIndex(str(tmp_path / "fingerprints.sqlite3"))
+    index.add("hash-original", "candidato_joao_frontend_q1", original)
+    match = index.find(copy)
+    assert match.content_hash == "hash-original"
+    assert match.video == "candidato_joao_frontend_q1"
+    assert index.find(other) is None
+    assert index.find(copy, exclude="hash-original") is None
+    index.close()
+
+
+def test_silent_or_short_audio_is_not_indexed(tmp_path):
+    index = FingerprintIndex(str(tmp_path / "fingerprints.sqlite3"))
+    silence = audio_fingerprint(np.zeros(10 * SAMPLE_RATE, dtype=np.float32))
+    assert silence.audible_frames == 0
+    index.add("hash-silence", "silencio", silence)
+    index.add("hash-short", "curto", audio_fingerprint(voice(1)[:SAMPLE_RATE // 2]))
+    assert len(index) == 0
+    assert index.find(silence) is None
+
+    index.add("hash-a", "a", audio_fingerprint(voice(1)))
+    index.add("hash-a", "a", audio_fingerprint(voice(1)))
+    assert len(index) == 1
+    assert index.clear() == 1
+    index.close()
+
+
+def test_reupload_reuses_cached_transcription(tmp_path):
+    backend = MagicMock(spec=WhisperBackend)
+    backend.name = "openai-whisper"
+    backend.transcribe.return_value = [{"start": 0.0, "end": 20.0, "text": "o virtual dom"}]
+    transcriber = Transcriber(model=MagicMock(), backend=backend)
+    cache = TranscriptionCache(str(tmp_path / "cache"))
+    fingerprints = FingerprintIndex(str(tmp_path / "fingerprints.sqlite3"))
+
+    first = tmp_path / "candidato_joao_frontend_q1.mp4"
+    second = tmp_path / "candidato_joao_frontend_q1_reenvio.mov"
+    first.write_bytes(b"mp4")
+    second.write_bytes(b"mov")
+    audio = {str(first): voice(1), str(second): reencode(voice(1))}
+
+    results = []
+    with patch("transcription.video_processor.load_audio", side_effect=audio.get):
+        for video in (first, second):
+            processor = VideoProcessor(
+                str(video), str(tmp_path),
+                transcriber=transcriber, cache=cache, fingerprints=fingerprints,
+            )
+            results.append(processor.process_video())
+
+    assert backend.transcribe.call_count == 1
+    assert not results[0]["cached"] and results[0]["duplicate_of"] is None
+    assert results[1]["cached"]
+    assert results[1]["duplicate_of"] == "candidato_joao_frontend_q1"
+    assert results[1]["transcription"] == "o virtual dom"
+    # O reenvio também fica no cache com o seu próprio hash
+    assert cache.get(processor.cache_key())
+    assert len(fingerprints) == 2
+    fingerprints.close()
@@ -0,0 +1,54 @@
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from transcription.frame_capture import capture_frames
+
+
+def fake_ffmpeg(timestamps):
+    """Simula o ffmpeg: grava os JPEGs e registra o showinfo no stderr."""
+    def run(cmd, capture_output):
+        pattern = cmd[-1]
+        for i, _ in enumerate(timestamps, start=1):
+            with open(pattern % i, "wb") as f:
+                f.write(b"jpeg")
+        stderr = "\n".join(
+            f"[Parsed_showinfo_2 @ 0x1] n:{i} pts:{int(t * 1000)} pts_time:{t} fmt:yuv420p"
+            for i, t in enumerate(timestamps)
+        )
+        process = MagicMock(returncode=0, stderr=stderr.encode())
+        return process
+    return run
+
+
+@patch("transcription.frame_capture.subprocess.run")
+def test_capture_frames_single_pass(mock_run, tmp_path):
+    mock_run.side_effect = fake_ffmpeg([0.0, 60.0, 120.0])
+
+    frames = capture_frames("video.mp4", str(tmp_path), interval=60, width=640)
+
+    assert mock_run.call_count == 1
+    cmd = mock_run.call_args[0][0]
+    vf = cmd[cmd.index("-vf") + 1]
+    assert "select=" in vf and "60" in vf and "scale=640:-2" in vf
+    assert [os.path.basename(f) for f in frames] == [
+        "frame_0s.jpg", "frame_60s.jpg", "frame_120s.jpg"
+    ]
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(f) for f in frames)
+
+
+@patch("transcription.frame_capture.subprocess.run")
+def test_capture_frames_keyframes_and_scene_modes(mock_run, tmp_path):
+    mock_run.side_effect = fake_ffmpeg([0.0, 12.48])
+
+    frames = capture_frames("video.mp4", str(tmp_path), mode="keyframes")
+    assert "-skip_frame" in mock_run.call_args[0][0]
+
+    frames = capture_frames("video.mp4", str(tmp_path), mode="scene", scene_threshold=0.5)
+    cmd = mock_run.call_args[0][0]
+    assert "scene" in cmd[cmd.index("-vf") + 1]
+    assert os.path.basename(frames[1]) == "frame_12.48s.jpg"
+
+    with pytest.raises(ValueError):
+        capture_frames("video.mp4", str(tmp_path), mode="invalido")
@@ -0,0 +1,106 @@
+from unittest.mock import MagicMock, patch
+import asyncio
+
+import httpx
+import pytest
+from groq import RateLimitError
+
+from transcription import groq_client
+from transcription.rate_limiter import RateLimiter, TokenBucket, retry_after_seconds
+
+
+def rate_limit_error(headers=None):
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    response = httpx.Response(429, headers=headers or {}, request=request)
+    return RateLimitError("rate limit", response=response, body=None)
+
+
+def test_token_bucket_waits_when_empty():
+    bucket = TokenBucket(capacity=2, per_minute=60)  # 1 token por segundo
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(1.0, abs=0.05)
+
+
+def test_rate_limiter_uses_tightest_limit():
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=600)
+
+    assert limiter.reserve(tokens=600) == 0.0
+    assert limiter.reserve(tokens=300) == pytest.approx(30.0, abs=0.1)
+
+
+def test_retry_after_header():
+    assert retry_after_seconds(rate_limit_error({"retry-after": "7"})) == 7.0
+    assert retry_after_seconds(rate_limit_error({"retry-after-ms": "1500"})) == 1.5
+    assert retry_after_seconds(rate_limit_error()) is None
+
+
+@patch("transcription.groq_client.time.sleep")
+@patch("transcription.groq_client.client")
+def test_chat_completion_retries_rate_limit(mock_client, mock_sleep):
+    response = MagicMock()
+    mock_client.chat.completions.create.side_effect = [
+        rate_limit_error({"retry-after": "3"}),
+        response,
+    ]
+
+    result = groq_client.chat_completion([{"role": "user", "content": "oi"}], model="m")
+
+    assert result is response
+    assert mock_client.chat.completions.create.call_count == 2
+    assert 3.0 in [c.args[0] for c in mock_sleep.call_args_list]
+
+
+@patch("transcription.groq_client.time.sleep")
+@patch("transcription.groq_client.client")
+def test_chat_completion_gives_up_after_max_retries(mock_client, mock_sleep):
+    mock_client.chat.completions.create.side_effect = rate_limit_error()
+
+    with pytest.raises(RateLimitError):
+        groq_client.chat_completion(
+            [{"role": "user", "content": "oi"}], max_retries=2, model="m"
+        )
+    assert mock_client.chat.completions.create.call_count == 3
+
+
+def test_async_client_limits_concurrency():
+    async def scenario():
+        client = groq_client.AsyncGroqClient(
+            api_key="test", max_concurrency=2, limiter=RateLimiter()
+        )
+        running = 0
+        peak = 0
+
+        async def fake_create(**kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return kwargs["messages"][0]["content"]
+
+        client._client = MagicMock()
+        client._client.chat.completions.create = fake_create
+        async with client:
+            results = await asyncio.gather(
+                *(
+                    client.chat_completion([{"role": "user", "content": str(i)}], model="m")
+                    for i in range(10)
+                )
+            )
+        return results, peak
+
+    results, peak = asyncio.run(scenario())
+
+    assert results == [str(i) for i in range(10)]
+    assert peak == 2
+
+
+def test_rate_limiter_reserves_expected_completion_not_the_cap():
+    messages = [{"role": "user", "content": "palavra " * 100}]
+    prompt = groq_client.estimate_request_tokens(messages, {})
+
+    reserved = groq_client.estimate_request_tokens(messages, {"max_completion_tokens": 1024})
+
+    assert prompt < reserved < prompt + 1024
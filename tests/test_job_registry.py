@@ -0,0 +1,77 @@
+import json
+import os
+
+import pytest
+
+from evaluation.answer_evaluator import AnswerEvaluator
+from evaluation.job_matcher import JobPositionRegistry, JobQuestion, validate_job_data
+
+
+def write_job(directory, name, questions, mtime=None):
+    path = os.path.join(directory, f"{name}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"name": name, "questions": questions}, f)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+QUESTIONS = [
+    {"question": 'O que é "hoisting"?', "expected_answer": "Elevação de declarações"},
+    {"question": "O que é CSS?", "expected_answer": "Folhas de estilo", "weight": 2},
+]
+
+
+def test_get_caches_until_file_changes(tmp_path):
+    write_job(tmp_path, "frontend", QUESTIONS, mtime=1000)
+    registry = JobPositionRegistry(str(tmp_path))
+
+    first = registry.get("frontend")
+    assert registry.get("frontend") is first
+
+    write_job(tmp_path, "frontend", QUESTIONS[:1], mtime=2000)
+    reloaded = registry.get("frontend")
+    assert reloaded is not first
+    assert len(reloaded.questions) == 1
+
+
+def test_question_lookup_is_one_based(tmp_path):
+    write_job(tmp_path, "frontend", QUESTIONS)
+    registry = JobPositionRegistry(str(tmp_path))
+
+    assert registry.question("frontend", 2).weight == 2
+    assert registry.question("frontend", 0) is None
+    assert registry.question("frontend", 3) is None
+
+
+def test_load_all_reports_invalid_files(tmp_path):
+    write_job(tmp_path, "frontend", QUESTIONS)
+    write_job(tmp_path, "backend", [{"question": "", "expected_answer": "x", "weight": 0}])
+    (tmp_path / "quebrado.json").write_text("{", encoding="utf-8")
+
+    errors = JobPositionRegistry(str(tmp_path)).load_all()
+
+    assert set(errors) == {"backend", "quebrado"}
+    assert "'question'" in errors["backend"]
+    assert "'weight'" in errors["backend"]
+
+
+def test_get_raises_for_invalid_position(tmp_path):
+    write_job(tmp_path, "frontend", [])
+    with pytest.raises(ValueError):
+        JobPositionRegistry(str(tmp_path)).get("frontend")
+
+
+def test_validate_rejects_name_mismatch():
+    errors = validate_job_data({"name": "backend", "questions": QUESTIONS}, expected_name="frontend")
+    assert len(errors) == 1
+
+
+def test_prompt_fragments_are_precomputed_and_reused():
+    question = JobQuestion(question=' Use "let" ou \\var? ', expected_answer="let")
+    assert question.prompt_question == 'Use \\"let\\" ou \\\\var?'
+
+    evaluator = AnswerEvaluator()
+    with_fragments, _ = evaluator.build_request("resposta", "", "", job_question=question)
+    sanitized, _ = evaluator.build_request("resposta", question.question, question.expected_answer)
+    assert with_fragments == sanitized
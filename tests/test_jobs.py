@@ -0,0 +1,68 @@
+import os
+from unittest.mock import MagicMock, patch
+
+from jobs import JobWorker, SQLiteJobQueue
+
+
+def test_claimed_job_is_hidden_until_visibility_timeout(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.sqlite3"))
+    job_id = queue.submit({"video_path": "/videos/joao_frontend_q1.mp4"})
+
+    job = queue.claim("worker-1", visibility_timeout=60)
+    assert job.id == job_id
+    assert job.payload == {"video_path": "/videos/joao_frontend_q1.mp4"}
+    assert job.attempts == 1
+    assert queue.claim("worker-2", visibility_timeout=60) is None
+
+    assert queue.ack(job)
+    assert queue.stats()["done"] == 1
+
+
+def test_expired_job_is_redelivered_and_stale_ack_is_ignored(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.sqlite3"))
+    queue.submit({"video_path": "video.mp4"})
+
+    stale = queue.claim("worker-1", visibility_timeout=-1)
+    redelivered = queue.claim("worker-2", visibility_timeout=60)
+
+    assert redelivered.id == stale.id
+    assert redelivered.attempts == 2
+    assert not queue.ack(stale)
+    assert queue.ack(redelivered)
+
+
+def test_failed_job_is_retried_until_max_attempts(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.sqlite3"), max_attempts=2)
+    queue.submit({"video_path": "video.mp4"})
+
+    queue.fail(queue.claim("w", 60), "erro 1")
+    queue.fail(queue.claim("w", 60), "erro 2")
+
+    assert queue.claim("w", 60) is None
+    assert queue.stats() == {"pending": 0, "running": 0, "done": 0, "failed": 1}
+
+
+@patch("jobs.worker.VideoProcessor")
+def test_worker_acks_processed_jobs_and_fails_errors(mock_processor_class, tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.sqlite3"), max_attempts=1)
+    queue.submit({"video_path": "/videos/joao_frontend_q1.mp4"})
+    queue.submit({"video_path": "/videos/joao_frontend_q2.mp4"})
+
+    mock_processor_class.return_value.process_video.return_value = {
+        "transcription": "texto"
+    }
+    evaluator = MagicMock()
+    evaluator.evaluate_interview.side_effect = [
+        str(tmp_path / "evaluation_joao_frontend.json"),
+        None,
+    ]
+    worker = JobWorker(queue, evaluator, str(tmp_path), transcriber=MagicMock())
+
+    assert worker.run(exit_when_empty=True) == 2
+    assert queue.stats() == {"pending": 0, "running": 0, "done": 1, "failed": 1}
+    evaluator.evaluate_interview.assert_any_call(
+        video_filename="joao_frontend_q1.mp4",
+        transcription="texto",
+        output_dir=str(tmp_path),
+        transcript=None,
+    )
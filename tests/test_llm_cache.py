@@ -0,0 +1,43 @@
+from transcription.llm_cache import ResponseCache
+
+MESSAGES = [
+    {"role": "system", "content": "Você é um avaliador."},
+    {"role": "user", "content": "Pergunta:\n    O que é Virtual DOM?"},
+]
+PARAMS = {"model": "llama", "temperature": 0.3}
+
+
+def test_cache_hit_ignores_whitespace_but_not_params(tmp_path):
+    cache = ResponseCache(str(tmp_path / "llm.sqlite3"))
+    cache.set(MESSAGES, PARAMS, '{"score": 8, "feedback": "ok"}')
+
+    reformatted = [
+        MESSAGES[0],
+        {"role": "user", "content": "Pergunta: O que é Virtual DOM?"},
+    ]
+    assert cache.get(reformatted, PARAMS) == '{"score": 8, "feedback": "ok"}'
+    assert cache.get(MESSAGES, {**PARAMS, "temperature": 0.7}) is None
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_cache_entries_expire(tmp_path):
+    cache = ResponseCache(str(tmp_path / "llm.sqlite3"), ttl_seconds=-1)
+    cache.set(MESSAGES, PARAMS, "resposta")
+
+    assert cache.get(MESSAGES, PARAMS) is None
+
+
+def test_cache_keeps_at_most_max_entries(tmp_path):
+    cache = ResponseCache(str(tmp_path / "llm.sqlite3"), max_entries=2)
+    for i in range(3):
+        cache.set([{"role": "user", "content": str(i)}], PARAMS, f"r{i}")
+
+    assert cache.get([{"role": "user", "content": "0"}], PARAMS) is None
+    assert cache.get([{"role": "user", "content": "2"}], PARAMS) == "r2"
+
+
+def test_cache_persists_between_instances(tmp_path):
+    path = str(tmp_path / "llm.sqlite3")
+    ResponseCache(path).set(MESSAGES, PARAMS, "resposta")
+
+    assert ResponseCache(path).get(MESSAGES, PARAMS) == "resposta"
@@ -0,0 +1,48 @@
+from unittest.mock import MagicMock, patch
+import pytest
+
+from transcription import model_registry
+from transcription.transcriber import Transcriber
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    model_registry.clear_models()
+    yield
+    model_registry.clear_models()
+
+
+@patch("transcription.model_registry._load_model")
+def test_model_loaded_once_per_size_and_device(mock_load):
+    mock_load.side_effect = lambda size, device, backend: MagicMock(name=f"{size}-{device}")
+
+    first = model_registry.get_model("small", "cpu")
+    second = model_registry.get_model("small", "cpu")
+    other = model_registry.get_model("medium", "cpu")
+
+    assert first is second
+    assert other is not first
+    assert mock_load.call_count == 2
+
+
+@patch("transcription.model_registry._load_model")
+def test_transcriber_loads_lazily_and_releases(mock_load):
+    mock_load.return_value = MagicMock()
+
+    transcriber = Transcriber("small")
+    mock_load.assert_not_called()
+
+    assert transcriber.model is mock_load.return_value
+    assert ("small", None, 0, "openai-whisper") in model_registry.loaded_models()
+
+    transcriber.release()
+    assert model_registry.loaded_models() == []
+
+
+@patch("transcription.model_registry._load_model")
+def test_transcriber_uses_injected_model(mock_load):
+    model = MagicMock()
+    transcriber = Transcriber("small", model=model)
+
+    assert transcriber.model is model
+    mock_load.assert_not_called()
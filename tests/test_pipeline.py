@@ -0,0 +1,262 @@
+import asyncio
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock, patch
+
+from pipeline import BatchPipeline, PipelineConfig
+from transcription.groq_client import BackgroundAsyncClient
+
+
+def fake_extract(video_path, scratch_dir, audio_file=False):
+    """Substitui a extração real (precisa ser picklable para o pool de processos)"""
+    work_dir = os.path.join(scratch_dir, os.path.basename(video_path))
+    os.makedirs(work_dir)
+    audio_path = os.path.join(work_dir, "audio.mp3")
+    with open(audio_path, "w") as f:
+        f.write(os.path.basename(video_path))
+    return audio_path
+
+
+def fake_capture(video_path, output_dir, prefix="", **options):
+    return [os.path.join(output_dir, f"{prefix}frame_0s.jpg")]
+
+
+def read_audio(audio_path, language=None):
+    with open(audio_path) as f:
+        return {"text": f"texto de {f.read()}", "segments": []}
+
+
+@patch("pipeline._extract_worker", fake_extract)
+@patch("pipeline.Transcriber")
+def test_pipeline_runs_all_stages(mock_transcriber_class, tmp_path):
+    mock_transcriber_class.return_value.transcribe_with_segments.side_effect = read_audio
+    evaluator = MagicMock()
+    evaluator.evaluate_interview.side_effect = (
+        lambda video_filename, transcription, output_dir, transcript: (
+            f"{output_dir}/{video_filename}.json"
+        )
+    )
+
+    videos = [str(tmp_path / f"candidato_joao_frontend_q{i}.mp4") for i in range(1, 6)]
+    pipeline = BatchPipeline(
+        str(tmp_path),
+        evaluator,
+        config=PipelineConfig(
+            extract_workers=2, transcribe_workers=2, evaluate_workers=2, queue_size=1
+        ),
+    )
+
+    results = pipeline.run(videos)
+
+    assert [r["video"] for r in results] == videos
+    for video, result in zip(videos, results):
+        name = os.path.basename(video)
+        assert result["transcription"] == f"texto de {name}"
+        assert result["evaluation_path"] == f"{tmp_path}/{name}.json"
+        assert "error" not in result
+    assert evaluator.evaluate_interview.call_count == len(videos)
+    # O diretório temporário da extração é removido ao final
+    assert list((tmp_path / ".work").iterdir()) == []
+
+
+@patch("pipeline._extract_worker", fake_extract)
+@patch("pipeline.Transcriber")
+def test_pipeline_records_stage_errors(mock_transcriber_class, tmp_path):
+    mock_transcriber_class.return_value.transcribe_with_segments.side_effect = RuntimeError(
+        "falhou"
+    )
+    evaluator = MagicMock()
+
+    pipeline = BatchPipeline(str(tmp_path), evaluator)
+    results = pipeline.run([str(tmp_path / "candidato_ana_frontend_q1.mp4")])
+
+    assert results[0]["error"] == "falhou"
+    evaluator.evaluate_interview.assert_not_called()
+
+
+@patch("pipeline._extract_worker", fake_extract)
+@patch("pipeline.Transcriber")
+def test_pipeline_batch_evaluation_groups_by_candidate(mock_transcriber_class, tmp_path):
+    from evaluation.interview_evaluator import InterviewEvaluator
+
+    mock_transcriber_class.return_value.transcribe_with_segments.side_effect = read_audio
+    evaluator = InterviewEvaluator()
+    evaluator.evaluate_candidate = MagicMock(return_value="avaliacao.json")
+    evaluator.evaluate_interview = MagicMock()
+
+    videos = [
+        str(tmp_path / name)
+        for name in [
+            "candidato_joao_frontend_q1.mp4",
+            "candidato_ana_frontend_q1.mp4",
+            "candidato_joao_frontend_q2.mp4",
+        ]
+    ]
+    pipeline = BatchPipeline(
+        str(tmp_path), evaluator, config=PipelineConfig(batch_evaluation=True)
+    )
+
+    results = pipeline.run(videos)
+
+    assert evaluator.evaluate_candidate.call_count == 2
+    calls = {c.args[0]: c.args[2] for c in evaluator.evaluate_candidate.call_args_list}
+    assert calls["joao"] == {
+        1: "texto de candidato_joao_frontend_q1.mp4",
+        2: "texto de candidato_joao_frontend_q2.mp4",
+    }
+    assert all(r["evaluation_path"] == "avaliacao.json" for r in results)
+    evaluator.evaluate_interview.assert_not_called()
+
+
+@patch("pipeline._extract_worker", fake_extract)
+@patch("pipeline.Transcriber")
+def test_pipeline_transcribes_ready_videos_in_batches(mock_transcriber_class, tmp_path):
+    batches = []
+
+    def transcribe_batch(audios, language=None):
+        assert language == "pt"  # idioma de data/job_positions/frontend.json
+        batches.append(len(audios))
+        return [read_audio(audio) for audio in audios]
+
+    mock_transcriber_class.return_value.transcribe_batch.side_effect = transcribe_batch
+    evaluator = MagicMock()
+    evaluator.evaluate_interview.return_value = "avaliacao.json"
+
+    videos = [str(tmp_path / f"candidato_joao_frontend_q{i}.mp4") for i in range(1, 6)]
+    pipeline = BatchPipeline(
+        str(tmp_path),
+        evaluator,
+        config=PipelineConfig(queue_size=5, transcribe_batch_size=4),
+    )
+
+    results = pipeline.run(videos)
+
+    assert sum(batches) == len(videos)
+    assert max(batches) <= 4
+    for video, result in zip(videos, results):
+        assert result["transcription"] == f"texto de {os.path.basename(video)}"
+    mock_transcriber_class.return_value.transcribe_with_segments.assert_not_called()
+
+
+@patch("pipeline._extract_worker", fake_extract)
+@patch("pipeline.capture_frames", fake_capture)
+@patch("pipeline.Transcriber")
+def test_pipeline_saves_transcription_and_captures_frames(mock_transcriber_class, tmp_path):
+    from transcription.transcriber import Transcriber
+
+    mock_transcriber_class.return_value.transcribe_with_segments.side_effect = read_audio
+    evaluator = MagicMock()
+    evaluator.evaluate_interview.return_value = "avaliacao.json"
+
+    video = str(tmp_path / "candidato_joao_frontend_q1.mp4")
+    pipeline = BatchPipeline(
+        str(tmp_path), evaluator, config=PipelineConfig(capture_frames=True)
+    )
+    result = pipeline.run([video])[0]
+
+    # O mesmo arquivo do processamento vídeo a vídeo, lido pelo comando evaluate
+    expected_path = tmp_path / "transcription_candidato_joao_frontend_q1.json"
+    assert result["transcription_path"] == str(expected_path)
+    transcript = Transcriber.load_transcription(result["transcription_path"])
+    assert transcript.text == "texto de candidato_joao_frontend_q1.mp4"
+    assert result["frames"] == [str(tmp_path / "candidato_joao_frontend_q1_frame_0s.jpg")]
+
+
+@patch("pipeline._extract_worker", fake_extract)
+@patch("pipeline.Transcriber")
+def test_pipeline_splits_session_recording_by_question(mock_transcriber_class, tmp_path):
+    from evaluation.interview_evaluator import InterviewEvaluator, QuestionEvaluation
+    from evaluation.results_store import ResultsStore
+
+    texts = [
+        "Bom dia. Explique o conceito de virtual DOM no React e por que ele é importante.",
+        "O virtual DOM é uma cópia leve do DOM em memória.",
+        "Como você lida com o gerenciamento de estado em aplicações React?",
+        "Uso useState e Context API.",
+    ]
+    mock_transcriber_class.return_value.transcribe_with_segments.return_value = {
+        "text": " ".join(texts),
+        "segments": [
+            {"start": i * 10.0, "end": i * 10.0 + 9.0, "text": text}
+            for i, text in enumerate(texts)
+        ],
+    }
+    store = ResultsStore(str(tmp_path / "evaluations.sqlite3"))
+    evaluator = InterviewEvaluator(store=store)
+    evaluator.process_single_answer = MagicMock(
+        side_effect=lambda filename, text, job, number: QuestionEvaluation(
+            job.question(number).question, text, "", 8.0, "ok"
+        )
+    )
+
+    # Gravação completa (sem _qN), também com a avaliação em lote ativa
+    pipeline = BatchPipeline(
+        str(tmp_path), evaluator, config=PipelineConfig(batch_evaluation=True)
+    )
+    result = pipeline.run([str(tmp_path / "candidato_joao_frontend.mp4")])[0]
+
+    assert "error" not in result and result["evaluation_path"]
+    answered = [c.args[3] for c in evaluator.process_single_answer.call_args_list]
+    assert answered == [1, 2]
+    assert store.get_interview("joao", "frontend")["evaluations"][1]["transcribed_answer"] == (
+        "Uso useState e Context API."
+    )
+    store.close()
+
+
+@patch("pipeline._extract_worker", fake_extract)
+@patch("pipeline.Transcriber")
+def test_pipeline_keeps_evaluations_in_flight_on_the_event_loop(mock_transcriber_class, tmp_path):
+    mock_transcriber_class.return_value.transcribe_with_segments.side_effect = read_audio
+    running = 0
+    peak = 0
+
+    async def evaluate_interview_async(client, video_filename, transcription, output_dir, transcript):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.2)
+        running -= 1
+        return f"{output_dir}/{video_filename}.json"
+
+    evaluator = MagicMock()
+    evaluator.evaluate_interview_async = evaluate_interview_async
+    async_client = BackgroundAsyncClient(api_key="test")
+    videos = [str(tmp_path / f"candidato_joao_frontend_q{i}.mp4") for i in range(1, 6)]
+    pipeline = BatchPipeline(
+        str(tmp_path),
+        evaluator,
+        config=PipelineConfig(evaluate_workers=1),
+        async_client=async_client,
+    )
+
+    results = pipeline.run(videos)
+    async_client.close()
+
+    assert [r["evaluation_path"] for r in results] == [
+        f"{tmp_path}/{os.path.basename(video)}.json" for video in videos
+    ]
+    # Um único worker de avaliação mantém várias requisições em andamento
+    assert peak > 1
+    evaluator.evaluate_interview.assert_not_called()
+
+
+@patch("pipeline.Transcriber")
+def test_pipeline_fails_instead_of_hanging_when_feeder_breaks(mock_transcriber_class, tmp_path):
+    pipeline = BatchPipeline(str(tmp_path), MagicMock())
+    errors = []
+
+    def run():
+        try:
+            pipeline.run([str(tmp_path / "candidato_joao_frontend_q1.mp4")])
+        except BrokenProcessPool as e:
+            errors.append(e)
+
+    with patch("pipeline.job_language", side_effect=BrokenProcessPool("pool quebrado")):
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(timeout=30)
+
+    assert not thread.is_alive()
+    assert len(errors) == 1
@@ -0,0 +1,68 @@
+from unittest.mock import MagicMock, patch
+
+from evaluation.interview_evaluator import InterviewEvaluator
+from evaluation.job_matcher import JobPosition, JobQuestion
+from evaluation.question_splitter import question_similarity, split_answers
+from transcription.segments import SegmentArray
+
+QUESTIONS = [
+    JobQuestion("Explique o conceito de Virtual DOM no React e por que ele é importante.", "..."),
+    JobQuestion("Como você lida com o gerenciamento de estado em aplicações React?", "..."),
+    JobQuestion("Descreva suas estratégias para garantir a performance em aplicações React.", "..."),
+]
+
+
+def session_transcript():
+    texts = [
+        "Bom dia, obrigado por participar.",
+        "Primeira pergunta: explique o conceito de virtual DOM no React",
+        "e por que ele é importante.",
+        "O virtual DOM é uma cópia leve do DOM em memória.",
+        "Ele evita manipulações caras.",
+        "Agora, como você lida com o gerenciamento de estado em aplicações react?",
+        "Uso useState e Context API, e Redux quando a aplicação cresce.",
+    ]
+    return SegmentArray.from_segments(
+        [{"start": i * 10.0, "end": i * 10.0 + 9.0, "text": t} for i, t in enumerate(texts)]
+    )
+
+
+def test_question_similarity_ignores_case_accents_and_extra_words():
+    spoken = "Então... COMO voce lida com o gerenciamento de estado em aplicacoes React"
+    assert question_similarity(QUESTIONS[1].question, spoken) == 1.0
+    assert question_similarity(QUESTIONS[0].question, spoken) < 0.3
+
+
+def test_split_answers_finds_question_boundaries():
+    spans = split_answers(session_transcript(), QUESTIONS)
+
+    assert [s.question_number for s in spans] == [1, 2]
+    assert spans[0].text == (
+        "O virtual DOM é uma cópia leve do DOM em memória. Ele evita manipulações caras."
+    )
+    assert (spans[0].start, spans[0].end) == (30.0, 49.0)
+    assert spans[1].text == "Uso useState e Context API, e Redux quando a aplicação cresce."
+
+
+@patch("evaluation.interview_evaluator.load_job_questions")
+def test_evaluate_session_scores_each_answer_span(mock_load, tmp_path):
+    mock_load.return_value = JobPosition("frontend", QUESTIONS)
+    evaluator = InterviewEvaluator()
+    evaluator.process_single_answer = MagicMock(
+        side_effect=lambda filename, text, job, number: MagicMock(score=number)
+    )
+    evaluator.save_evaluations = MagicMock(return_value="evaluation_joao_frontend.json")
+
+    path = evaluator.evaluate_interview(
+        "candidato_joao_frontend.mp4",
+        "texto completo",
+        str(tmp_path),
+        transcript=session_transcript(),
+    )
+
+    assert path == "evaluation_joao_frontend.json"
+    answered = [c.args[3] for c in evaluator.process_single_answer.call_args_list]
+    assert answered == [1, 2]
+    candidate, job, evaluations, _ = evaluator.save_evaluations.call_args.args
+    assert (candidate, job) == ("joao", "frontend")
+    assert [number for number, _ in evaluations] == [1, 2]
@@ -0,0 +1,43 @@
+import pytest
+
+from evaluation.response_parser import JsonStreamParser, extract_json, validate_evaluation
+
+
+def test_parser_skips_preamble_and_fences_across_chunks():
+    parser = JsonStreamParser()
+    parts = [
+        "Claro! Segue a avaliação:\n```js",
+        'on\n{"score": 8, "feed',
+        'back": "bom {uso} de \\"hooks\\""}',
+        "\n```",
+    ]
+
+    results = [parser.feed(part) for part in parts]
+
+    assert results[:2] == [None, None]
+    assert results[2] == '{"score": 8, "feedback": "bom {uso} de \\"hooks\\""}'
+    assert parser.result == results[2]
+
+
+def test_parser_ignores_braces_that_are_not_json():
+    content = 'Nota {aproximada} abaixo: {"score": 5, "feedback": "ok"}'
+    assert extract_json(content) == '{"score": 5, "feedback": "ok"}'
+
+
+def test_parser_finds_arrays_when_requested():
+    content = 'Resultado: [{"question_index": 1, "score": 7, "feedback": "x"}] fim'
+    assert extract_json(content, "{[") == '[{"question_index": 1, "score": 7, "feedback": "x"}]'
+    assert extract_json("sem json") is None
+
+
+def test_validate_evaluation():
+    assert validate_evaluation({"score": "7.5", "feedback": "bom"}) == (7.5, "bom")
+    for invalid in (
+        {"score": 7},
+        {"score": 11, "feedback": "x"},
+        {"score": True, "feedback": "x"},
+        {"score": "alta", "feedback": "x"},
+        {"score": 5, "feedback": None},
+    ):
+        with pytest.raises(ValueError):
+            validate_evaluation(invalid)
@@ -0,0 +1,157 @@
+import json
+import os
+import threading
+
+import pytest
+
+import evaluation.results_store as results_store
+from evaluation.interview_evaluator import InterviewEvaluator, QuestionEvaluation
+from evaluation.results_store import ResultsStore
+from tracing import Tracer
+
+
+def evaluation(question, score):
+    return QuestionEvaluation(
+        question=question,
+        transcribed_answer="resposta",
+        expected_answer="esperada",
+        score=score,
+        feedback="feedback",
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(str(tmp_path / "evaluations.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_upsert_keeps_average_incrementally(store):
+    store.upsert("joao", "frontend", [(1, evaluation("P1", 8.0))])
+    store.upsert("joao", "frontend", [(2, evaluation("P2", 4.0))])
+    assert store.average_score("joao", "frontend") == pytest.approx(6.0)
+
+    # Reavaliar a mesma questão substitui a nota anterior
+    store.upsert("joao", "frontend", [(1, evaluation("P1", 10.0))])
+    assert store.average_score("joao", "frontend") == pytest.approx(7.0)
+    assert len(store.get_interview("joao", "frontend")["evaluations"]) == 2
+
+
+def test_export_json_keeps_report_format(store, tmp_path):
+    store.upsert("ana", "frontend", [(2, evaluation("P2", 6.0)), (1, evaluation("P1", 9.0))])
+
+    path = store.export_json("ana", "frontend", str(tmp_path))
+
+    assert os.path.basename(path) == "evaluation_ana_frontend.json"
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["candidate_name"] == "ana"
+    assert data["job_position"] == "frontend"
+    assert [e["question"] for e in data["evaluations"]] == ["P1", "P2"]
+    assert data["average_score"] == pytest.approx(7.5)
+
+
+def test_list_interviews_by_job(store):
+    store.upsert("ana", "frontend", [(1, evaluation("P1", 9.0))])
+    store.upsert("joao", "frontend", [(1, evaluation("P1", 5.0))])
+    store.upsert("maria", "backend", [(1, evaluation("P1", 7.0))])
+
+    ranking = store.list_interviews("frontend")
+
+    assert [i["candidate_name"] for i in ranking] == ["ana", "joao"]
+
+
+def test_concurrent_upserts_do_not_lose_updates(store):
+    def worker(question_index):
+        store.upsert("joao", "frontend", [(question_index, evaluation(f"P{question_index}", 5.0))])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(1, 21)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(store.get_interview("joao", "frontend")["evaluations"]) == 20
+    assert store.list_interviews()[0]["answer_count"] == 20
+
+
+def test_existing_report_is_imported_before_first_save(store, tmp_path):
+    # Relatório gravado por uma versão anterior, sem banco: questão 3 já avaliada
+    legacy = {
+        "candidate_name": "joao",
+        "job_position": "frontend",
+        "evaluations": [{
+            "question": "Descreva suas estratégias para garantir a performance em aplicações React.",
+            "transcribed_answer": "memo e lazy loading",
+            "expected_answer": "esperada",
+            "score": 8.0,
+            "feedback": "bom",
+        }],
+        "average_score": 8.0,
+    }
+    report = tmp_path / "evaluation_joao_frontend.json"
+    report.write_text(json.dumps(legacy), encoding="utf-8")
+
+    evaluator = InterviewEvaluator(store=store, auto_export=True)
+    path = evaluator.save_evaluations("joao", "frontend", [(1, evaluation("P1", 6.0))], str(tmp_path))
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert [e["score"] for e in data["evaluations"]] == [6.0, 8.0]
+    assert data["average_score"] == pytest.approx(7.0)
+    assert store.get_interview("joao", "frontend")["evaluations"][1]["feedback"] == "bom"
+
+    # Já no banco: o relatório não é importado de novo
+    assert store.import_report(str(report)) == 0
+
+
+def test_export_is_redone_when_store_changes_during_write(store, tmp_path, monkeypatch):
+    store.upsert("ana", "frontend", [(1, evaluation("P1", 9.0))])
+    write = results_store.atomic_write_json
+
+    def slow_write(path, data):
+        # Outro processo grava a entrevista enquanto este exporta a versão lida
+        if len(data["evaluations"]) == 1:
+            store.upsert("ana", "frontend", [(2, evaluation("P2", 5.0))])
+        return write(path, data)
+
+    monkeypatch.setattr(results_store, "atomic_write_json", slow_write)
+    path = store.export_json("ana", "frontend", str(tmp_path))
+
+    with open(path, encoding="utf-8") as f:
+        assert [e["question"] for e in json.load(f)["evaluations"]] == ["P1", "P2"]
+
+
+def test_reports_are_exported_once_per_interview(store, tmp_path):
+    evaluator = InterviewEvaluator(store=store)
+    paths = {
+        evaluator.save_evaluations(
+            "joao", "frontend", [(number, evaluation(f"P{number}", 7.0))], str(tmp_path)
+        )
+        for number in (1, 2)
+    }
+    report = tmp_path / "evaluation_joao_frontend.json"
+    # O caminho retornado é o do relatório, gravado só na exportação
+    assert paths == {str(report)}
+    assert not report.exists()
+
+    assert evaluator.export_pending() == [str(report)]
+    assert len(json.loads(report.read_text(encoding="utf-8"))["evaluations"]) == 2
+    assert evaluator.export_pending() == []
+
+
+def test_saving_results_is_traced(store, tmp_path, monkeypatch):
+    tracer = Tracer()
+    trace_path = tmp_path / "trace.jsonl"
+    tracer.configure(str(trace_path))
+    monkeypatch.setattr(results_store, "tracer", tracer)
+
+    store.upsert("joao", "frontend", [(1, evaluation("P1", 8.0))])
+    store.export_json("joao", "frontend", str(tmp_path))
+    tracer.close()
+
+    with open(trace_path, encoding="utf-8") as f:
+        spans = [json.loads(line) for line in f]
+    assert [span["name"] for span in spans] == ["save_results", "save_json"]
+    assert spans[1]["attributes"]["file"] == "evaluation_joao_frontend.json"
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from transcription.segments import SegmentArray
+from transcription.transcriber import Transcriber
+
+SEGMENTS = [
+    {
+        "start": 0.0,
+        "end": 2.5,
+        "text": " O Virtual DOM ",
+        "words": [
+            {"start": 0.0, "end": 0.4, "word": " O"},
+            {"start": 0.4, "end": 1.2, "word": " Virtual"},
+            {"start": 1.2, "end": 2.5, "word": " DOM"},
+        ],
+    },
+    {
+        "start": 3.0,
+        "end": 4.25,
+        "text": "é rápido.",
+        "words": [
+            {"start": 3.0, "end": 3.3, "word": " é"},
+            {"start": 3.3, "end": 4.25, "word": " rápido."},
+        ],
+    },
+]
+
+
+def test_segment_array_keeps_times_and_flat_text():
+    transcript = SegmentArray.from_segments(SEGMENTS)
+
+    assert transcript.text == "O Virtual DOM é rápido."
+    assert transcript.text == Transcriber().clean_transcription(SEGMENTS)
+    assert len(transcript) == 2
+    assert transcript.segments()[1] == {"start": 3.0, "end": 4.25, "text": "é rápido."}
+    assert [w["word"] for w in transcript.words()] == ["O", "Virtual", "DOM", "é", "rápido."]
+    assert transcript.words()[3]["start"] == 3.0
+
+
+def test_segment_array_round_trips_through_compact_json():
+    transcript = SegmentArray.from_segments(SEGMENTS)
+
+    restored = SegmentArray.from_dict(json.loads(json.dumps(transcript.to_dict())))
+
+    assert restored.text == transcript.text
+    assert restored.segments() == transcript.segments()
+    assert restored.words() == transcript.words()
+
+
+def test_save_and_load_transcription(tmp_path):
+    without_words = [{k: v for k, v in s.items() if k != "words"} for s in SEGMENTS]
+    transcript = SegmentArray.from_segments(without_words)
+    transcriber = Transcriber()
+
+    path = transcriber.save_transcription(transcript, str(tmp_path), name="transcription_video")
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    assert data["transcription"] == "O Virtual DOM é rápido."
+    assert data["segments"]["start_ms"] == [0, 3000]
+    assert "words" not in data["segments"]
+    loaded = Transcriber.load_transcription(path)
+    assert loaded.segments()[0]["end"] == pytest.approx(2.5)
+    assert not loaded.has_words
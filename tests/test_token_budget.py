@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from evaluation.answer_evaluator import AnswerEvaluator
+from transcription.rate_limiter import estimate_tokens
+from transcription.token_budget import (
+    TokenMeter,
+    collapse_repetitions,
+    fit_to_budget,
+    remove_fillers,
+    token_meter,
+)
+
+
+def test_remove_fillers_keeps_content():
+    assert remove_fillers("Hum, eu uso, ahn, React né? Humanidade") == "eu uso, React Humanidade"
+
+
+def test_collapse_repetitions_removes_whisper_loops():
+    text = "fim da resposta. Obrigado. obrigado. obrigado. obrigado. a b a b a b ok"
+    assert collapse_repetitions(text) == "fim da resposta. Obrigado. a b ok"
+    # Repetições naturais curtas ficam
+    assert collapse_repetitions("muito muito bom") == "muito muito bom"
+
+
+def test_fit_to_budget_steps():
+    short = "Resposta curta."
+    assert fit_to_budget(short, 100) == (short, None)
+
+    looping = "O React usa componentes. " + "Legendas pela comunidade. " * 100
+    text, method = fit_to_budget(looping, 30)
+    assert method == "cleanup"
+    assert text == "O React usa componentes. Legendas pela comunidade."
+
+    sentences = " ".join(f"Frase número {i} sobre componentes." for i in range(200))
+    text, method = fit_to_budget(sentences, 50)
+    assert method == "extractive"
+    assert estimate_tokens(text) <= 50
+
+
+def test_meter_prefers_api_usage():
+    meter = TokenMeter()
+    response = SimpleNamespace(usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30))
+    meter.record("evaluation", [{"content": "x" * 400}], "{}", response)
+    meter.record("summary", [{"content": "x" * 400}], "y" * 40)
+    meter.record_cached("summary")
+
+    report = meter.report()
+    assert report["evaluation"]["total_tokens"] == 150
+    assert report["evaluation"]["estimated"] == 0
+    assert report["summary"]["prompt_tokens"] == 101
+    assert report["summary"]["estimated"] == 1
+    assert report["summary"]["cached"] == 1
+
+
+@patch("evaluation.answer_evaluator.chat_completion")
+def test_long_answer_is_reduced_before_the_request(mock_chat):
+    chunk = MagicMock()
+    chunk.choices[0].delta.content = '{"score": 6, "feedback": "ok"}'
+    mock_chat.return_value = [chunk]
+    token_meter.reset()
+
+    answer = "Eu usaria cache. " + "Hum, ahn. " * 2000
+    result = AnswerEvaluator(max_prompt_tokens=800).evaluate_answer(answer, "Pergunta?", "Cache")
+
+    messages = mock_chat.call_args[0][0]
+    assert result.score == 6.0
+    assert sum(estimate_tokens(m["content"]) for m in messages) <= 800
+    assert "Eu usaria cache." in messages[1]["content"]
+    assert token_meter.report()["evaluation"]["compressed"] == 1
+    token_meter.reset()
@@ -0,0 +1,97 @@
+import json
+import os
+import pstats
+import threading
+import urllib.request
+
+import pytest
+
+from tracing import Tracer, profiled
+
+
+def read_spans(path):
+    with open(path, encoding="utf-8") as f:
+        return {span["name"]: span for span in map(json.loads, f)}
+
+
+def test_disabled_tracer_records_nothing(tmp_path):
+    tracer = Tracer()
+    with tracer.span("video") as span:
+        span.add("retries")
+    assert tracer.current().add("retries") is None
+    assert "interview_stage_seconds_count" not in tracer.render_metrics()
+
+
+def test_spans_nest_and_are_written_as_jsonl(tmp_path):
+    tracer = Tracer()
+    trace_path = tmp_path / "trace.jsonl"
+    tracer.configure(str(trace_path))
+
+    with tracer.span("video", trace="candidato_joao_frontend_q1") as video:
+        with tracer.span("llm_request", stage="evaluation"):
+            tracer.current().add("prompt_tokens", 120)
+            tracer.current().add("retries")
+        video.set("cached", False)
+    with pytest.raises(RuntimeError):
+        with tracer.span("transcribe"):
+            raise RuntimeError("falhou")
+    tracer.close()
+
+    spans = read_spans(trace_path)
+    assert spans["llm_request"]["parent_id"] == spans["video"]["span_id"]
+    assert spans["llm_request"]["trace_id"] == "candidato_joao_frontend_q1"
+    assert spans["llm_request"]["attributes"] == {"stage": "evaluation", "prompt_tokens": 120, "retries": 1}
+    assert spans["video"]["parent_id"] is None
+    assert spans["video"]["attributes"]["cached"] is False
+    assert spans["transcribe"]["attributes"]["error"] == "RuntimeError"
+    assert spans["video"]["wall_seconds"] >= spans["llm_request"]["wall_seconds"]
+    assert "cpu_seconds" in spans["video"]
+
+
+def test_spans_in_other_threads_join_trace_by_name(tmp_path):
+    tracer = Tracer()
+    trace_path = tmp_path / "trace.jsonl"
+    tracer.configure(str(trace_path))
+
+    def capture():
+        with tracer.span("capture_frames", trace="video_1"):
+            pass
+
+    with tracer.span("video", trace="video_1"):
+        worker = threading.Thread(target=capture)
+        worker.start()
+        worker.join()
+    tracer.close()
+
+    spans = read_spans(trace_path)
+    assert spans["capture_frames"]["trace_id"] == spans["video"]["trace_id"] == "video_1"
+    assert spans["capture_frames"]["thread"] != spans["video"]["thread"]
+
+
+def test_metrics_file_and_endpoint(tmp_path):
+    tracer = Tracer()
+    tracer.configure(metrics_port=0)
+    with tracer.span("llm_request") as span:
+        span.add("prompt_tokens", 50)
+        span.add("completion_tokens", 10)
+    with tracer.span("llm_request"):
+        pass
+
+    path = tracer.write_metrics(str(tmp_path / "metrics.prom"))
+    text = open(path, encoding="utf-8").read()
+    assert 'interview_stage_seconds_count{stage="llm_request"} 2' in text
+    assert 'interview_llm_prompt_tokens_total{stage="llm_request"} 50' in text
+    assert 'interview_llm_completion_tokens_total{stage="llm_request"} 10' in text
+
+    server = tracer.serve_metrics(0, host="127.0.0.1")
+    port = server.server_address[1]
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+        assert response.read().decode("utf-8") == tracer.render_metrics()
+    tracer.close()
+
+
+def test_profiled_writes_stats(tmp_path):
+    with profiled("candidato_joao_frontend_q1", str(tmp_path)) as path:
+        sum(range(1000))
+    assert os.path.basename(path) == "candidato_joao_frontend_q1.prof"
+    assert pstats.Stats(path).total_calls > 0
@@ -0,0 +1,69 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from transcription.backends import segments_from_tokens
+from transcription.transcriber import Transcriber
+from transcription.vad import EnergyVAD, SpeechWindow
+
+SR = 16000
+
+
+def tone(seconds):
+    t = np.arange(int(seconds * SR)) / SR
+    return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * SR), dtype=np.float32)
+
+
+class FakeTokenizer:
+    timestamp_begin = 1000
+    words = {1: "olá", 2: "mundo", 3: "tchau"}
+
+    def decode(self, tokens):
+        return " ".join(self.words[t] for t in tokens)
+
+
+def test_segments_from_tokens_uses_timestamp_pairs():
+    window = SpeechWindow(silence(4), pieces=[(10.0, 0.0, 4.0)])
+    # <|0.00|> olá mundo <|1.50|><|1.50|> tchau (sem tempo final)
+    tokens = [1000, 1, 2, 1075, 1075, 3]
+
+    segments = segments_from_tokens(tokens, FakeTokenizer(), window)
+
+    assert segments == [
+        {"start": 10.0, "end": 11.5, "text": "olá mundo"},
+        {"start": 11.5, "end": 14.0, "text": "tchau"},
+    ]
+
+
+def test_transcribe_batch_maps_windows_back_to_clips():
+    clips = [
+        np.concatenate([silence(1), tone(2)]),
+        np.concatenate([tone(20), silence(1), tone(20)]),
+        silence(3),
+    ]
+    transcriber = Transcriber(model=MagicMock())
+    decoded_batches = []
+
+    def fake_decode(windows, language=None):
+        decoded_batches.append(len(windows))
+        return [
+            [{"start": w.to_absolute(0.0), "end": w.duration, "text": f"{len(w.audio) // SR}s"}]
+            for w in windows
+        ]
+
+    with patch.object(transcriber, "_decode_windows", side_effect=fake_decode):
+        results = transcriber.transcribe_batch(
+            clips, batch_size=2, vad=EnergyVAD(padding_ms=0)
+        )
+
+    # 1 janela do primeiro clipe + 2 do segundo (41 s não cabem em 30 s)
+    assert decoded_batches == [2, 1]
+    assert results[0]["text"] == "2s"
+    assert results[0]["segments"][0]["start"] == pytest.approx(1.0, abs=0.05)
+    assert len(results[1]["segments"]) == 2
+    assert results[2] == {"text": "", "segments": []}
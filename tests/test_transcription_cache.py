@@ -0,0 +1,69 @@
+import os
+from unittest.mock import MagicMock, patch
+
+from transcription.transcription_cache import TranscriptionCache
+from transcription.video_processor import VideoProcessor
+
+
+def test_cache_roundtrip_and_key_depends_on_options(tmp_path):
+    cache = TranscriptionCache(str(tmp_path))
+    key = cache.make_key("abc", "small", {"language": "pt"})
+
+    assert cache.get(key) is None
+    cache.put(key, {"text": "olá", "segments": []})
+
+    assert cache.get(key) == {"text": "olá", "segments": []}
+    assert key != cache.make_key("abc", "small", {"language": "en"})
+    assert key != cache.make_key("abc", "medium", {"language": "pt"})
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = TranscriptionCache(str(tmp_path), max_bytes=10 ** 9)
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, {"text": "x" * 100})
+        path = os.path.join(str(tmp_path), f"{key}.json")
+        os.utime(path, (1000 + i, 1000 + i))
+
+    # "a" é acessada por último, então "b" passa a ser a mais antiga
+    assert cache.get("a") is not None
+    cache.max_bytes = cache.size() - 1
+    assert cache.evict() == 1
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_cache_purge(tmp_path):
+    cache = TranscriptionCache(str(tmp_path))
+    cache.put("a", {"text": "1"})
+    cache.put("b", {"text": "2"})
+
+    assert cache.purge() == 2
+    assert cache.size() == 0
+
+
+@patch("transcription.video_processor.load_audio")
+def test_process_video_uses_cache(mock_load_audio, tmp_path):
+    video_path = tmp_path / "candidato_joao_frontend_q1.mp4"
+    video_path.write_bytes(b"video")
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    transcriber = MagicMock(model_size="small", model_tag="small", decode_options={})
+    transcriber.transcribe_with_segments.return_value = {
+        "text": "resposta",
+        "segments": [{"start": 0.0, "end": 1.0, "text": "resposta"}],
+    }
+    cache = TranscriptionCache(str(tmp_path / "cache"))
+
+    first = VideoProcessor(str(video_path), str(output_dir), transcriber=transcriber, cache=cache)
+    assert first.process_video()["cached"] is False
+
+    second = VideoProcessor(str(video_path), str(output_dir), transcriber=transcriber, cache=cache)
+    result = second.process_video()
+
+    assert result["cached"] is True
+    assert result["transcription"] == "resposta"
+    assert result["segments"] == [{"start": 0.0, "end": 1.0, "text": "resposta"}]
+    assert transcriber.transcribe_with_segments.call_count == 1
+    assert mock_load_audio.call_count == 1
@@ -0,0 +1,81 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from transcription.transcriber import Transcriber
+from transcription.vad import EnergyVAD, SpeechWindow, pack_regions
+
+SR = 16000
+
+
+def tone(seconds):
+    t = np.arange(int(seconds * SR)) / SR
+    return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * SR), dtype=np.float32)
+
+
+def in_chunks(audio, seconds=1.0):
+    size = int(seconds * SR)
+    for i in range(0, len(audio), size):
+        yield audio[i:i + size]
+
+
+def test_vad_finds_speech_regions_across_chunks():
+    audio = np.concatenate([silence(2), tone(1.5), silence(3), tone(1), silence(1)])
+    vad = EnergyVAD(padding_ms=0)
+
+    regions = list(vad.iter_regions(in_chunks(audio, seconds=0.7)))
+
+    assert len(regions) == 2
+    starts = [start / SR for start, _ in regions]
+    durations = [len(samples) / SR for _, samples in regions]
+    assert starts == pytest.approx([2.0, 6.5], abs=0.05)
+    assert durations == pytest.approx([1.5, 1.0], abs=0.05)
+
+
+def test_vad_drops_short_noise_and_cuts_long_regions():
+    audio = np.concatenate([tone(0.06), silence(2), tone(5)])
+    vad = EnergyVAD(padding_ms=0, max_region_seconds=2)
+
+    regions = list(vad.iter_regions(in_chunks(audio)))
+
+    assert all(len(samples) / SR <= 2.0 for _, samples in regions)
+    assert regions[0][0] / SR == pytest.approx(2.06, abs=0.03)
+    assert sum(len(samples) for _, samples in regions) / SR == pytest.approx(5.0, abs=0.05)
+
+
+def test_pack_regions_maps_back_to_absolute_time():
+    regions = [(2 * SR, tone(1)), (10 * SR, tone(2)), (40 * SR, tone(3))]
+
+    windows = list(pack_regions(regions, max_seconds=4))
+
+    assert [w.duration for w in windows] == pytest.approx([3.0, 3.0])
+    assert windows[0].to_absolute(0.5) == pytest.approx(2.5)
+    assert windows[0].to_absolute(1.5) == pytest.approx(10.5)
+    assert windows[1].to_absolute(1.0) == pytest.approx(41.0)
+
+
+def test_transcribe_stream_yields_absolute_segments():
+    audio = np.concatenate([silence(5), tone(2), silence(20), tone(2)])
+    model = MagicMock()
+    model.transcribe.return_value = {
+        "segments": [
+            {"start": 0.0, "end": 2.0, "text": " primeira "},
+            {"start": 2.2, "end": 4.0, "text": "segunda"},
+        ]
+    }
+    transcriber = Transcriber(model=model)
+
+    segments = list(transcriber.transcribe_stream(in_chunks(audio), EnergyVAD(padding_ms=0)))
+
+    # As duas falas cabem em uma janela: o Whisper roda uma única vez
+    assert model.transcribe.call_count == 1
+    assert len(model.transcribe.call_args[0][0]) / SR == pytest.approx(4.0, abs=0.05)
+    assert [s["text"] for s in segments] == ["primeira", "segunda"]
+    assert segments[0]["start"] == pytest.approx(5.0, abs=0.05)
+    assert segments[0]["end"] == pytest.approx(7.0, abs=0.05)
+    assert segments[1]["start"] == pytest.approx(27.2, abs=0.1)
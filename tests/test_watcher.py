@@ -0,0 +1,66 @@
+import os
+
+from watcher import InputWatcher, Manifest, pending_videos
+
+
+def write(path, content: bytes):
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def test_watcher_waits_until_file_is_stable(tmp_path):
+    video = str(tmp_path / "joao_frontend_q1.mp4")
+    write(video, b"parte")
+    write(str(tmp_path / "notas.txt"), b"ignorado")
+    watcher = InputWatcher(str(tmp_path), settle_seconds=3)
+
+    assert watcher.scan(now=100.0) == []
+    assert watcher.scan(now=102.0) == []
+
+    # O arquivo ainda está sendo copiado: a contagem recomeça
+    write(video, b"parte e mais")
+    assert watcher.scan(now=104.0) == []
+    assert watcher.scan(now=107.0) == [video]
+
+
+def test_manifest_skips_unchanged_and_detects_changes(tmp_path):
+    video = str(tmp_path / "joao_frontend_q1.mp4")
+    write(video, b"conteudo")
+    manifest_path = str(tmp_path / "manifest.json")
+
+    manifest = Manifest(manifest_path)
+    assert not manifest.is_processed(video, "small")
+    manifest.record(video, "small")
+
+    reloaded = Manifest(manifest_path)
+    assert reloaded.is_processed(video, "small")
+    assert not reloaded.is_processed(video, "medium")
+
+    # Mesmo conteúdo com outro mtime continua processado
+    os.utime(video, (1, 1))
+    assert reloaded.is_processed(video, "small")
+
+    write(video, b"conteudo novo")
+    assert not reloaded.is_processed(video, "small")
+
+
+def test_pending_videos_skips_files_removed_after_scan(tmp_path, monkeypatch):
+    processed = str(tmp_path / "joao_frontend_q1.mp4")
+    new = str(tmp_path / "joao_frontend_q2.mp4")
+    write(processed, b"processado")
+    write(new, b"novo")
+    manifest = Manifest(str(tmp_path / "manifest.json"))
+    manifest.record(processed, "small")
+    os.utime(processed, (1, 1))  # força a comparação pelo hash
+    watcher = InputWatcher(str(tmp_path), settle_seconds=0)
+
+    # O vídeo some entre a varredura e a consulta ao manifesto
+    scan = watcher.scan
+
+    def scan_then_remove():
+        ready = scan()
+        os.remove(processed)
+        return ready
+
+    monkeypatch.setattr(watcher, "scan", scan_then_remove)
+    assert pending_videos(watcher, manifest, "small", {}) == [new]
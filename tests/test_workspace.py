@@ -0,0 +1,41 @@
+import json
+import os
+
+from workspace import _UMASK, atomic_write_json, create_work_dir, video_stem, work_dir
+
+
+def test_work_dirs_are_unique_per_call(tmp_path):
+    root = str(tmp_path / "work")
+    first = create_work_dir(root, "/videos/Joao_Dev_1.mp4")
+    second = create_work_dir(root, "/videos/Joao_Dev_1.mp4")
+
+    assert first != second
+    assert os.path.basename(first).startswith("Joao_Dev_1_")
+    assert video_stem("/videos/Joao_Dev_1.mp4") == "Joao_Dev_1"
+
+
+def test_work_dir_is_removed_after_block(tmp_path):
+    with work_dir(str(tmp_path), "video.mp4") as path:
+        open(os.path.join(path, "temp_audio.mp3"), "wb").close()
+    assert not os.path.exists(path)
+
+
+def test_atomic_write_json_replaces_without_leftovers(tmp_path):
+    path = str(tmp_path / "transcription_video.json")
+    atomic_write_json(path, {"transcription": "antiga"})
+    atomic_write_json(path, {"transcription": "nova"})
+
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == {"transcription": "nova"}
+    assert os.listdir(tmp_path) == ["transcription_video.json"]
+
+
+def test_atomic_write_json_uses_regular_file_permissions(tmp_path):
+    path = str(tmp_path / "evaluation_joao_frontend.json")
+    atomic_write_json(path, {})
+    assert os.stat(path).st_mode & 0o777 == 0o666 & ~_UMASK
+
+    # Um arquivo existente mantém as permissões que já tinha
+    os.chmod(path, 0o640)
+    atomic_write_json(path, {"score": 8})
+    assert os.stat(path).st_mode & 0o777 == 0o640